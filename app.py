@@ -1,36 +1,49 @@
+import os
 import streamlit as st
-from streamlit_folium import st_folium
-import folium
-from folium.plugins import BeautifyIcon
-import sqlite3
 from pathlib import Path
 import uuid
-from PIL import Image
-import io
-import html
-import base64
-import requests
 from datetime import datetime
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.pyplot as plt
-from matplotlib import font_manager, rc
-
-font_path = "C:/Windows/Fonts/malgun.ttf"
-font = font_manager.FontProperties(fname=font_path).get_name()
-rc("font", family=font)
-plt.rcParams["axes.unicode_minus"] = False
+from db import Database
+from imagestore import ImageStore, is_image_ref
+from perf import RerunProfile, append_jsonl, start_profile, stop_profile
+from querycache import QueryCache
+from reaper import FileReaper
+from stats import category_chart_png, category_labels
+from thumbnails import ThumbnailStore
+from display import render_stars
+from geo import format_distance
+from geocode import GeocodeWorker, Geocoder
+from importer import GEOCODE_RATE, TokenBucket, import_bookmarks, parse_records
+from photos import (
+    ALBUM_PREFETCH,
+    ImagePrefetcher,
+    date_range,
+    ingest_photos,
+    load_display_image,
+    month_heatmap_html,
+)
+# folium(markers)/matplotlib(stats 차트)은 쓰는 화면에서만 읽는다 (benchmarks/bench_importtime.py)
 
 
 # ---------- 설정 ----------
 DATA_DIR = Path("./data")
-IMAGES_DIR = DATA_DIR / "images"
-PHOTOS_DIR = DATA_DIR / "photos"
 DB_PATH = DATA_DIR / "bookmarks.db"
 
 DATA_DIR.mkdir(parents=True, exist_ok=True)
-IMAGES_DIR.mkdir(parents=True, exist_ok=True)
-PHOTOS_DIR.mkdir(parents=True, exist_ok=True)
+
+# 예전 북마크(이미지 저장소 이전, image_path 가 파일 경로)의 팝업용 썸네일 (static/thumbs)
+thumbs = ThumbnailStore()
+
+# 지도 기본 위치 (서울시청)
+DEFAULT_LAT, DEFAULT_LON = 37.5665, 126.9780
+DEFAULT_ZOOM = 13
+NEARBY_COUNT = 5
+# 리뷰 목록 한 페이지 크기 (카드 하나에 위젯 10개 안팎)
+REVIEW_PAGE_SIZES = [10, 20, 50]
+# rerun 계측 기록: 사이드바 성능 패널을 켜거나 LIMSTREAT_PERF_LOG 에 경로를 주면 rerun 마다 한 줄
+PERF_LOG = os.environ.get("LIMSTREAT_PERF_LOG")
+PERF_LOG_DEFAULT = DATA_DIR / "perf.jsonl"
+PROFILES_DIR = DATA_DIR / "profiles"
 
 # ---------- 카테고리 ----------
 CATEGORIES = [
@@ -38,190 +51,146 @@ CATEGORIES = [
     "패스트푸드", "카페/디저트", "술집", "기타"
 ]
 
-# ---------- DB 유틸 ----------
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS bookmarks (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            address TEXT,
-            lat REAL,
-            lon REAL,
-            image_path TEXT,
-            rating INTEGER,
-            is_recommended INTEGER,
-            created_at TEXT,
-            memo TEXT,
-            category TEXT
-        )
-        """
-    )
+# ---------- Streamlit 페이지 설정 ----------
+st.set_page_config(page_title="Limstreat - Taste Mark Map", layout="wide")
+st.title("Limstreat — 테이스트 마크 지도")
 
-    c.execute("PRAGMA table_info(bookmarks)")
-    cols = [row[1] for row in c.fetchall()]
-    if "rating" not in cols:
-        c.execute("ALTER TABLE bookmarks ADD COLUMN rating INTEGER")
-    if "is_recommended" not in cols:
-        c.execute("ALTER TABLE bookmarks ADD COLUMN is_recommended INTEGER")
-    if "created_at" not in cols:
-        c.execute("ALTER TABLE bookmarks ADD COLUMN created_at TEXT")
-    if "memo" not in cols:
-        c.execute("ALTER TABLE bookmarks ADD COLUMN memo TEXT")
-    if "category" not in cols:
-        c.execute("ALTER TABLE bookmarks ADD COLUMN category TEXT")
-
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS photos (
-            id TEXT PRIMARY KEY,
-            store_name TEXT,
-            date TEXT,
-            image_path TEXT
-        )
-        """
-    )
+# ---------- 성능 계측 ----------
+prof = RerunProfile()
 
-    conn.commit()
-    conn.close()
 
+def save_profile(profiler):
+    # 멈추고 pstats 파일과 상위 줄을 남긴다 (패널의 🔬 cProfile 에서 본다)
+    st.session_state.pop("active_profiler", None)
+    dump_path = PROFILES_DIR / f"rerun-{datetime.now():%Y%m%d-%H%M%S}.prof"
+    st.session_state["last_profile"] = (str(dump_path), stop_profile(profiler, dump_path))
 
-def insert_bookmark(bid, name, address, lat, lon, image_path, rating, is_recommended, category, memo=None):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    created_at = datetime.now().isoformat(timespec="seconds")
-    c.execute(
-        """
-        INSERT INTO bookmarks (id, name, address, lat, lon, image_path, rating, is_recommended, created_at, memo, category)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (bid, name, address, lat, lon, image_path, rating, is_recommended, created_at, memo, category),
-    )
-    conn.commit()
-    conn.close()
-
-
-def get_all_bookmarks():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        """
-        SELECT id, name, address, lat, lon, image_path, rating, is_recommended, category, memo
-        FROM bookmarks
-        ORDER BY rowid DESC
-        """
-    )
-    rows = c.fetchall()
-    conn.close()
-    return rows
-
-
-def delete_bookmark(bid):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-
-    c.execute("SELECT image_path FROM bookmarks WHERE id = ?", (bid,))
-    row = c.fetchone()
-    if row and row[0]:
-        p = Path(row[0])
-        if p.exists():
-            try:
-                p.unlink()
-            except Exception:
-                pass
-
-    c.execute("DELETE FROM bookmarks WHERE id = ?", (bid,))
-    conn.commit()
-    conn.close()
-
-
-def update_memo(bid, memo_value):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("UPDATE bookmarks SET memo = ? WHERE id = ?", (memo_value, bid))
-    conn.commit()
-    conn.close()
-
-
-def insert_photo(pid, store_name, date_str, image_path):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        "INSERT INTO photos (id, store_name, date, image_path) VALUES (?, ?, ?, ?)",
-        (pid, store_name, date_str, image_path),
-    )
-    conn.commit()
-    conn.close()
 
+# st.rerun()/st.stop()/예외로 finish_rerun 전에 끝난 rerun 의 프로파일은 다음 rerun 이 시작할 때 멈추고 남긴다
+if "active_profiler" in st.session_state:
+    save_profile(st.session_state["active_profiler"])
+# 패널에서 요청한 rerun 하나만 cProfile 로 (다른 rerun 에는 비용 없음)
+profiler = start_profile() if st.session_state.pop("profile_next_rerun", False) else None
+if profiler is not None:
+    st.session_state["active_profiler"] = profiler
 
-def get_photos_by_date(date_str):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        "SELECT id, store_name, date, image_path FROM photos WHERE date = ? ORDER BY rowid ASC",
-        (date_str,),
-    )
-    rows = c.fetchall()
-    conn.close()
-    return rows
-
-
-def delete_photo(pid):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-
-    c.execute("SELECT image_path FROM photos WHERE id = ?", (pid,))
-    row = c.fetchone()
-    if row and row[0]:
-        p = Path(row[0])
-        if p.exists():
-            try:
-                p.unlink()
-            except Exception:
-                pass
-
-    c.execute("DELETE FROM photos WHERE id = ?", (pid,))
-    conn.commit()
-    conn.close()
-
-
-# ---------- 유틸: 이미지 -> data uri ----------
-def image_file_to_data_uri(image_path: str | Path):
-    try:
-        with open(image_path, "rb") as f:
-            data = f.read()
-        mime = "image/png"
-        encoded = base64.b64encode(data).decode("utf-8")
-        return f"data:{mime};base64,{encoded}"
-    except Exception:
-        return None
+# ---------- DB ----------
+@st.cache_resource
+def get_db():
+    # 프로세스당 한 번만 만들어 모든 세션이 커넥션 풀을 공유
+    return Database(DB_PATH)
+
+
+db = get_db()
+# 조회 수는 프로세스 전체 카운터라 같은 때 도는 다른 세션/백그라운드 작업의 조회도 섞인다
+queries_before = db.query_count
+
+
+@st.cache_resource
+def get_geocoder():
+    # 주소 → 좌표 캐시(LRU + SQLite)도 세션끼리 공유. Nominatim 속도 제한(초당 1건)도 여기 하나만 두고
+    # 백그라운드 worker 와 일괄 가져오기가 같이 쓴다
+    return Geocoder(db, limiter=TokenBucket(GEOCODE_RATE))
+
+
+geocoder = get_geocoder()
+
+
+@st.cache_resource
+def get_geocode_worker():
+    # 저장은 좌표를 기다리지 않고, 대기열은 프로세스당 스레드 하나가 Nominatim 속도 제한에 맞춰 처리
+    return GeocodeWorker(db, geocoder).start()
+
+
+geocode_worker = get_geocode_worker()
+
+
+@st.cache_resource
+def get_reads():
+    # 읽기 결과 캐시도 세션끼리 공유 (쓰기는 db 로 바로, 쓰면 해당 테이블 캐시만 무효화)
+    return QueryCache(db)
+
+
+reads = get_reads()
+
+
+@st.cache_resource
+def get_image_store():
+    # 업로드 이미지는 내용 해시로 저장하고 크기별 사본(thumb/medium/full)을 둔다
+    return ImageStore(db)
+
+
+images = get_image_store()
+
+
+@st.cache_resource
+def get_file_reaper():
+    # 지운 행의 파일 삭제와 이미지 저장소 회수는 백그라운드에서 (삭제 버튼은 unlink 를 기다리지 않는다)
+    return FileReaper(images.reclaim).start()
+
+
+reaper = get_file_reaper()
 
 
-# ---------- 유틸: 주소 → 좌표 (지오코딩) ----------
-def geocode_address(address: str):
-    try:
-        url = "https://nominatim.openstreetmap.org/search"
-        params = {"q": address, "format": "json", "limit": 1}
-        headers = {"User-Agent": "limstreat-app"}
-        resp = requests.get(url, params=params, headers=headers, timeout=8)
-        resp.raise_for_status()
-        data = resp.json()
-        if not data:
-            return None
-        return float(data[0]["lat"]), float(data[0]["lon"])
-    except Exception:
+@st.cache_resource
+def get_album_prefetcher():
+    # 앨범 표시용 사본(medium)을 세션끼리 공유하는 LRU 에 두고 옆 사진은 미리 읽는다
+    return ImagePrefetcher(lambda image_path: load_display_image(images, image_path))
+
+
+album_images = get_album_prefetcher()
+
+
+@st.cache_resource
+def get_tile_proxy():
+    # LIMSTREAT_TILE_PROXY_PORT 가 있으면 지도 타일을 로컬 캐시 프록시로 (프로세스당 하나, 없으면 None)
+    from tiles import PROXY_PORT, TileCache, TileProxy, serve
+
+    if PROXY_PORT is None:
         return None
+    proxy = TileProxy(TileCache())
+    serve(proxy, port=PROXY_PORT)
+    # 북마크 주변은 OSM 정책에 맞춰 천천히 미리 받아 둔다
+    proxy.prefetch_around(db.bookmark_points())
+    return proxy
 
 
-# ---------- 초기화 ----------
-init_db()
+prof.phase("resources")
+
+
+def thumb_url(bid, image_path):
+    """지도 팝업용 썸네일 URL."""
+    if is_image_ref(image_path):
+        return images.url(image_path, "thumb")
+    return thumbs.ensure(bid, image_path)
+
+
+def thumb_path(bid, image_path):
+    """리뷰 목록용 썸네일 파일."""
+    if is_image_ref(image_path):
+        return images.path(image_path, "thumb")
+    return thumbs.ensure_path(bid, image_path)
+
+
+@st.cache_resource
+def get_marker_cache():
+    # 팝업 HTML/썸네일 확인은 북마크마다 한 번만 (바뀐 북마크만 다시 만든다)
+    from markers import MarkerCache
+
+    return MarkerCache(thumb_url)
+
+
+@st.cache_resource
+def get_bookmark_feed():
+    # LIMSTREAT_FEED_PORT 가 있으면 지도 마커를 GeoJSON 피드로 (프로세스당 하나, 없으면 None)
+    from feed import FEED_PORT, BookmarkFeed, serve
+
+    if FEED_PORT is None:
+        return None
+    feed = BookmarkFeed(db, thumb_url)
+    serve(feed, port=FEED_PORT)
+    return feed
 
-# ---------- Streamlit 페이지 설정 ----------
-st.set_page_config(page_title="Limstreat - Taste Mark Map", layout="wide")
-st.title("Limstreat — 테이스트 마크 지도")
 
 # ---------- 세션 상태 초기값 ----------
 if "clicked_lat" not in st.session_state:
@@ -240,62 +209,27 @@ if "edit_memo" not in st.session_state:
     st.session_state["edit_memo"] = {}
 if "review_q" not in st.session_state:
     st.session_state["review_q"] = ""
+if "map_bounds" not in st.session_state:
+    st.session_state["map_bounds"] = None
+if "map_zoom" not in st.session_state:
+    st.session_state["map_zoom"] = DEFAULT_ZOOM
+if "filter_category" not in st.session_state:
+    st.session_state["filter_category"] = "전체"
+if "geocoding" not in st.session_state:
+    # 이 세션에서 저장해 좌표를 기다리는 북마크 id (찾으면 지도를 그쪽으로 옮긴다)
+    st.session_state["geocoding"] = []
+if "geocode_waiting" not in st.session_state:
+    st.session_state["geocode_waiting"] = set()
+if "selected_bookmarks" not in st.session_state:
+    st.session_state["selected_bookmarks"] = set()
 
 
 # ---------- 공통 함수 ----------
-def render_stars(rating: int | None):
-    if rating is None:
-        return "별점 없음"
-    try:
-        r = int(rating)
-    except Exception:
-        return "별점 없음"
-    r = max(0, min(5, r))
-    return "⭐" * r + "☆" * (5 - r)
-
-
-def apply_filter(rows, filter_mode: str):
-    def ok(row):
-        is_rec = bool(row[7])
-        if filter_mode == "전체 보기":
-            return True
-        if filter_mode == "추천 💗만":
-            return is_rec
-        if filter_mode == "비추천만":
-            return not is_rec
-        return True
-
-    return [r for r in rows if ok(r)]
-
-
-def marker_icon(is_recommended: int):
-    """
-    ✅ 추천: 핑크 핀 + 흰색 하트
-    ✅ 비추천: 진회색 핀만 (안쪽 아이콘 없음)
-    """
-    if is_recommended:
-        return BeautifyIcon(
-            icon_shape="marker",
-            number="🤍",
-            text_color="white",
-            background_color="#ff4fa3",
-            border_color="#ff4fa3",
-        )
-    return BeautifyIcon(
-        icon_shape="marker",
-        number="",
-        text_color="white",
-        background_color="#4a4a4a",  # 진회색
-        border_color="#4a4a4a",
-    )
+# 필터 → SQL 조건 (None: 전체 / True: 추천만 / False: 비추천만)
+FILTER_RECOMMENDED = {"전체 보기": None, "추천 💗만": True, "비추천만": False}
 
 
 # ---------- 사이드바 ----------
-rows_all = get_all_bookmarks()
-total_count = len(rows_all)
-rec_count = sum(1 for r in rows_all if r[7])
-nonrec_count = total_count - rec_count
-
 st.sidebar.markdown("#### 표시할 맛집")
 filter_choice = st.sidebar.radio(
     "",
@@ -304,6 +238,19 @@ filter_choice = st.sidebar.radio(
 )
 st.session_state["filter_mode"] = filter_choice
 
+category_options = ["전체"] + CATEGORIES
+category_choice = st.sidebar.selectbox(
+    "카테고리",
+    category_options,
+    index=category_options.index(st.session_state["filter_category"]),
+)
+st.session_state["filter_category"] = category_choice
+filter_category = None if category_choice == "전체" else category_choice
+
+# 개수는 전체 행을 읽지 않고 집계 한 번으로
+total_count, rec_count = reads.count_by_recommend(filter_category)
+nonrec_count = total_count - rec_count
+
 st.sidebar.write(f"전체: {total_count}곳")
 st.sidebar.write(f"추천 💗: {rec_count}곳")
 st.sidebar.write(f"비추천: {nonrec_count}곳")
@@ -328,16 +275,246 @@ st.sidebar.markdown("---")
 st.sidebar.markdown("#### 날짜별 사진 보기")
 selected_date_sidebar = st.sidebar.date_input("날짜 선택", value=st.session_state["album_date"])
 st.session_state["album_date"] = selected_date_sidebar
+# 사진 있는 날을 달력으로 (날짜별 사진 수 표에서 한 달치만 읽는다)
+month_start, month_end = date_range(selected_date_sidebar, "month")
+st.sidebar.markdown(
+    month_heatmap_html(selected_date_sidebar, reads.photo_day_counts(month_start, month_end)),
+    unsafe_allow_html=True,
+)
+
+st.sidebar.markdown("---")
+cache_stats = reads.stats
+st.sidebar.caption(
+    f"조회 캐시: 적중 {cache_stats['hits']} · 미스 {cache_stats['misses']} ({reads.hit_rate():.0%})"
+)
 
 mode = st.session_state["mode"]
 filter_mode = st.session_state["filter_mode"]
+prof.label = mode
+prof.phase("sidebar")
+
+
+def finish_rerun():
+    """이번 rerun 기록을 마무리한다. st.rerun() 으로 중간에 끝나는 무거운 경로에서도 먼저 부른다."""
+    global profiler
+    if prof.total_ms is not None:
+        return prof.record()
+    prof.phase("screen")
+    prof.count("db_queries", db.query_count - queries_before)
+    prof.finish()  # 프로파일 정리 시간은 빼고
+    if profiler is not None:
+        save_profile(profiler)
+        profiler = None
+    record = prof.record()
+    if PERF_LOG or st.session_state.get("perf_panel"):
+        append_jsonl(PERF_LOG or PERF_LOG_DEFAULT, record)
+    return record
+
+
+def interrupted_rerun():
+    # 다시 그리기 전에 끝난 rerun 은 다음 rerun 의 패널에서 보여 준다
+    st.session_state["perf_interrupted"] = finish_rerun()
+
+
+# ---------- 통계 차트 ----------
+@st.cache_data(max_entries=16)
+def category_chart(labels, values):
+    # 집계 값이 키라서 데이터가 바뀐 경우에만 다시 그린다
+    return category_chart_png(labels, values)
+
+
+# ---------- 삭제 / 여러 개 한 번에 ----------
+def delete_bookmarks(bids):
+    # 행은 한 트랜잭션으로 바로 지우고 파일(예전 이미지/썸네일)은 reaper 가 치운다
+    bids = list(bids)
+    files = db.delete_bookmarks(bids)
+    reaper.discard(files + [thumbs.path(bid) for bid in bids])
+    reaper.reclaim_soon()
+    for bid in bids:
+        st.session_state["selected_bookmarks"].discard(bid)
+        st.session_state["edit_memo"].pop(bid, None)
+        st.session_state.pop(f"memo-edit-{bid}", None)
+        st.session_state.pop(f"sel-{bid}", None)
+
+
+def discard_photo_files(files):
+    reaper.discard(files)
+    reaper.reclaim_soon()
+
+
+def toggle_selected(bid):
+    if st.session_state[f"sel-{bid}"]:
+        st.session_state["selected_bookmarks"].add(bid)
+    else:
+        st.session_state["selected_bookmarks"].discard(bid)
+
+
+def select_bookmarks(bids, on):
+    for bid in bids:
+        st.session_state[f"sel-{bid}"] = on
+        if on:
+            st.session_state["selected_bookmarks"].add(bid)
+        else:
+            st.session_state["selected_bookmarks"].discard(bid)
+
+
+def update_selected(**values):
+    db.update_bookmarks(st.session_state["selected_bookmarks"], **values)
+
+
+def set_selected_category():
+    update_selected(category=st.session_state["bulk_category"])
+
+
+# ---------- 위치 찾는 중 ----------
+GEOCODE_POLL_SECONDS = 2
+
+
+def waiting_geocodes(pending):
+    return {bid for bid, name, address, attempts, failed, last_error in pending if not failed}
+
+
+def retry_pending(bid):
+    db.retry_geocode(bid)
+    geocode_worker.notify()
+
+
+def delete_pending(bid):
+    delete_bookmarks([bid])
+
+
+def show_pending_geocodes(pending):
+    for bid, name, address, attempts, failed, last_error in pending:
+        if failed:
+            st.warning(f"**{name}** 의 위치를 찾지 못했어요: {address} ({last_error})")
+            col_retry, col_delete = st.columns(2)
+            col_retry.button("다시 찾기", key=f"geo-retry-{bid}", on_click=retry_pending, args=(bid,))
+            col_delete.button("삭제", key=f"geo-del-{bid}", on_click=delete_pending, args=(bid,))
+        elif attempts:
+            st.caption(f"📍 **{name}** 위치 찾는 중… (연결 오류로 {attempts}번 실패, 곧 다시 시도)")
+        else:
+            st.caption(f"📍 **{name}** 위치 찾는 중…")
+
+
+@st.fragment(run_every=GEOCODE_POLL_SECONDS)
+def pending_geocodes_live():
+    # 기다리는 동안 이 부분만 주기적으로 다시 그리다가, 끝난 것이 생기면 앱 전체를 다시 그려 지도에 반영
+    pending = reads.pending_geocodes()
+    if waiting_geocodes(pending) != st.session_state["geocode_waiting"]:
+        st.rerun()
+    show_pending_geocodes(pending)
+
+
+# ---------- 앨범 보기 ----------
+@st.fragment
+def album_viewer(start, end):
+    # 이전/다음은 이 부분만 다시 그린다 (사진 목록은 조회 캐시, 이미지는 album_images 에서)
+    photos = reads.get_photos_in_range(start, end)
+    if not photos:
+        st.info("이 기간에는 아직 업로드된 사진이 없습니다." if start != end else "이 날짜에는 아직 업로드된 사진이 없습니다.")
+        return
+
+    # 기간이 바뀌면 처음 사진부터
+    if st.session_state.get("album_range") != (start, end):
+        st.session_state["album_range"] = (start, end)
+        st.session_state["album_index"] = 0
+    idx = st.session_state.get("album_index", 0)
+    idx = max(0, min(idx, len(photos) - 1))
+    st.session_state["album_index"] = idx
+
+    pid, store_name, d, image_path = photos[idx]
+
+    # 앞뒤 사진은 보는 동안 백그라운드에서 읽어 둔다
+    neighbours = [photos[(idx + step) % len(photos)][3] for step in range(-ALBUM_PREFETCH, ALBUM_PREFETCH + 1) if step]
+    album_images.prefetch(neighbours)
+
+    st.write(f"총 {len(photos)}장 중 {idx + 1}번째" + (f" · {d}" if start != end else ""))
+
+    col_l, col_c, col_r = st.columns([1, 2, 1])
+    with col_c:
+        # 앨범은 화면 폭의 절반 정도라 medium 사본이면 충분
+        try:
+            with prof.span("album image"):
+                image_bytes = album_images.get(image_path)
+        except Exception:
+            image_bytes = None
+        if image_bytes is not None:
+            prof.count("image_bytes", len(image_bytes))
+            st.image(image_bytes, use_column_width=True)
+        else:
+            st.write("[이미지 파일을 찾을 수 없습니다]")
+
+    del_cols = st.columns([2, 1, 6])
+    with del_cols[0]:
+        confirm = st.checkbox("삭제 확인", key=f"delcheck-{pid}")
+    with del_cols[1]:
+        if st.button("삭제", key=f"delete-{pid}"):
+            if not confirm:
+                st.warning("‘삭제 확인’을 체크해 주세요.")
+            else:
+                discard_photo_files(db.delete_photos([pid]))
+                photos2 = reads.get_photos_in_range(start, end)
+                if not photos2:
+                    st.session_state["album_index"] = 0
+                else:
+                    st.session_state["album_index"] = min(idx, len(photos2) - 1)
+                st.rerun()
+
+    def move(step):
+        st.session_state["album_index"] = (idx + step) % len(photos)
+
+    # 콜백에서 위치만 바꾸면 버튼이 일으킨 fragment rerun 이 바로 새 사진을 그린다
+    col_prev, col_info, col_next = st.columns([1, 3, 1])
+    with col_prev:
+        st.button("⬅ 이전", on_click=move, args=(-1,))
+    with col_info:
+        dots = "".join("●" if i == idx else "○" for i in range(len(photos)))
+        st.markdown(f"<div style='text-align:center;font-size:20px'>{dots}</div>", unsafe_allow_html=True)
+    with col_next:
+        st.button("다음 ➡", on_click=move, args=(1,))
 
 
 # ==========================
 # 화면 1: 맛집 지도
 # ==========================
 if mode == "맛집 지도":
+    # 지도 화면에서만 쓰는 모듈 (folium/streamlit_folium 은 처음 읽을 때 1초 가까이 걸린다)
+    import folium
+    from streamlit_folium import st_folium
+
+    from feed import feed_url
+    from markers import (
+        CLUSTER_MIN_MARKERS,
+        MAX_MARKERS,
+        BeautifyIconAssets,
+        GeoJsonBookmarks,
+        MarkerClusterAssets,
+        add_cluster_marker,
+        bounds_from_map_data,
+        cluster_cell,
+        estimate_bounds,
+        pad_bounds,
+    )
+    from tiles import map_tiles
+
     st.subheader("맛집 지도")
+    tile_proxy = get_tile_proxy()
+
+    # 좌표를 기다리는 북마크. 이 세션에서 저장한 것의 좌표가 나왔으면 지도를 그쪽으로 옮긴다
+    pending = reads.pending_geocodes()
+    waiting = waiting_geocodes(pending)
+    st.session_state["geocode_waiting"] = waiting
+    landed = [bid for bid in st.session_state["geocoding"] if bid not in waiting]
+    if landed:
+        st.session_state["geocoding"] = [bid for bid in st.session_state["geocoding"] if bid in waiting]
+        for bid in reversed(landed):
+            coords = db.get_coordinates(bid)
+            if coords is not None:
+                st.session_state["clicked_lat"], st.session_state["clicked_lon"] = coords
+                st.session_state["map_bounds"] = None
+                if tile_proxy is not None:
+                    tile_proxy.prefetch_around([coords])
+                break
 
     col_map, col_form = st.columns([3, 2])
 
@@ -364,76 +541,146 @@ if mode == "맛집 지도":
                     st.error("주소를 입력해주세요.")
                     st.stop()
 
-                geo = geocode_address(address_input.strip())
-                if geo is None:
-                    st.error("주소를 찾지 못했어요. 더 구체적으로 입력해 주세요. (예: 도로명 + 건물번호)")
-                    st.stop()
-
-                lat, lon = geo
-                st.session_state["clicked_lat"] = lat
-                st.session_state["clicked_lon"] = lon
-
                 bid = str(uuid.uuid4())
                 saved_image_path = None
                 if uploaded_file:
                     try:
-                        img = Image.open(io.BytesIO(uploaded_file.read()))
-                        img.thumbnail((1024, 1024))
-                        saved_image_path = IMAGES_DIR / f"{bid}.png"
-                        img.save(saved_image_path, format="PNG")
-                        saved_image_path = str(saved_image_path)
+                        # 같은 이미지를 다시 올리면 저장소의 사본을 그대로 쓴다
+                        with prof.span("image upload"):
+                            saved_image_path = images.put(uploaded_file.getvalue())
+                        prof.count("upload_bytes", uploaded_file.size)
                     except Exception as e:
                         st.warning(f"이미지 저장 중 오류 발생: {e}")
                         saved_image_path = None
 
                 is_recommended = 1 if recommend_label == "추천" else 0
 
-                insert_bookmark(
+                # 좌표는 백그라운드에서 찾는다 (지오코더가 느려도 저장은 바로 끝난다)
+                db.insert_pending_bookmark(
                     bid,
                     name_input.strip(),
                     address_input.strip(),
-                    float(lat),
-                    float(lon),
                     saved_image_path,
                     int(rating_input),
                     is_recommended,
                     category_input,
                     None,  # ✅ 메모는 리뷰에서만
                 )
-                st.success("저장 완료! 지도도 해당 위치로 이동했어요 🙂")
+                geocode_worker.notify()
+                st.session_state["geocoding"].append(bid)
+                st.success("저장 완료! 위치를 찾으면 지도가 그쪽으로 이동해요 🙂")
+                interrupted_rerun()
                 st.rerun()
 
         st.caption("지도 클릭 좌표는 참고용입니다. 저장은 ‘주소 기준’으로 진행돼요.")
 
+        # 찾는 중인 것이 있으면 주기적으로 확인
+        if waiting:
+            pending_geocodes_live()
+        else:
+            show_pending_geocodes(pending)
+
+        # 클릭한 지점 주변 맛집 (R*Tree 로 조회)
+        if st.session_state["clicked_lat"] is not None and st.session_state["clicked_lon"] is not None:
+            st.markdown("#### 📍 클릭한 곳 주변")
+            nearby = reads.nearest(st.session_state["clicked_lat"], st.session_state["clicked_lon"], k=NEARBY_COUNT)
+            if not nearby:
+                st.caption("주변에 저장된 맛집이 없어요.")
+            for dist, (bid, name, address, lat, lon, image_path, rating, is_recommended, category, memo) in nearby:
+                rec_mark = "💗" if is_recommended else "·"
+                st.write(f"{rec_mark} **{name}** · {format_distance(dist)} · {render_stars(rating)}")
+
+        # 맛집 목록 일괄 가져오기
+        with st.expander("📥 맛집 목록 한 번에 가져오기 (CSV/JSON)"):
+            st.caption("열: 가게 이름, 주소, 별점, 추천(추천/비추천), 카테고리, 메모")
+            import_file = st.file_uploader("목록 파일", type=["csv", "json"], key="import_file")
+            if st.button("가져오기", disabled=import_file is None):
+                try:
+                    records = parse_records(import_file.getvalue(), import_file.name)
+                except Exception as e:
+                    st.error(f"파일을 읽지 못했어요: {e}")
+                    st.stop()
+                progress = st.progress(0.0, text="주소 확인 중…")
+                with prof.span("bulk import"):
+                    report = import_bookmarks(
+                        db,
+                        geocoder,
+                        records,
+                        on_progress=lambda done, total: progress.progress(done / total, text=f"주소 확인 중… {done}/{total}"),
+                    )
+                prof.count("imported", report.inserted)
+                progress.empty()
+                st.success(f"{report.total}곳 중 {report.inserted}곳을 가져왔어요 ({report.seconds:.1f}초)")
+                if report.failures:
+                    st.warning(f"{len(report.failures)}곳은 가져오지 못했어요.")
+                    st.dataframe(
+                        [{"행": no, "가게 이름": name, "사유": reason} for no, name, reason in report.failures],
+                        hide_index=True,
+                    )
+
     with col_map:
-        base_lat = st.session_state["clicked_lat"] if st.session_state["clicked_lat"] is not None else 37.5665
-        base_lon = st.session_state["clicked_lon"] if st.session_state["clicked_lon"] is not None else 126.9780
-
-        m = folium.Map(location=[base_lat, base_lon], zoom_start=13, tiles="OpenStreetMap")
-        rows_filtered = apply_filter(get_all_bookmarks(), filter_mode)
-
-        for bid, name, address, lat, lon, image_path, rating, is_recommended, category, memo in rows_filtered:
-            name_esc = html.escape(name or "")
-            address_esc = html.escape(address or "")
-            category_esc = html.escape(category or "")
-
-            popup_html = f"<b>{name_esc}</b><br>{address_esc}"
-            if category_esc:
-                popup_html += f"<br>카테고리: {category_esc}"
-            if rating is not None:
-                popup_html += f"<br>별점: {render_stars(rating)}"
-            if image_path:
-                data_uri = image_file_to_data_uri(image_path)
-                if data_uri:
-                    popup_html += f"<br><img src='{data_uri}' width='200' />"
-
-            folium.Marker(
-                location=[lat, lon],
-                popup=folium.Popup(popup_html, max_width=320),
-                icon=marker_icon(is_recommended),
-            ).add_to(m)
-
-        map_data = st_folium(m, width="100%", height=650)
+        center_lat = st.session_state["clicked_lat"] if st.session_state["clicked_lat"] is not None else DEFAULT_LAT
+        center_lon = st.session_state["clicked_lon"] if st.session_state["clicked_lon"] is not None else DEFAULT_LON
+        zoom = st.session_state["map_zoom"]
+
+        cluster_markers = st.toggle("마커가 많으면 묶어서 보기", value=True)
+
+        # 기본 지도는 매번 같은 모양으로 만들어 st_folium 이 다시 마운트하지 않게 하고,
+        # 마커는 (피드가 없으면) 현재 화면 범위만 골라 feature group 으로 따로 보낸다
+        bookmark_feed = get_bookmark_feed()
+        m = folium.Map(location=[DEFAULT_LAT, DEFAULT_LON], zoom_start=DEFAULT_ZOOM, **map_tiles())
+        BeautifyIconAssets().add_to(m)
+        if bookmark_feed is not None:
+            MarkerClusterAssets().add_to(m)
+        layer = folium.FeatureGroup(name="bookmarks")
+        recommended = FILTER_RECOMMENDED.get(filter_mode)
+
+        if bookmark_feed is not None:
+            # 마커 데이터는 GeoJSON 피드로: 지도에는 피드 주소와 필터만 싣고,
+            # 브라우저가 ETag 로 확인해 북마크가 바뀌었을 때만 다시 받는다 (묶기/팝업도 브라우저에서)
+            GeoJsonBookmarks(feed_url(), recommended, filter_category, cluster_markers).add_to(layer)
+        else:
+            bounds = st.session_state["map_bounds"] or estimate_bounds(center_lat, center_lon, zoom)
+            query_bounds = pad_bounds(bounds)
+
+            # 개수를 따로 세지 않고 한도보다 한 행 더 읽어 넘치는지만 본다
+            limit = CLUSTER_MIN_MARKERS if cluster_markers else MAX_MARKERS
+            with prof.span("map query"):
+                rows_in_view = reads.get_bookmarks_in_bounds(query_bounds, recommended, filter_category, limit=limit + 1)
+                if len(rows_in_view) > limit:
+                    if cluster_markers:
+                        cell = cluster_cell(zoom, (bounds[0] + bounds[2]) / 2)
+                        clusters, rows_in_view = reads.cluster_in_bounds(query_bounds, cell, recommended, filter_category)
+                        for count, lat, lon, rec_count in clusters:
+                            add_cluster_marker(layer, count, lat, lon, rec_count)
+                        prof.count("map_clusters", len(clusters))
+                    else:
+                        rows_in_view = rows_in_view[:limit]
+                        st.caption(f"화면 안의 최근 {MAX_MARKERS}곳만 표시합니다. 지도를 확대해 보세요.")
+
+            with prof.span("markers"):
+                marker_element = get_marker_cache().layer_element(rows_in_view)
+                marker_element.add_to(layer)
+            prof.count("map_markers", len(rows_in_view))
+            prof.count("marker_bytes", len(marker_element.rows_js.encode()))
+
+        with prof.span("st_folium"):
+            map_data = st_folium(
+                m,
+                key="bookmark_map",
+                center=(center_lat, center_lon),
+                zoom=zoom,
+                feature_group_to_add=layer,
+                width="100%",
+                height=650,
+            )
+
+        # 다음 rerun 에서 쓸 화면 범위/줌
+        new_bounds = bounds_from_map_data(map_data)
+        if new_bounds is not None:
+            st.session_state["map_bounds"] = new_bounds
+        if isinstance(map_data, dict) and map_data.get("zoom"):
+            st.session_state["map_zoom"] = int(map_data["zoom"])
 
         # 클릭 좌표(참고용)
         last_clicked = None
@@ -443,6 +690,9 @@ if mode == "맛집 지도":
             lat_val = last_clicked.get("lat")
             lng_val = last_clicked.get("lng")
             if lat_val is not None and lng_val is not None:
+                if (float(lat_val), float(lng_val)) != (st.session_state["clicked_lat"], st.session_state["clicked_lon"]):
+                    # 지도가 클릭 지점으로 옮겨가므로 이전 화면 범위는 버린다
+                    st.session_state["map_bounds"] = None
                 st.session_state["clicked_lat"] = float(lat_val)
                 st.session_state["clicked_lon"] = float(lng_val)
 
@@ -454,18 +704,61 @@ elif mode == "한 입 노트":
     st.subheader("한 입 노트")
 
     # ✅ 검색 1줄
-    q = st.text_input("가게 검색", value=st.session_state.get("review_q", ""), placeholder="이름/주소로 검색")
+    q = st.text_input("가게 검색", value=st.session_state.get("review_q", ""), placeholder="이름/주소/메모/카테고리로 검색")
     st.session_state["review_q"] = q
 
-    rows = apply_filter(get_all_bookmarks(), filter_mode)
-
-    # 검색 적용(이름/주소)
-    if q.strip():
-        qq = q.strip().lower()
-        rows = [
-            r for r in rows
-            if (r[1] and qq in r[1].lower()) or (r[2] and qq in r[2].lower())
-        ]
+    page_size = st.selectbox(
+        "한 페이지에", REVIEW_PAGE_SIZES, index=1, format_func=lambda n: f"{n}곳씩", key="review_page_size"
+    )
+    query = q.strip()
+    recommended = FILTER_RECOMMENDED.get(filter_mode)
+
+    # 필터/검색어/페이지 크기가 바뀌면 첫 페이지부터
+    signature = (filter_mode, filter_category, query, page_size)
+    if st.session_state.get("review_signature") != signature:
+        st.session_state["review_signature"] = signature
+        st.session_state["review_page"] = 0
+        st.session_state["review_cursors"] = [None]
+    page = st.session_state["review_page"]
+    cursors = st.session_state["review_cursors"]
+
+    if query:
+        # 검색은 FTS5 색인으로 (이름/주소/메모/카테고리, 관련도 순)
+        with prof.span("review query"):
+            rows = reads.search_bookmarks(
+                query, recommended, filter_category, limit=page_size, offset=page * page_size
+            )
+            found = reads.count_search_results(query, recommended, filter_category)
+        has_next = (page + 1) * page_size < found
+    else:
+        # 최근 순 목록은 rowid keyset 페이지, 전체 개수는 사이드바에서 이미 센 추천/비추천 수로
+        with prof.span("review query"):
+            rows, next_cursor = reads.list_bookmarks_page(recommended, filter_category, cursors[page], page_size)
+        found = {None: total_count, True: rec_count, False: nonrec_count}[recommended]
+        has_next = next_cursor is not None
+        del cursors[page + 1:]
+        if has_next:
+            cursors.append(next_cursor)
+
+    if rows:
+        start = page * page_size
+        st.caption(f"{found}곳 중 {start + 1}–{start + len(rows)}번째")
+
+    # 고른 맛집 한 번에 바꾸기/지우기 (한 트랜잭션)
+    selected = st.session_state["selected_bookmarks"]
+    page_ids = [row[0] for row in rows]
+    sel_cols = st.columns([2, 2, 6])
+    sel_cols[0].button("이 페이지 모두 선택", on_click=select_bookmarks, args=(page_ids, True), disabled=not rows)
+    sel_cols[1].button("선택 해제", on_click=select_bookmarks, args=(list(selected), False), disabled=not selected)
+    if selected:
+        with st.container(border=True):
+            st.markdown(f"**{len(selected)}곳 선택됨**")
+            bulk = st.columns([2, 2, 2, 2, 1])
+            bulk[0].selectbox("카테고리", CATEGORIES, key="bulk_category", label_visibility="collapsed")
+            bulk[1].button("카테고리 바꾸기", on_click=set_selected_category)
+            bulk[2].button("추천으로", on_click=update_selected, kwargs={"is_recommended": True})
+            bulk[3].button("비추천으로", on_click=update_selected, kwargs={"is_recommended": False})
+            bulk[4].button("삭제", key="bulk-delete", on_click=delete_bookmarks, args=(list(selected),))
 
     if not rows:
         st.info("조건에 맞는 맛집이 없습니다.")
@@ -475,9 +768,13 @@ elif mode == "한 입 노트":
                 top = st.columns([1.2, 4.8, 1.0])
 
                 with top[0]:
-                    if image_path and Path(image_path).exists():
+                    # 목록에는 원본 대신 썸네일만
+                    with prof.span("thumbnails"):
+                        list_thumb = thumb_path(bid, image_path) if image_path else None
+                    if list_thumb is not None:
                         try:
-                            st.image(image_path, use_column_width=True)
+                            prof.count("image_bytes", list_thumb.stat().st_size)
+                            st.image(str(list_thumb), use_column_width=True)
                         except Exception:
                             st.caption("이미지 로드 실패")
                     else:
@@ -486,6 +783,8 @@ elif mode == "한 입 노트":
                 with top[1]:
                     st.markdown(f"### {name}")
                     st.caption(address)
+                    if lat is None:
+                        st.caption("📍 아직 지도에 없어요 (위치를 찾는 중이거나 찾지 못했어요)")
 
                     rec_text = "추천" if is_recommended else "비추천"
                     # 카테고리는 한 줄에만 살짝(원하면 지워도 됨)
@@ -495,11 +794,11 @@ elif mode == "한 입 노트":
                         st.write(f"{rec_text} · {render_stars(rating)}")
 
                 with top[2]:
-                    st.caption(" ")
+                    # 다른 페이지에 다녀와도 선택이 남도록 위젯 상태를 선택 목록에서 다시 채운다
+                    st.session_state.setdefault(f"sel-{bid}", bid in selected)
+                    st.checkbox("선택", key=f"sel-{bid}", on_change=toggle_selected, args=(bid,))
                     if st.button("삭제", key=f"del-{bid}"):
-                        delete_bookmark(bid)
-                        st.session_state["edit_memo"].pop(bid, None)
-                        st.session_state.pop(f"memo-edit-{bid}", None)
+                        delete_bookmarks([bid])
                         st.rerun()
 
                 st.divider()
@@ -532,7 +831,7 @@ elif mode == "한 입 노트":
                     action = st.columns([1, 1, 6])
                     with action[0]:
                         if st.button("💾 저장", key=f"save-{bid}"):
-                            update_memo(bid, new_memo.strip() if new_memo.strip() else None)
+                            db.update_memo(bid, new_memo.strip() if new_memo.strip() else None)
                             st.session_state["edit_memo"][bid] = False
                             st.session_state.pop(f"memo-edit-{bid}", None)
                             st.rerun()
@@ -543,6 +842,21 @@ elif mode == "한 입 노트":
                             st.session_state.pop(f"memo-edit-{bid}", None)
                             st.rerun()
 
+        # 페이지 이동 (한 번에 그리는 카드 수는 page_size 로 제한)
+        if page > 0 or has_next:
+            pager = st.columns([1, 3, 1])
+            with pager[0]:
+                if st.button("◀ 이전", disabled=page == 0, key="review-prev"):
+                    st.session_state["review_page"] = page - 1
+                    st.rerun()
+            with pager[1]:
+                pages = max(1, -(-found // page_size))
+                st.markdown(f"<div style='text-align:center'>{page + 1} / {pages} 페이지</div>", unsafe_allow_html=True)
+            with pager[2]:
+                if st.button("다음 ▶", disabled=not has_next, key="review-next"):
+                    st.session_state["review_page"] = page + 1
+                    st.rerun()
+
 
 # ==========================
 # 화면 3: 오늘의 한 입 앨범
@@ -565,167 +879,160 @@ elif mode == "오늘의 한 입 앨범":
             if not photo_files:
                 st.warning("업로드할 사진을 선택해주세요.")
             else:
-                count = 0
-                for file in photo_files:
-                    try:
-                        img = Image.open(io.BytesIO(file.read()))
-                        img.thumbnail((1920, 1920))
-                        pid = str(uuid.uuid4())
-                        filename = f"{date_str}_{pid}.png"
-                        save_path = PHOTOS_DIR / filename
-                        img.save(save_path, format="PNG")
-                        insert_photo(pid, "", date_str, str(save_path))
-                        count += 1
-                    except Exception as e:
-                        st.warning(f"사진 저장 중 오류 발생: {e}")
-                if count > 0:
-                    st.success(f"{count}장의 사진이 저장되었습니다.")
+                # 축소/인코딩은 프로세스 풀에서, DB 저장은 한 트랜잭션으로
+                progress = st.progress(0.0, text="사진 저장 중…")
+                with prof.span("photo ingest"):
+                    report = ingest_photos(
+                        db,
+                        images,
+                        [(file.name, file.getvalue()) for file in photo_files],
+                        date_str,
+                        on_progress=lambda done, total, name: progress.progress(
+                            done / total, text=f"사진 저장 중… {done}/{total} ({name})"
+                        ),
+                    )
+                prof.count("upload_bytes", sum(file.size for file in photo_files))
+                progress.empty()
+                for name, reason in report.failures:
+                    st.warning(f"사진 저장 중 오류 발생 ({name}): {reason}")
+                if report.saved > 0:
+                    st.success(f"{report.saved}장의 사진이 저장되었습니다.")
+                    if report.reused > 0:
+                        st.caption(f"이미 저장된 사진 {report.reused}장은 다시 만들지 않았어요.")
                     st.session_state["album_index"] = 0
+                    interrupted_rerun()
                     st.rerun()
 
     st.divider()
-    st.markdown(f"#### {date_str} 사진 모아보기")
-
-    photos = get_photos_by_date(date_str)
-    if not photos:
-        st.info("이 날짜에는 아직 업로드된 사진이 없습니다.")
+    album_scopes = {"하루": "day", "이번 주": "week", "이번 달": "month"}
+    scope_label = st.radio("모아볼 기간", list(album_scopes), horizontal=True, key="album_scope")
+    range_start, range_end = date_range(selected_date, album_scopes[scope_label])
+    if range_start == range_end:
+        st.markdown(f"#### {date_str} 사진 모아보기")
     else:
-        idx = st.session_state.get("album_index", 0)
-        idx = max(0, min(idx, len(photos) - 1))
-        st.session_state["album_index"] = idx
-
-        pid, store_name, d, image_path = photos[idx]
-
-        st.write(f"총 {len(photos)}장 중 {idx + 1}번째")
-
-        col_l, col_c, col_r = st.columns([1, 2, 1])
-        with col_c:
-            if Path(image_path).exists():
-                st.image(image_path, use_column_width=True)
-            else:
-                st.write("[이미지 파일을 찾을 수 없습니다]")
-
-        del_cols = st.columns([2, 1, 6])
-        with del_cols[0]:
-            confirm = st.checkbox("삭제 확인", key=f"delcheck-{pid}")
-        with del_cols[1]:
-            if st.button("삭제", key=f"delete-{pid}"):
-                if not confirm:
-                    st.warning("‘삭제 확인’을 체크해 주세요.")
-                else:
-                    delete_photo(pid)
-                    photos2 = get_photos_by_date(date_str)
-                    if not photos2:
-                        st.session_state["album_index"] = 0
-                    else:
-                        st.session_state["album_index"] = min(idx, len(photos2) - 1)
-                    st.rerun()
-
-        col_prev, col_info, col_next = st.columns([1, 3, 1])
-        with col_prev:
-            if st.button("⬅ 이전"):
-                st.session_state["album_index"] = (idx - 1) % len(photos)
-                st.rerun()
-        with col_info:
-            dots = "".join("●" if i == idx else "○" for i in range(len(photos)))
-            st.markdown(f"<div style='text-align:center;font-size:20px'>{dots}</div>", unsafe_allow_html=True)
-        with col_next:
-            if st.button("다음 ➡"):
-                st.session_state["album_index"] = (idx + 1) % len(photos)
+        st.markdown(f"#### {range_start} ~ {range_end} 사진 모아보기")
+
+    album_viewer(range_start, range_end)
+
+    # 여러 장 한 번에 지우기 (한 트랜잭션, 파일은 reaper 가 뒤에서)
+    with st.expander("🗑 사진 여러 장 지우기"):
+        range_photos = reads.get_photos_in_range(range_start, range_end)
+        with st.form("photo_bulk_delete"):
+            grid = st.columns(4)
+            for no, (pid, store_name, d, image_path) in enumerate(range_photos):
+                with grid[no % 4]:
+                    photo_thumb = images.path(image_path, "thumb")
+                    if photo_thumb is not None and photo_thumb.exists():
+                        st.image(str(photo_thumb), use_column_width=True)
+                    st.checkbox(d, key=f"photo-sel-{pid}")
+            delete_selected = st.form_submit_button("선택한 사진 삭제", disabled=not range_photos)
+        if delete_selected:
+            chosen = [pid for pid, *_ in range_photos if st.session_state.get(f"photo-sel-{pid}")]
+            if chosen:
+                discard_photo_files(db.delete_photos(chosen))
+                st.session_state["album_index"] = 0
                 st.rerun()
 
+        # 사이드바 달력과 같은 조회라 캐시에서 바로
+        day_count = reads.photo_day_counts(month_start, month_end).get(date_str, 0)
+        confirm_day = st.checkbox(f"{date_str} 사진 {day_count}장을 모두 지울게요", key="photo-day-confirm")
+        if st.button(f"{date_str} 사진 모두 삭제", disabled=not (confirm_day and day_count)):
+            discard_photo_files(db.delete_photos_on(date_str))
+            st.session_state["album_index"] = 0
+            st.rerun()
+
 
 # ==========================
 # 화면 4: 카테고리 통계
 # ==========================
 elif mode == "카테고리 통계":
-    import pandas as pd
-    import matplotlib.pyplot as plt
-    from matplotlib import font_manager, rc
-
     st.markdown("### 📊 카테고리 통계")
 
-    # ---------- 한글 폰트 ----------
-    try:
-        font_path = "C:/Windows/Fonts/malgun.ttf"
-        font = font_manager.FontProperties(fname=font_path).get_name()
-        rc("font", family=font)
-        plt.rcParams["axes.unicode_minus"] = False
-    except Exception:
-        pass
-
-    # ---------- 고정 카테고리 ----------
-    categories = [
-        "한식", "중식", "일식", "아시안",
-        "양식", "패스트푸드",
-        "카페/디저트", "술집", "미분류"
-    ]
-
-    # ---------- 데이터 ----------
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT category FROM bookmarks", conn)
-    conn.close()
-
-    if df.empty:
-        counts = pd.Series(0, index=categories)
-    else:
-        counts = (
-            df["category"]
-            .fillna("미분류")
-            .value_counts()
-            .reindex(categories, fill_value=0)
-        )
+    # ---------- 데이터 (GROUP BY 집계, 조회 캐시) ----------
+    stats = reads.category_stats()
+    labels = category_labels(stats)
+    values = [stats.get(label, (0,))[0] for label in labels]
 
-    labels = counts.index.tolist()
-    values = counts.values.tolist()
-
-    # ---------- 색상 ----------
-    color_map = {
-        "한식": "#4E79A7",
-        "중식": "#F28E2B",
-        "일식": "#59A14F",
-        "아시안": "#E15759",
-        "양식": "#9C755F",
-        "패스트푸드": "#B07AA1",
-        "카페/디저트": "#FF4FA3",
-        "술집": "#4A4A4A",
-        "미분류": "#BAB0AC",
-    }
-    colors = [color_map[l] for l in labels]
-
-    # ---------- 차트 (조금 크게) ----------
-    fig, ax = plt.subplots(
-        figsize=(4.4, 2.8),   # 🔼 차트는 키움
-        dpi=180
+    # ---------- 가운데 정렬 ----------
+    col_l, col_c, col_r = st.columns([1, 2, 1])
+    with col_c:
+        # 같은 집계면 그려 둔 PNG 를 그대로 쓴다
+        with prof.span("category chart"):
+            chart_png = category_chart(tuple(labels), tuple(values))
+        prof.count("image_bytes", len(chart_png))
+        st.image(chart_png, use_column_width=True)
+
+    # ---------- 카테고리별 추천 비율 / 평균 별점 ----------
+    st.markdown("#### 카테고리별 추천 비율")
+    st.dataframe(
+        [
+            {
+                "카테고리": label,
+                "맛집 수": count,
+                "추천 비율": f"{rec / count:.0%}",
+                "평균 별점": round(avg_rating, 1) if avg_rating is not None else None,
+            }
+            for label in labels
+            if label in stats
+            for count, rec, avg_rating in [stats[label]]
+        ],
+        hide_index=True,
     )
 
-    x = range(len(labels))
-    ax.bar(x, values, color=colors, width=0.55)
-
-    # ---------- 글씨는 작게 유지 ----------
-    ax.set_xticks(x)
-    ax.set_xticklabels(labels, fontsize=4, color="#555555")
-    ax.set_ylabel("횟수", fontsize=5)
+    col_rating, col_month = st.columns(2)
+    with col_rating:
+        st.markdown("#### 별점 분포")
+        rating_counts = reads.rating_counts()
+        st.bar_chart({"개수": [rating_counts.get(r, 0) for r in range(1, 6)]}, x_label="별점 (1~5)")
+    with col_month:
+        st.markdown("#### 월별 저장 수")
+        monthly = reads.monthly_additions()
+        if monthly:
+            st.bar_chart({"월": [m for m, _ in monthly], "개수": [c for _, c in monthly]}, x="월", y="개수")
+        else:
+            st.caption("아직 저장된 맛집이 없어요.")
 
-    # 숫자 라벨 (0 제외, 작게)
-    for i, v in enumerate(values):
-      if v > 0:
-        ax.text(i, v + 0.05, str(v), ha="center", va="bottom", fontsize=5)
 
-    # y축 여유
-    ymax = max(values) if values else 0
-    ax.set_ylim(0, ymax + 1)
-
-    # 테두리 제거
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
+# ==========================
+# 성능 패널 (사이드바, 켤 때만)
+# ==========================
+def request_profile():
+    st.session_state["profile_next_rerun"] = True
 
-    # 🔽 차트 전체를 아래로 내림
-    plt.subplots_adjust(top=0.72, bottom=0.32)
 
-    # ---------- 가운데 정렬 ----------
-    col_l, col_c, col_r = st.columns([1, 2, 1])
-    with col_c:
-      st.pyplot(fig)
+def show_perf_record(record):
+    st.caption(f"{record['label']} · {record['total_ms']:.0f} ms · DB 조회 {record['counters'].get('db_queries', 0)}")
+    st.dataframe(
+        [{"구간": name, "횟수": None, "ms": ms} for name, ms in record["phases"].items()]
+        + [{"구간": f"  {name}", "횟수": span["calls"], "ms": span["ms"]} for name, span in record["spans"].items()],
+        hide_index=True,
+    )
+    counters = {name: value for name, value in record["counters"].items() if name != "db_queries"}
+    if counters:
+        st.caption(" · ".join(f"{name} {value:,}" for name, value in counters.items()))
 
 
+st.sidebar.markdown("---")
+perf_panel = st.sidebar.toggle("🛠 성능 패널", key="perf_panel")
+perf_record = finish_rerun()
+if perf_panel:
+    with st.sidebar:
+        st.markdown("#### 이번 rerun")
+        show_perf_record(perf_record)
+        interrupted = st.session_state.pop("perf_interrupted", None)
+        if interrupted is not None:
+            st.markdown("#### 직전 rerun (저장 후 다시 그리기 전)")
+            show_perf_record(interrupted)
+        st.caption(
+            f"백그라운드 · 지오코딩 {geocode_worker.stats} · 파일 정리 {reaper.stats} · 앨범 {album_images.stats}"
+        )
+        if db.writer is not None:
+            # 대기열 길이, 묶음(커밋) 수, 최근 커밋/대기 지연 ms
+            st.caption(f"DB writer · {db.writer.metrics()}")
+        st.caption(f"기록: {PERF_LOG or PERF_LOG_DEFAULT}")
+        st.button("🔬 다음 rerun cProfile", on_click=request_profile)
+
+    if "last_profile" in st.session_state:
+        dump_path, profile_text = st.session_state["last_profile"]
+        with st.expander(f"🔬 cProfile (누적 시간 순) · {dump_path}"):
+            st.code(profile_text)
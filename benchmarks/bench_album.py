@@ -0,0 +1,78 @@
+"""
+앨범 넘기기 벤치마크: 사진 한 장을 보여 주기까지 걸리는 시간 (이미지 준비만, 화면 렌더 제외).
+
+legacy     예전 사진(1920px PNG)을 매번 줄여서 읽기
+medium     저장소의 medium 사본을 매번 파일에서 읽기
+prefetched ImagePrefetcher: 앞뒤 사진을 미리 읽어 두고, 사진마다 --dwell 초 동안 본다고 가정
+
+    python benchmarks/bench_album.py --count 100
+"""
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image  # noqa: E402
+
+from db import Database  # noqa: E402
+from imagestore import ImageStore  # noqa: E402
+from photos import ALBUM_PREFETCH, ImagePrefetcher, load_display_image  # noqa: E402
+
+
+def make_photo(i):
+    img = Image.linear_gradient("L").resize((1920, 1440)).convert("RGB")
+    img.paste((i * 7 % 256, 80, 160), (0, 0, 400, 400))
+    return img
+
+
+def flip(paths, get, dwell=0.0, prefetch=None):
+    """사진을 처음부터 끝까지 넘기며 한 장당 준비 시간(ms) 목록."""
+    times = []
+    for idx, path in enumerate(paths):
+        if prefetch is not None:
+            prefetch([paths[(idx + step) % len(paths)] for step in range(-ALBUM_PREFETCH, ALBUM_PREFETCH + 1) if step])
+        started = time.perf_counter()
+        get(path)
+        times.append((time.perf_counter() - started) * 1000)
+        time.sleep(dwell)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--dwell", type=float, default=0.2, help="사진 한 장을 보는 시간(초)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        store = ImageStore(db, root=Path(tmp) / "images")
+        legacy_paths, refs = [], []
+        for i in range(args.count):
+            img = make_photo(i)
+            path = Path(tmp) / f"legacy_{i}.png"
+            img.save(path, format="PNG")
+            legacy_paths.append(str(path))
+            buf = io.BytesIO()
+            img.save(buf, format="JPEG", quality=90)
+            refs.append(store.put(buf.getvalue()))
+
+        prefetcher = ImagePrefetcher(lambda ref: load_display_image(store, ref))
+        results = [
+            ("legacy", flip(legacy_paths, lambda p: load_display_image(store, p))),
+            ("medium", flip(refs, lambda r: load_display_image(store, r))),
+            ("prefetched", flip(refs, prefetcher.get, args.dwell, prefetcher.prefetch)),
+        ]
+        db.close()
+
+    print(f"{'mode':<10} | {'mean (ms)':>9} | {'max (ms)':>8}")
+    for mode, times in results:
+        print(f"{mode:<10} | {sum(times) / len(times):>9.2f} | {max(times):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+여러 행 한 번에 처리하기: 한 행씩(행마다 트랜잭션/커밋, 삭제는 파일도 바로 unlink) vs 묶음 API (한 트랜잭션).
+북마크는 절반이 예전 방식 이미지 파일을 가진다. 값은 초당 처리 행 수.
+
+batch 삭제는 FileReaper 에 파일을 넘기고 돌아올 때까지, (files done) 은 reaper 가 파일을 다 지울 때까지.
+
+    python benchmarks/bench_bulk.py --rows 2000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db import Database  # noqa: E402
+from reaper import FileReaper  # noqa: E402
+
+DAY = "2024-05-01"
+
+
+def seed(db, n, files_dir):
+    bids, rows = [], []
+    for i in range(n):
+        bid = str(uuid.uuid4())
+        image_path = None
+        if i % 2 == 0:
+            image_path = files_dir / f"{bid}.png"
+            image_path.write_bytes(b"\x89PNG" + bytes(1024))
+            image_path = str(image_path)
+        rows.append((bid, f"가게 {i}", f"서울 {i}", 37.5, 127.0, image_path, 3, i % 2, "한식", None))
+        bids.append(bid)
+    db.insert_bookmarks_many(rows)
+    photos = [(str(uuid.uuid4()), "", DAY, None) for _ in range(n)]
+    db.insert_photos_many(photos)
+    pids = [pid for pid, *_ in photos]
+    return bids, pids
+
+
+def rate(n, seconds):
+    return n / seconds if seconds else float("inf")
+
+
+def run(n, batch):
+    """{작업: 초}"""
+    times = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        files_dir = Path(tmp) / "files"
+        files_dir.mkdir()
+        db = Database(Path(tmp) / "bench.db")
+        bids, pids = seed(db, n, files_dir)
+        reaper = FileReaper().start()
+
+        started = time.perf_counter()
+        if batch:
+            db.update_bookmarks(bids, category="중식")
+        else:
+            for bid in bids:
+                db.update_bookmarks([bid], category="중식")
+        times["category"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if batch:
+            db.update_memos([(bid, "맛있다") for bid in bids])
+        else:
+            for bid in bids:
+                db.update_memo(bid, "맛있다")
+        times["memo"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if batch:
+            reaper.discard(db.delete_bookmarks(bids))
+            times["delete"] = time.perf_counter() - started
+            reaper.flush()
+            times["delete (files done)"] = time.perf_counter() - started
+        else:
+            for bid in bids:
+                db.delete_bookmark(bid)
+            times["delete"] = times["delete (files done)"] = time.perf_counter() - started
+        assert not any(files_dir.iterdir())
+
+        started = time.perf_counter()
+        if batch:
+            db.delete_photos_on(DAY)
+        else:
+            for pid in pids:
+                db.delete_photo(pid)
+        times["photos of a day"] = time.perf_counter() - started
+
+        reaper.stop(5)
+        db.close()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    one = run(args.rows, batch=False)
+    many = run(args.rows, batch=True)
+    print(f"{'operation':<20} | {'one by one (rows/s)':>19} | {'batch (rows/s)':>14}")
+    for op in one:
+        print(f"{op:<20} | {rate(args.rows, one[op]):>19.0f} | {rate(args.rows, many[op]):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+DB 접근 계층 벤치마크: 매 호출 connect/close (기존 app.py) vs 커넥션 풀(db.Database).
+
+한 번의 "rerun" 은 지도 화면 기준으로 사이드바 집계용 전체 조회 + 지도용 전체 조회 + 메모 수정 1회.
+
+    python benchmarks/bench_db.py --rows 10000 --seconds 5 --sessions 4
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db import Database  # noqa: E402
+
+
+# ---------- 기존 방식 (매번 connect) ----------
+def legacy_get_all_bookmarks(db_path):
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute(
+        """
+        SELECT id, name, address, lat, lon, image_path, rating, is_recommended, category, memo
+        FROM bookmarks
+        ORDER BY rowid DESC
+        """
+    )
+    rows = c.fetchall()
+    conn.close()
+    return rows
+
+
+def legacy_update_memo(db_path, bid, memo_value):
+    conn = sqlite3.connect(db_path, timeout=10)
+    c = conn.cursor()
+    c.execute("UPDATE bookmarks SET memo = ? WHERE id = ?", (memo_value, bid))
+    conn.commit()
+    conn.close()
+
+
+def legacy_rerun(db_path, bid):
+    legacy_get_all_bookmarks(db_path)
+    legacy_get_all_bookmarks(db_path)
+    legacy_update_memo(db_path, bid, "memo")
+
+
+def pooled_rerun(db, bid):
+    db.get_all_bookmarks()
+    db.get_all_bookmarks()
+    db.update_memo(bid, "memo")
+
+
+# ---------- 데이터 ----------
+def seed(db, rows):
+    ids = [str(uuid.uuid4()) for _ in range(rows)]
+    with db.transaction() as conn:
+        conn.executemany(
+            """
+            INSERT INTO bookmarks (id, name, address, lat, lon, image_path, rating, is_recommended, created_at, memo, category)
+            VALUES (?, ?, ?, ?, ?, NULL, ?, ?, '2024-01-01T00:00:00', NULL, '한식')
+            """,
+            [
+                (bid, f"가게 {i}", f"서울특별시 중구 세종대로 {i}", 37.5 + i * 1e-5, 126.9 + i * 1e-5, i % 5 + 1, i % 2)
+                for i, bid in enumerate(ids)
+            ],
+        )
+    return ids
+
+
+def run(fn, seconds, sessions):
+    count = [0] * sessions
+    stop = time.perf_counter() + seconds
+
+    def worker(n):
+        while time.perf_counter() < stop:
+            fn()
+            count[n] += 1
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(count) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--sessions", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        db = Database(db_path)
+        bid = seed(db, args.rows)[0]
+
+        # 기존 방식은 DELETE 저널에서 측정해야 공정하다
+        db.close()
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+        before = run(lambda: legacy_rerun(db_path, bid), args.seconds, args.sessions)
+
+        db = Database(db_path)
+        after = run(lambda: pooled_rerun(db, bid), args.seconds, args.sessions)
+        db.close()
+
+    print(f"rows={args.rows} sessions={args.sessions}")
+    print(f"before (connect per call): {before:8.1f} reruns/sec")
+    print(f"after  (pooled, WAL)     : {after:8.1f} reruns/sec  (x{after / before:.2f})")
+
+
+if __name__ == "__main__":
+    main()
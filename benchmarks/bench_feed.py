@@ -0,0 +1,104 @@
+"""
+지도 마커 보내기: rerun 마다 화면 범위 마커를 지도 HTML 에 싣기 (기존) vs GeoJSON 피드 + ETag (feed.py).
+
+embedded    rerun 한 번에 st_folium 으로 보내는 마커 데이터 바이트 (서울시청 줌 13, 묶기 켬, 묶음 마커 제외)
+feed        rerun 에 싣는 레이어 스크립트 바이트 / 피드 첫 요청 (gzip) / 바뀌지 않았을 때 (304)
+build       데이터 버전이 바뀐 뒤 피드 다시 만들기: 처음 / 북마크 하나 고친 뒤
+
+    python benchmarks/bench_feed.py --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import folium  # noqa: E402
+import requests  # noqa: E402
+
+from db import Database  # noqa: E402
+from feed import BookmarkFeed, serve  # noqa: E402
+from imagestore import ImageStore  # noqa: E402
+from markers import CLUSTER_MIN_MARKERS, GeoJsonBookmarks, MarkerCache, cluster_cell, estimate_bounds, pad_bounds  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+CENTER = (37.5665, 126.9780)
+ZOOM = 13
+
+
+def run(n, rounds):
+    result = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        store = ImageStore(db, root=Path(tmp) / "images")
+        generate(db, store, n, photos=0, images=5)
+
+        bounds = estimate_bounds(*CENTER, ZOOM)
+        rows = db.get_bookmarks_in_bounds(pad_bounds(bounds), limit=CLUSTER_MIN_MARKERS + 1)
+        if len(rows) > CLUSTER_MIN_MARKERS:
+            _, rows = db.cluster_in_bounds(pad_bounds(bounds), cluster_cell(ZOOM, CENTER[0]))
+        cache = MarkerCache(lambda bid, image_path: store.url(image_path))
+        result["embedded"] = len(cache.layer_element(rows).rows_js.encode())
+
+        feed = BookmarkFeed(db, lambda bid, image_path: store.url(image_path))
+        server = serve(feed)
+        url = f"http://127.0.0.1:{server.server_address[1]}/bookmarks.geojson"
+        element = GeoJsonBookmarks(url)
+        folium.Map().add_child(folium.FeatureGroup(name="bookmarks").add_child(element))
+        result["feed script"] = len(element._template.module.script(element).encode())
+
+        started = time.perf_counter()
+        current = feed.current()
+        result["build ms"] = (time.perf_counter() - started) * 1000
+        result["body"] = len(current.body)
+
+        session = requests.Session()
+        times_full, times_304 = [], []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            resp = session.get(url, headers={"Accept-Encoding": "gzip"}, stream=True)
+            raw = resp.raw.read()
+            times_full.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            not_modified = session.get(url, headers={"If-None-Match": resp.headers["ETag"]})
+            times_304.append(time.perf_counter() - started)
+            assert not_modified.status_code == 304
+        result["gzip"] = len(raw)
+        result["200 ms"] = sorted(times_full)[rounds // 2] * 1000
+        result["304 ms"] = sorted(times_304)[rounds // 2] * 1000
+
+        bid = random.Random(0).choice(db.map_rows())[0]
+        db.update_bookmarks([bid], category="기타")
+        started = time.perf_counter()
+        feed.current()
+        result["rebuild ms"] = (time.perf_counter() - started) * 1000
+
+        server.shutdown()
+        db.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'bookmarks':>9} | {'embedded/rerun':>14} | {'feed/rerun':>10} | {'feed body':>9} | {'gzip':>8} | "
+        f"{'200 ms':>7} | {'304 ms':>6} | {'build ms':>8} | {'rebuild ms':>10}"
+    )
+    for n in args.sizes:
+        r = run(n, args.rounds)
+        print(
+            f"{n:>9} | {r['embedded']:>14,} | {r['feed script']:>10,} | {r['body']:>9,} | {r['gzip']:>8,} | "
+            f"{r['200 ms']:>7.1f} | {r['304 ms']:>6.1f} | {r['build ms']:>8.1f} | {r['rebuild ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
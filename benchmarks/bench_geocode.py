@@ -0,0 +1,78 @@
+"""
+지오코딩 캐시 벤치마크 (로컬 대역 서버 사용, 네트워크 불필요).
+
+같은 주소를 띄어쓰기만 바꿔 반복 입력하는 작업량으로 적중률과 평균 지연을 잰다.
+
+    python benchmarks/bench_geocode.py --distinct 50 --requests 500 --delay 0.2
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import fake_nominatim  # noqa: E402
+from db import Database  # noqa: E402
+from geocode import Geocoder  # noqa: E402
+
+
+def variants(address, rnd):
+    # 사람들이 실제로 다르게 치는 방식: 공백 여러 개, 번지 붙여 쓰기, 앞뒤 공백
+    parts = address.split(" ")
+    text = (" " * rnd.randint(1, 2)).join(parts)
+    if rnd.random() < 0.5:
+        text = text.replace(" 1", "1")
+    return " " * rnd.randint(0, 1) + text
+
+
+def run(geocoder, workload):
+    started = time.perf_counter()
+    for address in workload:
+        geocoder.geocode(address)
+    return (time.perf_counter() - started) / len(workload) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--distinct", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=0.2, help="대역 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    addresses = [f"서울특별시 중구 세종대로 {100 + i}" for i in range(args.distinct - 1)] + ["없는 주소 1"]
+    workload = [variants(rnd.choice(addresses), rnd) for _ in range(args.requests)]
+
+    server, url = fake_nominatim.start(delay=args.delay)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+
+        uncached = Geocoder(db, url=url)
+        started = time.perf_counter()
+        for address in workload[:20]:
+            uncached.lookup(address)
+        uncached_ms = (time.perf_counter() - started) / 20 * 1000
+
+        cold = Geocoder(db, url=url)
+        cold_ms = run(cold, workload)
+        # 프로세스 재시작: LRU 는 비었지만 SQLite 캐시는 남아 있음
+        restarted = Geocoder(db, url=url)
+        warm_ms = run(restarted, workload)
+        db.close()
+    server.shutdown()
+
+    def hit_rate(stats):
+        hits = stats["lru_hits"] + stats["db_hits"]
+        return hits / (hits + stats["lookups"] + stats["errors"])
+
+    print(f"distinct={args.distinct} requests={args.requests} upstream delay={args.delay * 1000:.0f}ms")
+    print(f"캐시 없음        : {uncached_ms:8.2f} ms/req")
+    print(f"첫 실행 (cold)   : {cold_ms:8.2f} ms/req  적중률 {hit_rate(cold.stats):.1%}  {cold.stats}")
+    print(f"재시작 후 (warm) : {warm_ms:8.2f} ms/req  적중률 {hit_rate(restarted.stats):.1%}  {restarted.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+앱 시작 비용: app.py 맨 위 import 에 걸리는 시간(python -X importtime)과 화면별 첫 렌더 시간.
+매번 새 프로세스에서 재고, --repeat 번 중 가운데 값을 쓴다.
+
+imports     app.py 의 모듈 수준 import 만 실행했을 때 합계와 가장 무거운 모듈들
+            (--rev 를 주면 그 커밋의 app.py import 목록과 비교; 모듈 자체는 지금 트리의 것)
+first run   새 프로세스에서 AppTest 로 화면을 처음 그리는 시간 (그 화면이 읽는 모듈 포함)
+
+    python benchmarks/bench_importtime.py --rev HEAD~1
+"""
+import argparse
+import ast
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SCREENS = ["맛집 지도", "한 입 노트", "오늘의 한 입 앨범", "카테고리 통계"]
+
+FIRST_RUN = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+os.chdir({cwd!r})
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.session_state["mode"] = {screen!r}
+started = time.perf_counter()
+at.run()
+assert not at.exception, at.exception
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def top_level_imports(source):
+    """모듈 수준(함수/분기 밖)의 import 문만."""
+    return [ast.unparse(node) for node in ast.parse(source).body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def importtime(statements):
+    """(합계 ms, {맨 위 모듈: 누적 ms})."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "\n".join(statements)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total, top = 0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        # 들여쓰기가 없는 것이 import 문이 직접 읽은 모듈
+        if name.startswith(" ") and not name.startswith("  "):
+            top[name.strip()] = int(cumulative_us) / 1000
+    return total / 1000, top
+
+
+def measure_imports(statements, repeat):
+    runs = [importtime(statements) for _ in range(repeat)]
+    runs.sort(key=lambda run: run[0])
+    return runs[len(runs) // 2]
+
+
+def first_run_ms(screen, repeat):
+    times = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            # app.py 는 실행 위치의 ./data 를 쓴다
+            code = FIRST_RUN.format(root=str(ROOT), cwd=tmp, app=str(ROOT / "app.py"), screen=screen)
+            result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+            if result.returncode != 0:
+                return None
+            times.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rev", help="비교할 커밋 (예: HEAD~1)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    variants = [("current", (ROOT / "app.py").read_text(encoding="utf-8"))]
+    if args.rev:
+        old = subprocess.run(
+            ["git", "show", f"{args.rev}:app.py"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        variants.insert(0, (args.rev, old))
+
+    for label, source in variants:
+        total, top = measure_imports(top_level_imports(source), args.repeat)
+        print(f"[imports: {label}] {total:.0f} ms")
+        for name, ms in sorted(top.items(), key=lambda item: -item[1])[: args.top]:
+            print(f"  {name:<20} {ms:>8.1f} ms")
+
+    print()
+    print(f"{'screen':<12} | {'first run (ms)':>14}")
+    for screen in SCREENS:
+        ms = first_run_ms(screen, args.repeat)
+        print(f"{screen:<12} | {'error' if ms is None else f'{ms:>14.0f}'}")
+
+
+if __name__ == "__main__":
+    main()
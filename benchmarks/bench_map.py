@@ -0,0 +1,135 @@
+"""
+지도 생성 벤치마크: 전체 북마크를 마커로 (기존) vs 화면 범위 조회 + 격자 묶기,
+그리고 묶지 않은 화면 범위 마커를 folium 객체로 하나씩 (markers) vs MarkerCache (cached: 첫 rerun, cached-2: 다음 rerun).
+
+지도 생성 시간(조회 + folium 객체 + HTML 렌더)과 HTML 크기를 비교한다.
+
+    python benchmarks/bench_map.py --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import folium  # noqa: E402
+
+from db import Database  # noqa: E402
+from markers import (  # noqa: E402
+    CLUSTER_MIN_MARKERS,
+    MAX_MARKERS,
+    BeautifyIconAssets,
+    MarkerCache,
+    add_cluster_marker,
+    cluster_cell,
+    estimate_bounds,
+    marker_icon,
+    pad_bounds,
+    popup_html,
+)
+
+CENTER = (37.5665, 126.9780)
+ZOOM = 13
+
+
+def add_bookmark_marker(layer, row, thumb_url=None):
+    # 예전 방식: 마커마다 folium 객체 (아이콘/팝업도 마커마다)
+    bid, name, address, lat, lon, image_path, rating, is_recommended, category = row
+    folium.Marker(
+        location=[lat, lon],
+        popup=folium.Popup(popup_html(name, address, category, rating, thumb_url), max_width=320, lazy=True),
+        icon=marker_icon(is_recommended),
+    ).add_to(layer)
+
+
+def seed(db, n, rnd):
+    with db.transaction() as conn:
+        conn.executemany(
+            """
+            INSERT INTO bookmarks (id, name, address, lat, lon, image_path, rating, is_recommended, created_at, memo, category)
+            VALUES (?, ?, ?, ?, ?, NULL, ?, ?, '2024-01-01T00:00:00', NULL, '한식')
+            """,
+            [
+                (
+                    str(uuid.uuid4()),
+                    f"가게 {i}",
+                    f"서울특별시 어딘가 {i}",
+                    rnd.uniform(37.45, 37.70),
+                    rnd.uniform(126.80, 127.15),
+                    rnd.randint(1, 5),
+                    rnd.randint(0, 1),
+                )
+                for i in range(n)
+            ],
+        )
+
+
+def build_legacy(db):
+    m = folium.Map(location=list(CENTER), zoom_start=ZOOM, tiles="OpenStreetMap")
+    for row in db.get_all_bookmarks():
+        add_bookmark_marker(m, row[:9])
+    return m
+
+
+def build_viewport(db, markers=None, cluster=True):
+    m = folium.Map(location=list(CENTER), zoom_start=ZOOM, tiles="OpenStreetMap")
+    BeautifyIconAssets().add_to(m)
+    layer = folium.FeatureGroup(name="bookmarks")
+    bounds = estimate_bounds(*CENTER, ZOOM)
+    query_bounds = pad_bounds(bounds)
+    limit = CLUSTER_MIN_MARKERS if cluster else MAX_MARKERS
+    rows = db.get_bookmarks_in_bounds(query_bounds, limit=limit + 1)
+    if len(rows) > limit:
+        if cluster:
+            clusters, rows = db.cluster_in_bounds(query_bounds, cluster_cell(ZOOM, CENTER[0]))
+            for count, lat, lon, rec_count in clusters:
+                add_cluster_marker(layer, count, lat, lon, rec_count)
+        else:
+            rows = rows[:limit]
+    if markers is not None:
+        markers.layer_element(rows).add_to(layer)
+    else:
+        for row in rows:
+            add_bookmark_marker(layer, row)
+    layer.add_to(m)
+    return m
+
+
+def measure(build, db):
+    started = time.perf_counter()
+    m = build(db)
+    html = m.get_root().render()
+    return time.perf_counter() - started, len(html.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=100000, help="이보다 크면 기존 방식은 건너뜀")
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    print(f"{'rows':>7} | {'mode':<9} | {'build (s)':>9} | {'html (KB)':>10}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "bench.db")
+            seed(db, n, rnd)
+            results = []
+            if n <= args.legacy_max:
+                results.append(("legacy", measure(build_legacy, db)))
+            results.append(("viewport", measure(build_viewport, db)))
+            results.append(("markers", measure(lambda db: build_viewport(db, cluster=False), db)))
+            markers = MarkerCache(lambda bid, image_path: None)
+            results.append(("cached", measure(lambda db: build_viewport(db, markers, cluster=False), db)))
+            results.append(("cached-2", measure(lambda db: build_viewport(db, markers, cluster=False), db)))
+            db.close()
+        for mode, (elapsed, size) in results:
+            print(f"{n:>7} | {mode:<9} | {elapsed:>9.3f} | {size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+사진 날짜 조회 벤치마크: 사진 수가 늘어도 하루/한 달 조회와 달력 집계 시간이 거의 같아야 한다.
+
+day         get_photos_by_date (하루)
+month       get_photos_in_range (한 달)
+calendar    photo_day_counts (날짜별 사진 수 표, 한 달)
+group by    같은 달력을 photos 에서 바로 GROUP BY 로 셀 때
+
+    python benchmarks/bench_photo_dates.py --sizes 10000 100000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db import Database  # noqa: E402
+from photos import date_range  # noqa: E402
+
+FIRST_DAY = date(2021, 1, 1)
+DAYS = 3 * 365
+TARGET = date(2022, 6, 15)
+
+
+def seed(db, n, rnd):
+    rows = [
+        (str(uuid.uuid4()), "", (FIRST_DAY + timedelta(days=rnd.randrange(DAYS))).isoformat(), None)
+        for _ in range(n)
+    ]
+    db.insert_photos_many(rows)
+
+
+def group_by_counts(db, start, end):
+    with db.connection() as conn:
+        return dict(
+            conn.execute(
+                "SELECT date, COUNT(*) FROM photos WHERE date BETWEEN ? AND ? GROUP BY date", (start, end)
+            ).fetchall()
+        )
+
+
+def timed(fn, repeat=50):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    start, end = date_range(TARGET, "month")
+    print(f"{'photos':>7} | {'day (ms)':>8} | {'month (ms)':>10} | {'calendar (ms)':>13} | {'group by (ms)':>13}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "bench.db")
+            seed(db, n, rnd)
+            assert db.photo_day_counts(start, end) == group_by_counts(db, start, end)
+            day_ms = timed(lambda: db.get_photos_by_date(TARGET.isoformat()))
+            month_ms = timed(lambda: db.get_photos_in_range(start, end))
+            calendar_ms = timed(lambda: db.photo_day_counts(start, end))
+            group_ms = timed(lambda: group_by_counts(db, start, end))
+            db.close()
+        print(f"{n:>7} | {day_ms:>8.3f} | {month_ms:>10.3f} | {calendar_ms:>13.3f} | {group_ms:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
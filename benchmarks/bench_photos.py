@@ -0,0 +1,93 @@
+"""
+앨범 사진 저장 벤치마크: 한 장씩 PNG 로 저장 + 한 장씩 insert (기존) vs photos.ingest_photos.
+휴대폰 사진 크기(4032x3024, EXIF 회전 있음)의 JPEG 를 만들어 초당 처리 장 수와 저장 용량을 잰다.
+again 은 같은 사진들을 한 번 더 올린 경우 (이미지 저장소에 이미 있어 다시 만들지 않는다).
+
+    python benchmarks/bench_photos.py --count 30 --workers 1 4
+"""
+import argparse
+import io
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from db import Database  # noqa: E402
+from imagestore import ImageStore  # noqa: E402
+from photos import ingest_photos  # noqa: E402
+
+PHONE_SIZE = (4032, 3024)
+
+
+def make_photo(rnd):
+    img = Image.linear_gradient("L").resize(PHONE_SIZE).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for _ in range(200):
+        x, y = rnd.randrange(PHONE_SIZE[0]), rnd.randrange(PHONE_SIZE[1])
+        r = rnd.randint(20, 300)
+        draw.ellipse((x, y, x + r, y + r), fill=tuple(rnd.randrange(256) for _ in range(3)))
+    exif = Image.Exif()
+    exif[0x0112] = 6  # 세로로 찍은 사진 (시계 방향 90도)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=90, exif=exif)
+    return buf.getvalue()
+
+
+def legacy_ingest(db, files, date_str, photos_dir):
+    for name, data in files:
+        img = Image.open(io.BytesIO(data))
+        img.thumbnail((1920, 1920))
+        pid = str(uuid.uuid4())
+        save_path = Path(photos_dir) / f"{date_str}_{pid}.png"
+        img.save(save_path, format="PNG")
+        db.insert_photo(pid, "", date_str, str(save_path))
+
+
+def dir_size(path):
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    photo = make_photo(rnd)
+    # JPEG 뒤에 붙은 바이트는 디코더가 무시하므로 내용 해시만 다른 사진이 된다
+    files = [(f"IMG_{i:04d}.jpg", photo + str(i).encode()) for i in range(args.count)]
+
+    def pipeline(db, d, workers):
+        ingest_photos(db, ImageStore(db, root=d), files, "2024-01-01", workers=workers)
+
+    # (이름, 잴 함수, 먼저 한 번 올려 둘지)
+    runs = [("legacy", lambda db, d: legacy_ingest(db, files, "2024-01-01", d), False)]
+    for workers in args.workers:
+        runs.append((f"pipeline x{workers}", lambda db, d, w=workers: pipeline(db, d, w), False))
+    runs.append(("again", lambda db, d: pipeline(db, d, args.workers[-1]), True))
+
+    print(f"{'mode':<12} | {'photos/s':>8} | {'seconds':>7} | {'MB on disk':>10}")
+    for mode, run, warm in runs:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "bench.db")
+            photos_dir = Path(tmp) / "photos"
+            photos_dir.mkdir()
+            if warm:
+                run(db, photos_dir)
+            started = time.perf_counter()
+            run(db, photos_dir)
+            elapsed = time.perf_counter() - started
+            size = dir_size(photos_dir)
+            db.close()
+        print(f"{mode:<12} | {args.count / elapsed:>8.1f} | {elapsed:>7.2f} | {size / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
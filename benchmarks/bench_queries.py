@@ -0,0 +1,69 @@
+"""
+화면별 rerun 한 번에 실행되는 DB 조회 수와 rerun 시간.
+사이드바 집계 1번 + 화면 조회 1번이 목표다.
+
+    python benchmarks/bench_queries.py --rows 10000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import db as db_module  # noqa: E402
+from bench_search import seed  # noqa: E402
+
+SCREENS = ["맛집 지도", "한 입 노트", "카테고리 통계"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    # 앱이 만든 Database 를 붙잡아 조회 수를 읽는다
+    instances = []
+    original_init = db_module.Database.__init__
+
+    def tracking_init(self, *a, **kw):
+        original_init(self, *a, **kw)
+        instances.append(self)
+
+    db_module.Database.__init__ = tracking_init
+
+    cwd = os.getcwd()
+    print(f"{'screen':<10} | {'queries':>7} | {'rerun (ms)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.py 는 실행 위치의 ./data 를 쓴다
+        os.chdir(tmp)
+        try:
+            (Path(tmp) / "data").mkdir()
+            seeded = db_module.Database(Path(tmp) / "data" / "bookmarks.db")
+            seed(seeded, args.rows, random.Random(0))
+            seeded.close()
+            instances.clear()
+
+            for screen in SCREENS:
+                at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+                at.session_state["mode"] = screen
+                at.run()
+                app_db = instances[-1]
+                before = app_db.query_count
+                started = time.perf_counter()
+                at.run()
+                elapsed = (time.perf_counter() - started) * 1000
+                assert not at.exception, at.exception
+                print(f"{screen:<10} | {app_db.query_count - before:>7} | {elapsed:>10.1f}")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
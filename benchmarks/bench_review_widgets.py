@@ -0,0 +1,56 @@
+"""
+리뷰 화면 한 번 그릴 때의 요소(위젯) 수와 시간을 북마크 수별로 잰다.
+페이지 크기로 제한되므로 북마크가 늘어도 거의 같아야 한다.
+
+    python benchmarks/bench_review_widgets.py --sizes 100 1000 10000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from bench_search import seed  # noqa: E402
+from db import Database  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    cwd = os.getcwd()
+    print(f"{'rows':>7} | {'elements':>8} | {'rerun (ms)':>10}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            # app.py 는 실행 위치의 ./data 를 쓴다
+            os.chdir(tmp)
+            try:
+                (Path(tmp) / "data").mkdir()
+                db = Database(Path(tmp) / "data" / "bookmarks.db")
+                seed(db, n, rnd)
+                db.close()
+
+                at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+                at.session_state["mode"] = "한 입 노트"
+                at.run()
+                started = time.perf_counter()
+                at.run()
+                elapsed = (time.perf_counter() - started) * 1000
+                assert not at.exception, at.exception
+                elements = len(list(at.main))
+            finally:
+                os.chdir(cwd)
+        print(f"{n:>7} | {elements:>8} | {elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
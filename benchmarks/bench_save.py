@@ -0,0 +1,80 @@
+"""
+북마크 저장 지연: 지오코딩을 기다린 뒤 insert (기존) vs 좌표 없이 저장 + GeocodeWorker.
+지오코더 응답을 --delay 초로 늦춘 대역 서버에 처음 보는 주소로 저장한다 (캐시 적중 없음).
+
+save        저장 버튼을 누른 뒤 스크립트가 다시 돌 수 있을 때까지
+on map      저장 버튼을 누른 뒤 좌표가 채워져 지도에 나올 수 있을 때까지
+
+    python benchmarks/bench_save.py --count 10 --delay 1.0
+"""
+import argparse
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fake_nominatim  # noqa: E402
+from db import Database  # noqa: E402
+from geocode import GeocodeWorker, Geocoder  # noqa: E402
+
+
+def legacy_save(db, geocoder, address):
+    lat, lon = geocoder.geocode(address)
+    db.insert_bookmark(str(uuid.uuid4()), "가게", address, lat, lon, None, 5, 1, "한식")
+
+
+def wait_resolved(db, bid, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while db.get_coordinates(bid) is None:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(bid)
+        time.sleep(0.005)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=1.0, help="지오코더 응답 지연(초)")
+    args = parser.parse_args()
+
+    server, url = fake_nominatim.start(delay=args.delay)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+
+        geocoder = Geocoder(db, url=url)
+        save, on_map = [], []
+        for i in range(args.count):
+            started = time.perf_counter()
+            legacy_save(db, geocoder, f"서울 기존구 {i}")
+            save.append(time.perf_counter() - started)
+            on_map.append(save[-1])
+        results.append(("legacy", save, on_map))
+
+        geocoder = Geocoder(db, url=url)
+        worker = GeocodeWorker(db, geocoder).start()
+        save, on_map = [], []
+        for i in range(args.count):
+            bid = str(uuid.uuid4())
+            started = time.perf_counter()
+            db.insert_pending_bookmark(bid, "가게", f"서울 대기열구 {i}", None, 5, 1, "한식")
+            worker.notify()
+            save.append(time.perf_counter() - started)
+            wait_resolved(db, bid)
+            on_map.append(time.perf_counter() - started)
+        worker.stop(5)
+        results.append(("worker", save, on_map))
+        db.close()
+    server.shutdown()
+
+    print(f"{'mode':<7} | {'save (ms)':>9} | {'on map (ms)':>11}")
+    for mode, save, on_map in results:
+        print(f"{mode:<7} | {sum(save) / len(save) * 1000:>9.1f} | {sum(on_map) / len(on_map) * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
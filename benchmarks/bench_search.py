@@ -0,0 +1,124 @@
+"""
+리뷰 검색 벤치마크: 전체 조회 후 Python 필터 (기존) vs FTS5 trigram 색인.
+
+재기 전에 check() 로 검색 결과가 기존 Python 부분 문자열 필터와 같은지 확인한다 (다르면 exit 1).
+단어 중간의 1~2글자('할매국밥집' 의 '국밥', '밥집')처럼 trigram 이 못 다루는 경우를 포함한다.
+
+    python benchmarks/bench_search.py --sizes 10000 100000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db import Database  # noqa: E402
+
+WORDS = ["국밥", "냉면", "파스타", "초밥", "마라탕", "떡볶이", "커피", "케이크", "치킨", "삼겹살", "칼국수", "쌀국수"]
+AREAS = ["종로구 세종대로", "중구 을지로", "마포구 양화로", "강남구 테헤란로", "성동구 왕십리로", "용산구 이태원로"]
+QUERIES = ["명가 4821", "테헤란로 123", "마라탕 하우스 77", "을지로 냉면", "국밥"]
+
+# (이름, 주소, 메모, 카테고리)
+CHECK_ROWS = [
+    ("할매국밥집", "부산 중구 광복로 12", "돼지국밥 진하다", "한식"),
+    ("북카페 무드", "서울 마포구 와우산로 5", None, "카페/디저트"),
+    ("Pasta Bar", "서울 용산구 이태원로 20", "크림 파스타", "양식"),
+    ("을지면옥", "서울 중구 충무로 14", "평양냉면", "한식"),
+]
+# 단어 중간의 짧은 단어, 짧은 단어 둘, 긴 단어 + 짧은 단어, 대소문자, 없는 단어
+CHECK_QUERIES = ["국밥", "밥집", "카페", "국밥 중구", "할매국밥 밥집", "중구 냉면", "ta", "PA", "면옥", "a", "짜장"]
+
+
+def seed(db, n, rnd):
+    with db.transaction() as conn:
+        conn.executemany(
+            """
+            INSERT INTO bookmarks (id, name, address, lat, lon, image_path, rating, is_recommended, created_at, memo, category)
+            VALUES (?, ?, ?, 37.5, 127.0, NULL, 3, ?, '2024-01-01T00:00:00', ?, '한식')
+            """,
+            [
+                (
+                    str(uuid.uuid4()),
+                    f"{rnd.choice(WORDS)} {rnd.choice(['집', '명가', '하우스', '식당'])} {i}",
+                    f"서울특별시 {rnd.choice(AREAS)} {rnd.randint(1, 300)}",
+                    rnd.randint(0, 1),
+                    f"{rnd.choice(WORDS)} 맛집. 국물이 {rnd.choice(['진한', '맑은', '매운'])} 편이고 " * rnd.randint(0, 3),
+                )
+                for i in range(n)
+            ],
+        )
+
+
+def legacy_search(db, q):
+    qq = q.strip().lower()
+    rows = db.get_all_bookmarks()
+    return [r for r in rows if (r[1] and qq in r[1].lower()) or (r[2] and qq in r[2].lower())]
+
+
+def substring_search(rows, q):
+    """기존 동작: 모든 단어가 이름/주소/메모/카테고리 중 하나에 부분 문자열로 있으면 (대소문자 무시)."""
+    terms = q.lower().split()
+    return {
+        name for name, *fields in rows
+        if all(any(field and term in field.lower() for field in (name, *fields)) for term in terms)
+    }
+
+
+def check():
+    """검색 결과가 기존 부분 문자열 필터와 다른 검색어 목록 (빈 목록이면 통과)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "check.db")
+        for name, address, memo, category in CHECK_ROWS:
+            db.insert_bookmark(str(uuid.uuid4()), name, address, 37.5, 127.0, None, 3, 1, category, memo)
+        failures = []
+        for q in CHECK_QUERIES:
+            expected = substring_search(CHECK_ROWS, q)
+            found = {row[1] for row in db.search_bookmarks(q)}
+            if found != expected or db.count_search_results(q) != len(expected):
+                failures.append((q, sorted(expected), sorted(found)))
+        db.close()
+    return failures
+
+
+def fts_search(db, q):
+    return db.search_bookmarks(q, limit=50)
+
+
+def timed(fn, db, repeat=5):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for q in QUERIES:
+            fn(db, q)
+    return (time.perf_counter() - started) / (repeat * len(QUERIES)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    failures = check()
+    for q, expected, found in failures:
+        print(f"검색 결과가 다름: {q!r} 기대 {expected} / FTS {found}")
+    if failures:
+        sys.exit(1)
+    print(f"검색 확인: {len(CHECK_QUERIES)}개 검색어 모두 부분 문자열 필터와 같음")
+
+    rnd = random.Random(0)
+    print(f"{'rows':>7} | {'legacy (ms)':>11} | {'fts5 (ms)':>9}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "bench.db")
+            seed(db, n, rnd)
+            legacy_ms = timed(legacy_search, db, repeat=1)
+            fts_ms = timed(fts_search, db)
+            db.close()
+        print(f"{n:>7} | {legacy_ms:>11.2f} | {fts_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+주변 검색 벤치마크: R*Tree 기반 nearest / within_radius vs 전체 조회 후 거리 계산.
+
+    python benchmarks/bench_spatial.py --rows 100000 --queries 1000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_map import seed  # noqa: E402
+from db import Database  # noqa: E402
+from geo import haversine_m  # noqa: E402
+
+
+def brute_nearest(rows, lat, lon, k):
+    return sorted((haversine_m(lat, lon, r[3], r[4]), r[0]) for r in rows)[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--radius", type=float, default=300.0)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    points = [(rnd.uniform(37.45, 37.70), rnd.uniform(126.80, 127.15)) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        seed(db, args.rows, rnd)
+
+        started = time.perf_counter()
+        for lat, lon in points:
+            db.nearest(lat, lon, args.k)
+        nearest_ms = (time.perf_counter() - started) / len(points) * 1000
+
+        started = time.perf_counter()
+        found = 0
+        for lat, lon in points:
+            found += len(db.within_radius(lat, lon, args.radius))
+        radius_ms = (time.perf_counter() - started) / len(points) * 1000
+
+        # 정확도 확인 + 기존 방식(전체 조회) 시간
+        sample = points[:20]
+        started = time.perf_counter()
+        for lat, lon in sample:
+            expected = [bid for _, bid in brute_nearest(db.get_all_bookmarks(), lat, lon, args.k)]
+            got = [row[0] for _, row in db.nearest(lat, lon, args.k)]
+            assert got == expected, (lat, lon, got, expected)
+        brute_ms = (time.perf_counter() - started) / len(sample) * 1000
+        db.close()
+
+    print(f"rows={args.rows} queries={args.queries}")
+    print(f"nearest(k={args.k})          : {nearest_ms:8.3f} ms/query")
+    print(f"within_radius({args.radius:.0f}m)    : {radius_ms:8.3f} ms/query (평균 {found / len(points):.1f}곳)")
+    print(f"get_all + 거리 정렬 (기존) : {brute_ms:8.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
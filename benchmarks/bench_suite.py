@@ -0,0 +1,152 @@
+"""
+화면 없이 도는 벤치마크 묶음: synthetic.py 로 N 곳을 채운 DB 에서 화면마다 하는 일을 그대로 불러
+지연(중앙값 ms)과 최대 메모리(tracemalloc peak, Python 할당만 — SQLite 내부 캐시는 빠진다)를 잰다.
+
+    python benchmarks/bench_suite.py                                    # 1k / 10k / 100k
+    python benchmarks/bench_suite.py --sizes 1000 10000 --save base.json
+    python benchmarks/bench_suite.py --sizes 1000 10000 --compare base.json   # 느려진 항목이 있으면 exit 1
+
+지연은 tracemalloc 없이 --repeat 번 돌린 중앙값, 메모리는 따로 한 번 더 돌려서 잰다.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from db import Database  # noqa: E402
+from imagestore import ImageStore  # noqa: E402
+from markers import MarkerCache, cluster_cell, estimate_bounds, pad_bounds  # noqa: E402
+from photos import date_range, ingest_photos  # noqa: E402
+from stats import category_chart_png, category_labels  # noqa: E402
+from synthetic import generate, make_image  # noqa: E402
+
+CENTER = (37.5665, 126.9780)
+ZOOM = 13
+SEARCH_TERMS = ["국밥", "강남 스시", "냉", "테헤란로"]
+INGEST_PHOTOS = 3
+ALBUM_DAY = date(2024, 3, 15)
+
+
+def map_view(db, store, zoom=ZOOM):
+    """지도 화면 한 번: 화면 범위 격자 묶기 + 혼자인 칸 마커 (MarkerCache 는 비어 있는 상태)."""
+    bounds = pad_bounds(estimate_bounds(*CENTER, zoom))
+    clusters, singles = db.cluster_in_bounds(bounds, cluster_cell(zoom, CENTER[0]))
+    cache = MarkerCache(lambda bid, image_path: store.url(image_path, "thumb"))
+    return clusters, cache.layer_element(singles).rows_js
+
+
+def stats_view(db):
+    stats = db.category_stats()
+    labels = category_labels(stats)
+    values = [stats.get(label, (0,))[0] for label in labels]
+    return category_chart_png(labels, values), db.rating_counts(), db.monthly_additions()
+
+
+def operations(db, store, rnd):
+    """[(이름, 인자 없는 함수), ...] — 화면별로 rerun 때 부르는 것들."""
+    terms = iter(lambda: rnd.choice(SEARCH_TERMS), None)
+    start, end = date_range(ALBUM_DAY, "month")
+    photos = iter(lambda: [(f"p{i}.jpg", make_image(rnd, (800, 600))) for i in range(INGEST_PHOTOS)], None)
+    return [
+        ("get_all_bookmarks", db.get_all_bookmarks),
+        ("count_by_recommend", lambda: db.count_by_recommend("한식")),
+        ("review page", lambda: db.list_bookmarks_page(recommended=True)),
+        ("review search", lambda: db.search_bookmarks(next(terms), limit=20)),
+        ("map bounds", lambda: db.get_bookmarks_in_bounds(pad_bounds(estimate_bounds(*CENTER, 15)))),
+        ("map view", lambda: map_view(db, store)),
+        ("nearest", lambda: db.nearest(*CENTER, k=5)),
+        ("stats", lambda: stats_view(db)),
+        ("album month", lambda: (db.photo_day_counts(start, end), db.get_photos_in_range(start, end))),
+        ("photo ingest", lambda: ingest_photos(db, store, next(photos), ALBUM_DAY.isoformat(), workers=1)),
+    ]
+
+
+def measure(fn, repeat):
+    """(중앙값 ms, peak KiB)"""
+    fn()  # 첫 호출(모듈/페이지 캐시 데우기)은 빼고 잰다
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024
+
+
+def run(n, photos, repeat):
+    """{작업: {"ms": .., "peak_kib": ..}}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        store = ImageStore(db, root=Path(tmp) / "images")
+        generate(db, store, n, photos, images=10)
+        for name, fn in operations(db, store, random.Random(0)):
+            ms, peak = measure(fn, repeat)
+            results[name] = {"ms": round(ms, 3), "peak_kib": round(peak, 1)}
+        db.close()
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """기준보다 tolerance 배 넘게 느리거나 메모리를 더 쓴 [(크기, 작업, 항목, 기준, 지금), ...]."""
+    found = []
+    for size, ops in results.items():
+        for op, now in ops.items():
+            before = baseline.get(size, {}).get(op)
+            if before is None:
+                continue
+            for key in ("ms", "peak_kib"):
+                if now[key] > before[key] * (1 + tolerance):
+                    found.append((size, op, key, before[key], now[key]))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--photos", type=int, default=None, help="사진 수 (기본: 북마크 수의 1/10)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", help="결과를 JSON 으로 저장 (다음 --compare 의 기준)")
+    parser.add_argument("--compare", help="기준 JSON 과 비교해 느려진 항목이 있으면 exit 1")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 비율 (0.25 = 25%%)")
+    args = parser.parse_args()
+    # 한글 글꼴이 없는 환경에서 차트가 내는 글리프 경고는 결과와 상관없다
+    warnings.filterwarnings("ignore", message="Glyph .* missing from font")
+
+    results = {}
+    for n in args.sizes:
+        photos = args.photos if args.photos is not None else n // 10
+        results[str(n)] = run(n, photos, args.repeat)
+
+    ops = list(next(iter(results.values())))
+    print(f"{'operation':<20} | " + " | ".join(f"{n + ' ms':>10} {'KiB':>8}" for n in results))
+    for op in ops:
+        cells = (f"{results[n][op]['ms']:>10.2f} {results[n][op]['peak_kib']:>8.0f}" for n in results)
+        print(f"{op:<20} | " + " | ".join(cells))
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        found = regressions(results, baseline, args.tolerance)
+        for size, op, key, before, now in found:
+            print(f"REGRESSION {size} {op} {key}: {before} → {now}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+지도 타일 받기: OSM 에서 바로 (기존) vs 로컬 캐시 프록시 (tiles.py).
+대역 타일 서버(fake_tiles.py, 응답 --delay 초)를 업스트림으로, 북마크 근처 화면 --views 개를
+브라우저 --clients 개가 동시에 연다 (브라우저 하나는 연결 6개).
+
+direct      브라우저 → 업스트림
+cold        브라우저 → 프록시 (빈 캐시)
+warm        같은 화면을 다시 (다른 사용자가 같은 곳을 볼 때)
+prefetched  북마크 주변을 미리 받아 둔 새 캐시
+
+    python benchmarks/bench_tiles.py --views 10 --clients 2 --delay 0.1
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import requests  # noqa: E402
+from requests.adapters import HTTPAdapter  # noqa: E402
+
+import fake_tiles  # noqa: E402
+from geo import tile_xy  # noqa: E402
+from markers import estimate_bounds  # noqa: E402
+from synthetic import DISTRICTS  # noqa: E402
+from tiles import TileCache, TileProxy, serve  # noqa: E402
+
+BROWSER_CONNECTIONS = 6
+
+
+def bookmark_points(n, rnd):
+    points = []
+    for _ in range(n):
+        _, _, lat, lon = rnd.choice(DISTRICTS)
+        points.append((lat + rnd.gauss(0, 0.01), lon + rnd.gauss(0, 0.012)))
+    return points
+
+
+def view_tiles(lat, lon, zoom):
+    south, west, north, east = estimate_bounds(lat, lon, zoom)
+    x0, y0 = tile_xy(north, west, zoom)
+    x1, y1 = tile_xy(south, east, zoom)
+    return [(zoom, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+def browser():
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_maxsize=BROWSER_CONNECTIONS))
+    return session
+
+
+def open_views(url, views, clients):
+    """화면마다 모든 브라우저가 타일을 다 받을 때까지 걸린 시간 [초, ...]."""
+    sessions = [browser() for _ in range(clients)]
+    pool = ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS * clients)
+    times = []
+    for tiles in views:
+        started = time.perf_counter()
+        jobs = [
+            pool.submit(lambda s, t: s.get(url.format(z=t[0], x=t[1], y=t[2]), timeout=30).raise_for_status(), s, t)
+            for s in sessions
+            for t in tiles
+        ]
+        for job in jobs:
+            job.result()
+        times.append(time.perf_counter() - started)
+    pool.shutdown()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--views", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--delay", type=float, default=0.1, help="업스트림 응답 지연(초)")
+    parser.add_argument("--bookmarks", type=int, default=200)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    points = bookmark_points(args.bookmarks, rnd)
+    views = [view_tiles(*rnd.choice(points), rnd.choice([14, 15, 16])) for _ in range(args.views)]
+    upstream, upstream_url = fake_tiles.start(delay=args.delay)
+    counter = upstream.RequestHandlerClass
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        before = counter.requests_served
+        results.append(("direct", open_views(upstream_url, views, args.clients), counter.requests_served - before))
+
+        counter.max_active = 0  # 여기부터는 프록시가 여는 업스트림 연결 수
+        proxy = TileProxy(TileCache(Path(tmp) / "cold.mbtiles"), upstream=upstream_url)
+        server = serve(proxy)
+        proxy_url = f"http://127.0.0.1:{server.server_address[1]}/{{z}}/{{x}}/{{y}}.png"
+        for mode in ("cold", "warm"):
+            before = counter.requests_served
+            times = open_views(proxy_url, views, args.clients)
+            results.append((mode, times, counter.requests_served - before))
+        server.shutdown()
+
+        proxy = TileProxy(TileCache(Path(tmp) / "prefetched.mbtiles"), upstream=upstream_url)
+        before, started = counter.requests_served, time.perf_counter()
+        proxy.prefetch_around(points, rate=0).join()
+        prefetch_seconds = time.perf_counter() - started
+        prefetch_requests = counter.requests_served - before
+        server = serve(proxy)
+        proxy_url = f"http://127.0.0.1:{server.server_address[1]}/{{z}}/{{x}}/{{y}}.png"
+        before = counter.requests_served
+        times = open_views(proxy_url, views, args.clients)
+        results.append(("prefetched", times, counter.requests_served - before))
+        server.shutdown()
+    upstream.shutdown()
+
+    total = sum(len(v) for v in views) * args.clients
+    print(f"{args.views} views, {total} tile requests, upstream delay {args.delay * 1000:.0f} ms")
+    print(f"{'mode':<10} | {'view (ms)':>9} | {'p95 (ms)':>8} | {'upstream req':>12}")
+    for mode, times, upstream_requests in results:
+        times = sorted(times)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(f"{mode:<10} | {sum(times) / len(times) * 1000:>9.1f} | {p95 * 1000:>8.1f} | {upstream_requests:>12}")
+    print(
+        f"prefetch: {proxy.stats['prefetched']} tiles, {prefetch_requests} upstream requests in {prefetch_seconds:.1f}s; "
+        f"proxy max concurrent upstream {counter.max_active}"
+    )
+
+
+if __name__ == "__main__":
+    main()
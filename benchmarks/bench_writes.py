@@ -0,0 +1,108 @@
+"""
+여러 세션이 동시에 쓸 때: 스레드마다 BEGIN IMMEDIATE 로 쓰기 락 다투기 (기존) vs 단일 writer (writer.py).
+
+--threads 개 스레드가 저마다 북마크 저장 → 메모 수정 → 사진 저장 → 사진 삭제를 되풀이하고,
+읽기 스레드 하나는 그동안 get_all_bookmarks 를 계속 부른다 (WAL 이라 쓰기를 기다리지 않아야 한다).
+값은 초당 쓰기 수, 쓰기 한 번 지연 p50/p95/최대, 실패("database is locked" 등), 커밋 수, 읽기 p95.
+
+    python benchmarks/bench_writes.py --threads 1 8 32 --ops 200
+"""
+import argparse
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db import Database  # noqa: E402
+from writer import percentile  # noqa: E402
+
+DAY = "2024-05-01"
+
+
+def session(db, ops, latencies, errors):
+    """한 세션의 쓰기 ops 번 (4가지를 돌아가며)."""
+    bid = pid = None
+    for i in range(ops):
+        started = time.perf_counter()
+        try:
+            step = i % 4
+            if step == 0:
+                bid = str(uuid.uuid4())
+                db.insert_bookmark(bid, f"가게 {i}", f"서울 {i}", 37.5, 127.0, None, 4, True, "한식")
+            elif step == 1:
+                db.update_memo(bid, f"메모 {i}")
+            elif step == 2:
+                pid = str(uuid.uuid4())
+                db.insert_photo(pid, "가게", DAY, None)
+            else:
+                db.delete_photos([pid])
+        except Exception as e:
+            errors.append(repr(e))
+        latencies.append(time.perf_counter() - started)
+
+
+def reader(db, stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        db.get_all_bookmarks()
+        latencies.append(time.perf_counter() - started)
+
+
+def run(threads, ops, single_writer):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db", single_writer=single_writer)
+        db.insert_bookmarks_many(
+            [(str(uuid.uuid4()), f"가게 {i}", "서울", 37.5, 127.0, None, 3, 1, "한식", None) for i in range(1000)]
+        )
+        batches_before = db.writer.stats["batches"] if db.writer else 0
+        latencies, errors, read_latencies = [], [], []
+        stop = threading.Event()
+        read_thread = threading.Thread(target=reader, args=(db, stop, read_latencies))
+        workers = [threading.Thread(target=session, args=(db, ops, latencies, errors)) for _ in range(threads)]
+        started = time.perf_counter()
+        read_thread.start()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        seconds = time.perf_counter() - started
+        stop.set()
+        read_thread.join()
+        commits = db.writer.stats["batches"] - batches_before if db.writer else len(latencies) - len(errors)
+        db.close()
+    return {
+        "writes/s": len(latencies) / seconds,
+        "p50": percentile(latencies, 0.5) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "max": max(latencies) * 1000,
+        "errors": len(errors),
+        "commits": commits,
+        "read p95": (percentile(read_latencies, 0.95) or 0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--ops", type=int, default=200, help="스레드당 쓰기 수")
+    args = parser.parse_args()
+
+    print(
+        f"{'threads':>7} | {'mode':<13} | {'writes/s':>8} | {'p50 ms':>6} | {'p95 ms':>6} | {'max ms':>7} | "
+        f"{'errors':>6} | {'commits':>7} | {'read p95':>8}"
+    )
+    for threads in args.threads:
+        for mode, single_writer in (("per-thread", False), ("single writer", True)):
+            r = run(threads, args.ops, single_writer)
+            print(
+                f"{threads:>7} | {mode:<13} | {r['writes/s']:>8.0f} | {r['p50']:>6.2f} | {r['p95']:>6.2f} | "
+                f"{r['max']:>7.1f} | {r['errors']:>6} | {r['commits']:>7} | {r['read p95']:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
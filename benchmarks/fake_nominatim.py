@@ -0,0 +1,69 @@
+"""
+Nominatim 대역 서버 (오프라인 테스트/벤치마크용).
+
+/search?q=... 에 주소 해시로 만든 서울 근처 좌표를 돌려준다. '없는' 이 들어간 주소는 빈 결과.
+
+    python benchmarks/fake_nominatim.py --port 8765 --delay 0.3
+    LIMSTREAT_GEOCODER_URL=http://127.0.0.1:8765/search streamlit run app.py
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def fake_coordinates(q):
+    h = hashlib.sha1(q.encode()).digest()
+    lat = 37.45 + int.from_bytes(h[:4], "big") / 2**32 * 0.25
+    lon = 126.80 + int.from_bytes(h[4:8], "big") / 2**32 * 0.35
+    return lat, lon
+
+
+def make_handler(delay):
+    class Handler(BaseHTTPRequestHandler):
+        requests_served = 0
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/search":
+                self.send_error(404)
+                return
+            q = parse_qs(url.query).get("q", [""])[0]
+            time.sleep(delay)
+            Handler.requests_served += 1
+            if not q or "없는" in q:
+                data = []
+            else:
+                lat, lon = fake_coordinates(q)
+                data = [{"lat": f"{lat:.7f}", "lon": f"{lon:.7f}", "display_name": q}]
+            body = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start(port=0, delay=0.0):
+    """백그라운드 스레드로 띄우고 (server, search URL) 을 돌려준다."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(delay))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/search"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.3, help="응답 지연(초)")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.delay))
+    print(f"fake nominatim: http://127.0.0.1:{args.port}/search")
+    server.serve_forever()
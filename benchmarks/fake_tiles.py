@@ -0,0 +1,83 @@
+"""
+OSM 타일 서버 대역 (오프라인 테스트/벤치마크용).
+
+/{z}/{x}/{y}.png 에 타일 번호를 적은 256x256 PNG 를 돌려준다. 요청 수와 최대 동시 요청 수를 센다.
+
+    python benchmarks/fake_tiles.py --port 8766 --delay 0.1
+    LIMSTREAT_TILE_PROXY_PORT=8600 LIMSTREAT_TILE_UPSTREAM=http://127.0.0.1:8766/{z}/{x}/{y}.png streamlit run app.py
+"""
+import argparse
+import io
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image, ImageDraw
+
+TILE_PATH = re.compile(r"^/(\d+)/(\d+)/(\d+)\.png$")
+
+
+def tile_png(z, x, y):
+    img = Image.new("RGB", (256, 256), ((x * 37) % 256, (y * 59) % 256, 200))
+    ImageDraw.Draw(img).text((8, 8), f"{z}/{x}/{y}", fill=(0, 0, 0))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def make_handler(delay):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+        requests_served = 0
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        def do_GET(self):
+            match = TILE_PATH.match(self.path)
+            if match is None:
+                self.send_error(404)
+                return
+            with Handler.lock:
+                Handler.active += 1
+                Handler.max_active = max(Handler.max_active, Handler.active)
+            try:
+                time.sleep(delay)
+                body = tile_png(*map(int, match.groups()))
+            finally:
+                with Handler.lock:
+                    Handler.active -= 1
+                    Handler.requests_served += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class FakeTileServer(ThreadingHTTPServer):
+    request_queue_size = 128
+
+
+def start(port=0, delay=0.0):
+    """백그라운드 스레드로 띄우고 (server, 타일 URL 틀) 을 돌려준다. 요청 수는 server.RequestHandlerClass 에."""
+    server = FakeTileServer(("127.0.0.1", port), make_handler(delay))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/{{z}}/{{x}}/{{y}}.png"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--delay", type=float, default=0.1, help="응답 지연(초)")
+    args = parser.parse_args()
+    server = FakeTileServer(("127.0.0.1", args.port), make_handler(args.delay))
+    print(f"fake tiles: http://127.0.0.1:{args.port}/{{z}}/{{x}}/{{y}}.png")
+    server.serve_forever()
@@ -0,0 +1,155 @@
+"""
+가짜 데이터 만들기: 서울 곳곳의 한국 식당 북마크 N 곳과 앨범 사진을 DB 와 이미지 저장소에 채운다.
+
+이미지는 서로 다른 그림 --images 장만 실제로 만들어 저장소에 넣고 (크기별 사본 포함),
+북마크 일부와 사진들이 그 참조를 나눠 쓴다 (같은 사진을 여러 번 올린 것과 같다).
+
+    python benchmarks/synthetic.py --bookmarks 10000 --photos 1000        # ./data 에 채우기
+    python benchmarks/synthetic.py --bookmarks 100000 --db /tmp/big.db --images-dir /tmp/big-images
+"""
+import argparse
+import io
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from db import Database  # noqa: E402
+from imagestore import ImageStore  # noqa: E402
+
+# 앱의 카테고리 선택지와 같다 (app.py CATEGORIES)
+CATEGORIES = ["한식", "중식", "일식", "아시안", "양식", "패스트푸드", "카페/디저트", "술집", "기타"]
+NAME_WORDS = {
+    "한식": ["국밥", "순대국", "냉면", "삼겹살", "갈비", "칼국수", "비빔밥", "보쌈", "감자탕", "백반"],
+    "중식": ["짜장", "짬뽕", "마라탕", "딤섬", "탕수육", "양꼬치"],
+    "일식": ["스시", "라멘", "돈카츠", "우동", "이자카야", "규동"],
+    "아시안": ["쌀국수", "팟타이", "분짜", "커리", "나시고렝"],
+    "양식": ["파스타", "스테이크", "비스트로", "피자", "브런치"],
+    "패스트푸드": ["버거", "치킨", "핫도그", "타코"],
+    "카페/디저트": ["커피", "베이커리", "케이크", "빙수", "도넛"],
+    "술집": ["포차", "호프", "와인바", "막걸리", "하이볼"],
+    "기타": ["분식", "떡볶이", "김밥", "샐러드"],
+}
+SUFFIXES = ["집", "명가", "하우스", "식당", "본점", "상회", "옥", "당"]
+# (구, 동/도로명, 중심 위도, 중심 경도)
+DISTRICTS = [
+    ("종로구", "종로", 37.5730, 126.9794),
+    ("중구", "세종대로", 37.5641, 126.9979),
+    ("마포구", "양화로", 37.5563, 126.9220),
+    ("강남구", "테헤란로", 37.5012, 127.0396),
+    ("서초구", "서초대로", 37.4837, 127.0324),
+    ("송파구", "올림픽로", 37.5145, 127.1059),
+    ("성동구", "왕십리로", 37.5633, 127.0371),
+    ("용산구", "이태원로", 37.5345, 126.9946),
+    ("영등포구", "여의대로", 37.5264, 126.8962),
+    ("광진구", "아차산로", 37.5385, 127.0823),
+]
+MEMO_PARTS = [
+    "국물이 진하고 양이 많다.",
+    "웨이팅이 길지만 기다릴 만하다.",
+    "점심 특선이 가성비 좋음.",
+    "주차는 어렵다.",
+    "매운 맛 조절 가능.",
+    "혼밥하기 편하다.",
+    "[지도 링크](https://map.example.com)",
+]
+FIRST_DAY = date(2023, 1, 1)
+DAYS = 2 * 365
+PHOTO_SIZE = (1600, 1200)
+
+
+def make_image(rnd, size=PHOTO_SIZE):
+    """그라데이션 위에 도형을 흩뿌린 JPEG 바이트 (실제 사진처럼 압축이 덜 되는 편)."""
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for _ in range(60):
+        x, y = rnd.randrange(size[0]), rnd.randrange(size[1])
+        r = rnd.randint(20, 240)
+        draw.ellipse((x, y, x + r, y + r), fill=tuple(rnd.randrange(256) for _ in range(3)))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=88)
+    return buf.getvalue()
+
+
+def bookmark_rows(n, rnd, image_refs=(), image_ratio=0.3):
+    """insert_bookmarks_many 용 행과 행마다의 created_at."""
+    rows, created = [], []
+    for i in range(n):
+        category = rnd.choice(CATEGORIES)
+        district, road, lat, lon = rnd.choice(DISTRICTS)
+        name = f"{rnd.choice(NAME_WORDS[category])} {rnd.choice(SUFFIXES)}"
+        if rnd.random() < 0.5:
+            name = f"{district[:-1]} {name}"
+        image_ref = rnd.choice(image_refs) if image_refs and rnd.random() < image_ratio else None
+        memo = " ".join(rnd.sample(MEMO_PARTS, rnd.randint(1, 3))) if rnd.random() < 0.4 else None
+        rows.append(
+            (
+                str(uuid.uuid4()),
+                name,
+                f"서울특별시 {district} {road} {rnd.randint(1, 400)}",
+                lat + rnd.gauss(0, 0.012),
+                lon + rnd.gauss(0, 0.015),
+                image_ref,
+                rnd.choices([1, 2, 3, 4, 5], weights=[1, 2, 5, 8, 6])[0],
+                1 if rnd.random() < 0.6 else 0,
+                category,
+                memo,
+            )
+        )
+        created.append(datetime.combine(FIRST_DAY, datetime.min.time()) + timedelta(seconds=rnd.randrange(DAYS * 86400)))
+    return rows, created
+
+
+def photo_rows(n, rnd, image_refs):
+    return [
+        (str(uuid.uuid4()), "", (FIRST_DAY + timedelta(days=rnd.randrange(DAYS))).isoformat(), rnd.choice(image_refs))
+        for _ in range(n)
+    ]
+
+
+def generate(db, store, bookmarks, photos=0, images=20, seed=0, batch=10000):
+    """북마크/사진/이미지를 채우고 {항목: 개수} 와 걸린 초를 돌려준다."""
+    started = time.perf_counter()
+    rnd = random.Random(seed)
+    image_refs = [store.put(make_image(rnd)) for _ in range(images)] if images else []
+    for first in range(0, bookmarks, batch):
+        rows, created = bookmark_rows(min(batch, bookmarks - first), rnd, image_refs)
+        db.insert_bookmarks_many(rows)
+        # 월별 통계가 의미 있도록 저장 시각을 2년에 흩는다
+        with db.transaction() as conn:
+            conn.executemany(
+                "UPDATE bookmarks SET created_at = ? WHERE id = ?",
+                ((at.isoformat(timespec="seconds"), row[0]) for row, at in zip(rows, created)),
+            )
+    if photos and image_refs:
+        db.insert_photos_many(photo_rows(photos, rnd, image_refs))
+    counts = {"bookmarks": bookmarks, "photos": photos if image_refs else 0, "images": len(image_refs)}
+    return counts, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookmarks", type=int, default=10000)
+    parser.add_argument("--photos", type=int, default=1000)
+    parser.add_argument("--images", type=int, default=20, help="실제로 만들 서로 다른 이미지 수")
+    parser.add_argument("--db", default="data/bookmarks.db")
+    parser.add_argument("--images-dir", default=None, help="이미지 저장소 위치 (기본: static/images)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+    db = Database(args.db)
+    store = ImageStore(db) if args.images_dir is None else ImageStore(db, root=args.images_dir)
+    counts, seconds = generate(db, store, args.bookmarks, args.photos, args.images, args.seed)
+    db.close()
+    print(", ".join(f"{name} {n:,}" for name, n in counts.items()) + f" → {args.db} ({seconds:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,656 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import migrations
+from geo import haversine_m, radius_bounds
+from imagestore import is_image_ref
+from writer import SingleWriter
+
+
+# ---------- 연결 설정 ----------
+# WAL: 읽기와 쓰기가 서로 막지 않음 / synchronous=NORMAL: WAL 에서는 커밋마다 fsync 하지 않아도 안전
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",  # 약 16MB 페이지 캐시
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+POOL_SIZE = 4
+BUSY_TIMEOUT = 10.0
+STATEMENT_CACHE = 128
+# 쓰기는 writer 스레드 하나로 모아 묶어서 커밋 (0 이면 호출한 스레드에서 바로, 예전처럼)
+SINGLE_WRITER = os.environ.get("LIMSTREAT_DB_SINGLE_WRITER", "1") != "0"
+
+# nearest(): 처음 검색 반경과 최대 반경 (지구 반 바퀴)
+NEAREST_START_M = 500
+NEAREST_MAX_M = 20_000_000
+MAX_ROWID = 2**63 - 1
+
+
+# ---------- SQL ----------
+# 문장을 상수로 두면 커넥션별 statement 캐시에서 같은 prepared statement 가 재사용된다
+BOOKMARK_COLUMNS = "id, name, address, lat, lon, image_path, rating, is_recommended, category, memo"
+SEARCH_COLUMNS = ("name", "address", "memo", "category")  # bookmarks_fts 와 같은 열
+# 지도는 메모가 필요 없다
+MAP_COLUMNS = "id, name, address, lat, lon, image_path, rating, is_recommended, category"
+
+SQL_INSERT_BOOKMARK = """
+    INSERT INTO bookmarks (id, name, address, lat, lon, image_path, rating, is_recommended, created_at, memo, category)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_ALL_BOOKMARKS = """
+    SELECT id, name, address, lat, lon, image_path, rating, is_recommended, category, memo
+    FROM bookmarks
+    ORDER BY rowid DESC
+"""
+SQL_IN_BOUNDS = """
+    FROM bookmarks
+    WHERE rowid IN (
+        SELECT id FROM bookmarks_rtree
+        WHERE max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ?
+    )
+"""
+SQL_POINTS_IN_BOUNDS = f"SELECT rowid, lat, lon {SQL_IN_BOUNDS}"
+SQL_BOOKMARK_POINTS = "SELECT lat, lon FROM bookmarks WHERE lat IS NOT NULL AND lon IS NOT NULL"
+SQL_MAP_ROWS = f"SELECT {MAP_COLUMNS} FROM bookmarks WHERE lat IS NOT NULL AND lon IS NOT NULL ORDER BY rowid DESC"
+SQL_BOOKMARKS_BY_ROWIDS = f"""
+    SELECT {MAP_COLUMNS}
+    FROM bookmarks
+    WHERE rowid IN (SELECT value FROM json_each(?))
+    ORDER BY rowid DESC
+"""
+SQL_BOOKMARKS_WITH_ROWID = """
+    SELECT rowid, id, name, address, lat, lon, image_path, rating, is_recommended, category, memo
+    FROM bookmarks
+    WHERE rowid IN (SELECT value FROM json_each(?))
+"""
+SQL_UPDATE_MEMO = "UPDATE bookmarks SET memo = ? WHERE id = ?"
+# 여러 행을 한 문장으로: id 목록은 JSON 배열 하나로 넘긴다
+SQL_IDS = "SELECT value FROM json_each(?)"
+SQL_BOOKMARK_IMAGES = f"SELECT image_path FROM bookmarks WHERE id IN ({SQL_IDS}) AND image_path IS NOT NULL"
+SQL_DELETE_BOOKMARKS = f"DELETE FROM bookmarks WHERE id IN ({SQL_IDS})"
+SQL_SET_CATEGORY = f"UPDATE bookmarks SET category = ? WHERE id IN ({SQL_IDS})"
+SQL_SET_RECOMMENDED = f"UPDATE bookmarks SET is_recommended = ? WHERE id IN ({SQL_IDS})"
+SQL_CATEGORY_STATS = """
+    SELECT COALESCE(category, '미분류'), COUNT(*), SUM(COALESCE(is_recommended, 0)), AVG(rating)
+    FROM bookmarks
+    GROUP BY COALESCE(category, '미분류')
+"""
+SQL_RATING_COUNTS = "SELECT rating, COUNT(*) FROM bookmarks WHERE rating IS NOT NULL GROUP BY rating"
+SQL_MONTHLY_ADDITIONS = """
+    SELECT substr(created_at, 1, 7) AS month, COUNT(*)
+    FROM bookmarks
+    WHERE created_at IS NOT NULL
+    GROUP BY month ORDER BY month
+"""
+SQL_COUNT_BY_RECOMMEND = """
+    SELECT COALESCE(is_recommended, 0) = 1, COUNT(*)
+    FROM bookmarks
+    WHERE 1{where}
+    GROUP BY COALESCE(is_recommended, 0) = 1
+"""
+
+SQL_GET_GEOCODE = "SELECT lat, lon, fetched_at FROM geocode_cache WHERE key = ?"
+SQL_PUT_GEOCODE = "INSERT OR REPLACE INTO geocode_cache (key, lat, lon, fetched_at) VALUES (?, ?, ?, ?)"
+SQL_ENQUEUE_GEOCODE = """
+    INSERT OR REPLACE INTO geocode_queue (bookmark_id, attempts, next_at, last_error, failed) VALUES (?, 0, ?, NULL, 0)
+"""
+SQL_DUE_GEOCODES = """
+    SELECT q.bookmark_id, b.address, q.attempts
+    FROM geocode_queue q JOIN bookmarks b ON b.id = q.bookmark_id
+    WHERE q.failed = 0 AND q.next_at <= ?
+    ORDER BY q.next_at
+    LIMIT ?
+"""
+SQL_NEXT_GEOCODE_AT = "SELECT MIN(next_at) FROM geocode_queue WHERE failed = 0"
+SQL_GET_COORDINATES = "SELECT lat, lon FROM bookmarks WHERE id = ? AND lat IS NOT NULL AND lon IS NOT NULL"
+SQL_SET_COORDINATES = "UPDATE bookmarks SET lat = ?, lon = ? WHERE id = ?"
+SQL_DEQUEUE_GEOCODE = "DELETE FROM geocode_queue WHERE bookmark_id = ?"
+SQL_DEFER_GEOCODE = "UPDATE geocode_queue SET attempts = ?, next_at = ?, last_error = ?, failed = ? WHERE bookmark_id = ?"
+SQL_PENDING_GEOCODES = """
+    SELECT b.id, b.name, b.address, q.attempts, q.failed, q.last_error
+    FROM geocode_queue q JOIN bookmarks b ON b.id = q.bookmark_id
+    ORDER BY b.created_at, b.rowid
+"""
+
+SQL_INSERT_PHOTO = "INSERT INTO photos (id, store_name, date, image_path) VALUES (?, ?, ?, ?)"
+SQL_PHOTOS_BY_DATE = "SELECT id, store_name, date, image_path FROM photos WHERE date = ? ORDER BY rowid ASC"
+SQL_PHOTOS_IN_RANGE = """
+    SELECT id, store_name, date, image_path FROM photos
+    WHERE date BETWEEN ? AND ? ORDER BY date ASC, rowid ASC
+"""
+SQL_PHOTO_DAYS = "SELECT date, count FROM photo_days WHERE date BETWEEN ? AND ? ORDER BY date"
+SQL_PHOTO_IMAGES = f"SELECT image_path FROM photos WHERE id IN ({SQL_IDS}) AND image_path IS NOT NULL"
+SQL_DELETE_PHOTOS = f"DELETE FROM photos WHERE id IN ({SQL_IDS})"
+SQL_PHOTO_IMAGES_ON = "SELECT image_path FROM photos WHERE date = ? AND image_path IS NOT NULL"
+SQL_DELETE_PHOTOS_ON = "DELETE FROM photos WHERE date = ?"
+
+SQL_FIND_IMAGE = "SELECT ext FROM images WHERE hash = ?"
+SQL_TOUCH_IMAGE = """
+    INSERT INTO images (hash, ext, touched_at) VALUES (?, ?, ?)
+    ON CONFLICT(hash) DO UPDATE SET touched_at = excluded.touched_at
+"""
+SQL_UNREFERENCED_IMAGES = "SELECT hash, ext FROM images WHERE refcount <= 0 AND touched_at < ?"
+SQL_DELETE_IMAGE = "DELETE FROM images WHERE hash = ? AND refcount <= 0"
+
+
+def filter_clause(recommended=None, category=None, prefix=""):
+    """
+    화면 필터 → (" AND ..." 조건, 파라미터).
+    recommended: None 전체 / True 추천만 / False 비추천만 (값이 비어 있으면 비추천으로 취급)
+    """
+    sql, params = "", []
+    if recommended is True:
+        sql += f" AND {prefix}is_recommended = 1"
+    elif recommended is False:
+        sql += f" AND COALESCE({prefix}is_recommended, 0) = 0"
+    if category is not None:
+        sql += f" AND {prefix}category = ?"
+        params.append(category)
+    return sql, params
+
+
+def bounds_params(bounds):
+    south, west, north, east = bounds
+    return (south, north, west, east)
+
+
+def fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def search_clause(q):
+    """
+    검색어 → (FROM/WHERE 절, 파라미터, 관련도 정렬 가능 여부).
+    3글자 이상은 trigram 색인으로 부분 문자열 검색, trigram 이 못 다루는 1~2글자('국밥', '밥집')는
+    instr 로 부분 문자열 검색 (긴 단어가 있으면 색인으로 좁힌 행만 본다). 모든 단어가 맞아야 한다 (AND).
+    """
+    terms = q.split()
+    long_terms = [t for t in terms if len(t) >= 3]
+    short_terms = [t for t in terms if len(t) < 3]
+
+    sql, params = "FROM bookmarks b", []
+    if long_terms:
+        sql = "FROM bookmarks_fts JOIN bookmarks b ON b.rowid = bookmarks_fts.rowid"
+    sql += " WHERE 1"
+    if long_terms:
+        sql += " AND bookmarks_fts MATCH ?"
+        params.append(" AND ".join(fts_phrase(t) for t in long_terms))
+    for term in short_terms:
+        # trigram 색인처럼 ASCII 대소문자는 구별하지 않는다
+        sql += " AND (" + " OR ".join(f"instr(lower(b.{col}), ?)" for col in SEARCH_COLUMNS) + ")"
+        params.extend([term.lower()] * len(SEARCH_COLUMNS))
+    return sql, params, bool(long_terms)
+
+
+def remove_file(path):
+    # 이미지 저장소 참조("<hash>.<ext>")는 참조 수로 회수하므로 여기서 지우지 않는다
+    if not path or is_image_ref(path):
+        return
+    p = Path(path)
+    if p.exists():
+        try:
+            p.unlink()
+        except Exception:
+            pass
+
+
+def legacy_files(rows):
+    """조회한 image_path 중 이미지 저장소 참조가 아닌 (예전 방식) 파일 경로."""
+    return [path for (path,) in rows if path and not is_image_ref(path)]
+
+
+class Database:
+    """
+    프로세스당 하나만 만들어 모든 세션이 공유하는 SQLite 접근 계층.
+    커넥션은 풀에 보관했다가 재사용한다 (매 호출마다 connect/close 하지 않음).
+    쓰기는 single_writer 면 writer.SingleWriter 전용 커넥션에서, 아니면 풀 커넥션의 트랜잭션에서 한다.
+    """
+
+    def __init__(self, path, pool_size=POOL_SIZE, single_writer=SINGLE_WRITER):
+        self.path = str(path)
+        self.pool_size = pool_size
+        self._pool = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+        self.query_count = 0
+        # 테이블별 데이터 버전. 쓰기가 커밋될 때마다 올라가며 QueryCache 가 무효화에 쓴다
+        self._versions = {"bookmarks": 0, "photos": 0}
+        self.migration_report = []
+        self.migrate()
+        self.writer = SingleWriter(self._connect).start() if single_writer else None
+
+    # ---------- 커넥션 풀 ----------
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,  # 풀에서 꺼낸 스레드만 사용하므로 안전
+            cached_statements=STATEMENT_CACHE,
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.pool_size:
+                self._opened += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._opened -= 1
+                    raise
+        return self._pool.get(timeout=BUSY_TIMEOUT)
+
+    def _release(self, conn):
+        if self._closed:
+            conn.close()
+            return
+        self._pool.put(conn)
+
+    @contextmanager
+    def connection(self):
+        # 조회 하나가 커넥션을 한 번 빌리므로 rerun 당 조회 수를 재는 데 쓴다
+        self.query_count += 1
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            # 쓰기 락을 처음부터 잡아 읽기→쓰기 승격 중 SQLITE_BUSY 가 나지 않게 한다
+            conn.execute("BEGIN IMMEDIATE")
+            with conn:  # 정상 종료 시 commit, 예외 시 rollback
+                yield conn
+
+    def _write(self, table, fn):
+        """
+        fn(conn) 을 트랜잭션 안에서 부르고 결과를 돌려준다. 커밋된 뒤 table 의 데이터 버전을 올린다.
+        writer 가 있으면 그 스레드에서 (같은 때 들어온 다른 쓰기와 한 커밋으로 묶일 수 있다).
+        """
+        if self.writer is not None:
+            self.query_count += 1
+            result = self.writer.write(fn)
+        else:
+            with self.transaction() as conn:
+                result = fn(conn)
+        if table is not None:
+            self._changed(table)
+        return result
+
+    # 문장 하나짜리 쓰기. 커서는 돌려주지 않는다 (writer.SingleWriter 참고)
+    def _execute(self, table, sql, params):
+        def write(conn):
+            conn.execute(sql, params)
+
+        self._write(table, write)
+
+    def _executemany(self, table, sql, rows):
+        def write(conn):
+            conn.executemany(sql, rows)
+
+        self._write(table, write)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.stop()
+        self._closed = True
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    # ---------- 데이터 버전 ----------
+    def data_version(self, table):
+        return self._versions[table]
+
+    def _changed(self, table):
+        with self._lock:
+            self._versions[table] += 1
+
+    # ---------- 스키마 ----------
+    def migrate(self):
+        with self.connection() as conn:
+            self.migration_report = migrations.migrate(conn)
+        return self.migration_report
+
+    # ---------- 북마크 ----------
+    def insert_bookmark(self, bid, name, address, lat, lon, image_path, rating, is_recommended, category, memo=None):
+        created_at = datetime.now().isoformat(timespec="seconds")
+        row = (bid, name, address, lat, lon, image_path, rating, is_recommended, created_at, memo, category)
+        self._execute("bookmarks", SQL_INSERT_BOOKMARK, row)
+
+    def insert_pending_bookmark(self, bid, name, address, image_path, rating, is_recommended, category, memo=None):
+        """좌표 없이 바로 저장하고 지오코딩 대기열에 넣는다 (한 트랜잭션)."""
+        created_at = datetime.now().isoformat(timespec="seconds")
+        row = (bid, name, address, None, None, image_path, rating, is_recommended, created_at, memo, category)
+
+        def write(conn):
+            conn.execute(SQL_INSERT_BOOKMARK, row)
+            conn.execute(SQL_ENQUEUE_GEOCODE, (bid, time.time()))
+
+        self._write("bookmarks", write)
+
+    def insert_bookmarks_many(self, rows):
+        """rows: insert_bookmark 과 같은 순서의 튜플들. 한 트랜잭션으로 넣는다."""
+        created_at = datetime.now().isoformat(timespec="seconds")
+        rows = (
+            (bid, name, address, lat, lon, image_path, rating, is_recommended, created_at, memo, category)
+            for bid, name, address, lat, lon, image_path, rating, is_recommended, category, memo in rows
+        )
+        self._executemany("bookmarks", SQL_INSERT_BOOKMARK, rows)
+
+    def get_all_bookmarks(self):
+        with self.connection() as conn:
+            return conn.execute(SQL_ALL_BOOKMARKS).fetchall()
+
+    # ---------- 집계 ----------
+    def count_by_recommend(self, category=None):
+        """(전체 수, 추천 수) 를 집계 한 번으로."""
+        where, params = filter_clause(category=category)
+        with self.connection() as conn:
+            counts = dict(conn.execute(SQL_COUNT_BY_RECOMMEND.format(where=where), params).fetchall())
+        return counts.get(0, 0) + counts.get(1, 0), counts.get(1, 0)
+
+    # ---------- 목록 페이지 ----------
+    def list_bookmarks_page(self, recommended=None, category=None, before=None, limit=20):
+        """
+        최근 순 keyset 페이지: rowid < before 인 행을 limit 개. OFFSET 과 달리 뒤 페이지도 빠르다.
+        (행들, 다음 페이지의 before 또는 None). limit + 1 개를 읽어 다음 페이지가 있는지만 본다
+        (전체 개수는 세지 않는다: count_by_recommend 로).
+        """
+        where, params = filter_clause(recommended, category)
+        sql = f"SELECT rowid, {BOOKMARK_COLUMNS} FROM bookmarks WHERE rowid < ?{where} ORDER BY rowid DESC LIMIT ?"
+        with self.connection() as conn:
+            rows = conn.execute(sql, (before if before is not None else MAX_ROWID, *params, limit + 1)).fetchall()
+        next_before = rows[limit - 1][0] if len(rows) > limit else None
+        return [row[1:] for row in rows[:limit]], next_before
+
+    # ---------- 검색 (FTS5) ----------
+    def search_bookmarks(self, q, recommended=None, category=None, limit=-1, offset=0):
+        """관련도 순 검색 결과 (짧은 단어만 있으면 최근 순). 전체 결과 수는 count_search_results 로."""
+        where, params, ranked = search_clause(q)
+        filters, filter_params = filter_clause(recommended, category, "b.")
+        order = "bookmarks_fts.rank, b.rowid DESC" if ranked else "b.rowid DESC"
+        columns = ", ".join(f"b.{col}" for col in BOOKMARK_COLUMNS.split(", "))
+        sql = f"SELECT {columns} {where}{filters} ORDER BY {order} LIMIT ? OFFSET ?"
+        with self.connection() as conn:
+            return conn.execute(sql, (*params, *filter_params, limit, offset)).fetchall()
+
+    def count_search_results(self, q, recommended=None, category=None):
+        """검색 결과 수. 페이지를 넘겨도 같은 인자라 QueryCache 에서 한 번만 센다."""
+        where, params, _ = search_clause(q)
+        filters, filter_params = filter_clause(recommended, category, "b.")
+        with self.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) {where}{filters}", (*params, *filter_params)).fetchone()[0]
+
+    # ---------- 지도 화면 범위 ----------
+    def get_bookmarks_in_bounds(self, bounds, recommended=None, category=None, limit=-1):
+        where, params = filter_clause(recommended, category)
+        sql = f"SELECT {MAP_COLUMNS} {SQL_IN_BOUNDS}{where} ORDER BY rowid DESC LIMIT ?"
+        with self.connection() as conn:
+            return conn.execute(sql, (*bounds_params(bounds), *params, limit)).fetchall()
+
+    def cluster_in_bounds(self, bounds, cell, recommended=None, category=None):
+        """
+        화면 범위 안의 북마크를 (cell_lat, cell_lon) 격자로 묶는다.
+        격자는 (-90, -180) 기준이라 지도를 옮겨도 묶음이 흔들리지 않는다.
+        반환: ([(개수, 평균 위도, 평균 경도, 추천 수), ...], 혼자인 칸의 북마크 행들)
+        """
+        cell_lat, cell_lon = cell
+        where, params = filter_clause(recommended, category)
+        sql = (
+            "SELECT COUNT(*), AVG(lat), AVG(lon), SUM(COALESCE(is_recommended, 0)), MIN(rowid) "
+            f"{SQL_IN_BOUNDS}{where} "
+            "GROUP BY CAST((lat + 90) / ? AS INTEGER), CAST((lon + 180) / ? AS INTEGER)"
+        )
+        clusters, single_rowids = [], []
+        with self.connection() as conn:
+            for count, lat, lon, rec_count, rowid in conn.execute(
+                sql, (*bounds_params(bounds), *params, cell_lat, cell_lon)
+            ):
+                if count == 1:
+                    single_rowids.append(rowid)
+                else:
+                    clusters.append((count, lat, lon, rec_count))
+            singles = conn.execute(SQL_BOOKMARKS_BY_ROWIDS, (json.dumps(single_rowids),)).fetchall()
+        return clusters, singles
+
+    def map_rows(self):
+        """좌표가 있는 모든 북마크의 지도용 행 (최근 순, GeoJSON 피드용)."""
+        with self.connection() as conn:
+            return conn.execute(SQL_MAP_ROWS).fetchall()
+
+    def bookmark_points(self):
+        """좌표가 있는 모든 북마크의 [(lat, lon), ...] (지도 타일 미리 받기용)."""
+        with self.connection() as conn:
+            return conn.execute(SQL_BOOKMARK_POINTS).fetchall()
+
+    # ---------- 주변 검색 (R*Tree) ----------
+    def within_radius(self, lat, lon, meters, limit=None):
+        """반경 meters 안의 북마크를 가까운 순으로 [(거리 m, 행), ...]."""
+        with self.connection() as conn:
+            points = conn.execute(SQL_POINTS_IN_BOUNDS, bounds_params(radius_bounds(lat, lon, meters))).fetchall()
+            hits = sorted(
+                (d, rowid)
+                for rowid, p_lat, p_lon in points
+                if (d := haversine_m(lat, lon, p_lat, p_lon)) <= meters
+            )
+            return self._rows_with_distance(conn, hits[:limit])
+
+    def nearest(self, lat, lon, k=5):
+        """가장 가까운 k 곳을 [(거리 m, 행), ...]. 찾을 때까지 검색 상자를 두 배씩 넓힌다."""
+        meters = NEAREST_START_M
+        with self.connection() as conn:
+            while k > 0:
+                points = conn.execute(SQL_POINTS_IN_BOUNDS, bounds_params(radius_bounds(lat, lon, meters))).fetchall()
+                hits = sorted((haversine_m(lat, lon, p_lat, p_lon), rowid) for rowid, p_lat, p_lon in points)
+                # 상자 안에서 찾은 k 번째가 반경 안이면 상자 밖에 더 가까운 점은 없다
+                if (len(hits) >= k and hits[k - 1][0] <= meters) or meters >= NEAREST_MAX_M:
+                    return self._rows_with_distance(conn, hits[:k])
+                meters *= 2
+        return []
+
+    def _rows_with_distance(self, conn, hits):
+        if not hits:
+            return []
+        rows = conn.execute(SQL_BOOKMARKS_WITH_ROWID, (json.dumps([rowid for _, rowid in hits]),)).fetchall()
+        by_rowid = {row[0]: row[1:] for row in rows}
+        return [(d, by_rowid[rowid]) for d, rowid in hits if rowid in by_rowid]
+
+    def delete_bookmark(self, bid):
+        # 파일은 커밋이 끝난 뒤에 지운다
+        for path in self.delete_bookmarks([bid]):
+            remove_file(path)
+
+    def update_memo(self, bid, memo_value):
+        self.update_memos([(bid, memo_value)])
+
+    # ---------- 여러 북마크 한 번에 ----------
+    # 한 트랜잭션(커밋 한 번)으로 처리하고, 지운 행의 파일은 지우지 않고 경로만 돌려준다 (reaper.FileReaper 로)
+    def delete_bookmarks(self, bids):
+        """지운 북마크들의 예전 방식 이미지 파일 경로. 저장소 이미지는 참조 수로 회수된다."""
+        ids = json.dumps(list(bids))
+
+        def write(conn):
+            files = legacy_files(conn.execute(SQL_BOOKMARK_IMAGES, (ids,)).fetchall())
+            conn.execute(SQL_DELETE_BOOKMARKS, (ids,))
+            return files
+
+        return self._write("bookmarks", write)
+
+    def update_bookmarks(self, bids, category=None, is_recommended=None):
+        """주어진 값만 바꾼다 (None 은 그대로). 바뀐 행 수."""
+        ids = json.dumps(list(bids))
+
+        def write(conn):
+            changed = 0
+            if category is not None:
+                changed = conn.execute(SQL_SET_CATEGORY, (category, ids)).rowcount
+            if is_recommended is not None:
+                changed = conn.execute(SQL_SET_RECOMMENDED, (1 if is_recommended else 0, ids)).rowcount
+            return changed
+
+        return self._write("bookmarks", write)
+
+    def update_memos(self, memos):
+        """memos: [(북마크 id, 메모), ...]"""
+        params = [(memo, bid) for bid, memo in memos]
+        self._executemany("bookmarks", SQL_UPDATE_MEMO, params)
+
+    # ---------- 통계 ----------
+    def category_stats(self):
+        """{카테고리: (개수, 추천 수, 평균 별점)}. 카테고리가 없으면 '미분류'."""
+        with self.connection() as conn:
+            return {row[0]: row[1:] for row in conn.execute(SQL_CATEGORY_STATS)}
+
+    def rating_counts(self):
+        """{별점: 개수}."""
+        with self.connection() as conn:
+            return dict(conn.execute(SQL_RATING_COUNTS).fetchall())
+
+    def monthly_additions(self):
+        """[('YYYY-MM', 그 달에 저장한 개수), ...] 오래된 달부터."""
+        with self.connection() as conn:
+            return conn.execute(SQL_MONTHLY_ADDITIONS).fetchall()
+
+    # ---------- 지오코딩 캐시 ----------
+    def get_geocode(self, key):
+        with self.connection() as conn:
+            return conn.execute(SQL_GET_GEOCODE, (key,)).fetchone()
+
+    def put_geocode(self, key, result, fetched_at):
+        lat, lon = result if result else (None, None)
+        self._execute(None, SQL_PUT_GEOCODE, (key, lat, lon, fetched_at))
+
+    # ---------- 지오코딩 대기열 ----------
+    # 대기 상태도 북마크 화면에 보이므로 데이터 버전은 bookmarks 를 같이 쓴다
+    def due_geocodes(self, now, limit=10):
+        """[(북마크 id, 주소, 지금까지 시도 수), ...] 지금 처리할 차례인 것만."""
+        with self.connection() as conn:
+            return conn.execute(SQL_DUE_GEOCODES, (now, limit)).fetchall()
+
+    def next_geocode_at(self):
+        """다음에 처리할 차례인 시각. 대기 중인 것이 없으면 None."""
+        with self.connection() as conn:
+            return conn.execute(SQL_NEXT_GEOCODE_AT).fetchone()[0]
+
+    def get_coordinates(self, bid):
+        """(lat, lon). 아직 좌표가 없거나 없는 북마크면 None."""
+        with self.connection() as conn:
+            return conn.execute(SQL_GET_COORDINATES, (bid,)).fetchone()
+
+    def resolve_geocode(self, bid, lat, lon):
+        def write(conn):
+            conn.execute(SQL_SET_COORDINATES, (lat, lon, bid))
+            conn.execute(SQL_DEQUEUE_GEOCODE, (bid,))
+
+        self._write("bookmarks", write)
+
+    def defer_geocode(self, bid, attempts, next_at, error, failed=False):
+        params = (attempts, next_at, error, 1 if failed else 0, bid)
+        self._execute("bookmarks", SQL_DEFER_GEOCODE, params)
+
+    def retry_geocode(self, bid):
+        """포기한 북마크를 처음부터 다시 찾게 한다."""
+        self._execute("bookmarks", SQL_ENQUEUE_GEOCODE, (bid, time.time()))
+
+    def pending_geocodes(self):
+        """[(id, 이름, 주소, 시도 수, 포기 여부, 마지막 오류), ...] 저장한 순서대로."""
+        with self.connection() as conn:
+            return conn.execute(SQL_PENDING_GEOCODES).fetchall()
+
+    # ---------- 사진 ----------
+    def insert_photo(self, pid, store_name, date_str, image_path):
+        self._execute("photos", SQL_INSERT_PHOTO, (pid, store_name, date_str, image_path))
+
+    def insert_photos_many(self, rows):
+        """rows: (id, store_name, date, image_path) 튜플들. 한 트랜잭션으로 넣는다."""
+        self._executemany("photos", SQL_INSERT_PHOTO, rows)
+
+    def get_photos_by_date(self, date_str):
+        with self.connection() as conn:
+            return conn.execute(SQL_PHOTOS_BY_DATE, (date_str,)).fetchall()
+
+    def get_photos_in_range(self, start, end):
+        """start ~ end (둘 다 포함, 'YYYY-MM-DD') 사진을 날짜, 올린 순서대로."""
+        with self.connection() as conn:
+            return conn.execute(SQL_PHOTOS_IN_RANGE, (start, end)).fetchall()
+
+    def photo_day_counts(self, start, end):
+        """{날짜: 사진 수}. 사진이 있는 날만 들어 있다."""
+        with self.connection() as conn:
+            return dict(conn.execute(SQL_PHOTO_DAYS, (start, end)).fetchall())
+
+    def delete_photo(self, pid):
+        for path in self.delete_photos([pid]):
+            remove_file(path)
+
+    def delete_photos(self, pids):
+        """delete_bookmarks 와 같이 한 트랜잭션으로 지우고 예전 방식 파일 경로를 돌려준다."""
+        ids = json.dumps(list(pids))
+
+        def write(conn):
+            files = legacy_files(conn.execute(SQL_PHOTO_IMAGES, (ids,)).fetchall())
+            conn.execute(SQL_DELETE_PHOTOS, (ids,))
+            return files
+
+        return self._write("photos", write)
+
+    def delete_photos_on(self, date_str):
+        """그 날짜의 사진을 모두 지운다."""
+        def write(conn):
+            files = legacy_files(conn.execute(SQL_PHOTO_IMAGES_ON, (date_str,)).fetchall())
+            conn.execute(SQL_DELETE_PHOTOS_ON, (date_str,))
+            return files
+
+        return self._write("photos", write)
+
+    # ---------- 이미지 저장소 ----------
+    def find_image(self, image_hash):
+        """저장소에 있는 이미지면 확장자, 없으면 None."""
+        with self.connection() as conn:
+            row = conn.execute(SQL_FIND_IMAGE, (image_hash,)).fetchone()
+        return row[0] if row else None
+
+    def put_image(self, image_hash, ext, write_files, now):
+        """
+        images 행을 만들거나 touched_at 을 갱신한다.
+        write_files() 는 쓰기 락을 잡은 채로 불러서 reclaim_images 가 같은 파일을 지우는 것과 겹치지 않게 한다.
+        """
+        def write(conn):
+            conn.execute(SQL_TOUCH_IMAGE, (image_hash, ext, now))
+            write_files()
+
+        self._write(None, write)
+
+    def reclaim_images(self, before, remove_files):
+        """before 이전부터 참조가 없는 이미지를 remove_files(hash, ext) 로 지우고 행도 지운다. 지운 개수."""
+        def write(conn):
+            rows = conn.execute(SQL_UNREFERENCED_IMAGES, (before,)).fetchall()
+            for image_hash, ext in rows:
+                remove_files(image_hash, ext)
+                conn.execute(SQL_DELETE_IMAGE, (image_hash,))
+            return len(rows)
+
+        return self._write(None, write)
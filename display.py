@@ -0,0 +1,12 @@
+# 여러 화면이 같이 쓰는 표시용 함수. 지도 화면이 아니어도 읽으므로 folium 같은 무거운 모듈은 두지 않는다.
+
+
+def render_stars(rating: int | None):
+    if rating is None:
+        return "별점 없음"
+    try:
+        r = int(rating)
+    except Exception:
+        return "별점 없음"
+    r = max(0, min(5, r))
+    return "⭐" * r + "☆" * (5 - r)
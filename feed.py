@@ -0,0 +1,177 @@
+"""
+지도용 북마크 GeoJSON 피드.
+
+북마크 데이터 버전마다 한 번만 GeoJSON 을 만들고 (바뀌지 않은 북마크의 Feature 는 다시 만들지 않는다)
+gzip 본도 같이 만들어 둔다. 작은 HTTP 서버가 ETag 로 조건부 요청에 답하므로 지도는 rerun 마다
+마커 데이터를 실어 보내지 않고, 브라우저는 북마크가 바뀌었을 때만 본문을 다시 받는다 (그 밖에는 304).
+
+Feature 는 Point 하나와 짧은 키의 properties:
+    n 이름, a 주소, c 카테고리, r 추천(0/1), s 별점, t 썸네일 URL (없으면 키 없음)
+
+설정 (환경 변수):
+    LIMSTREAT_FEED_PORT   주면 앱이 이 포트로 피드 서버를 띄우고 지도를 GeoJSON 레이어로 그린다
+    LIMSTREAT_FEED_HOST   피드 서버가 열 주소 (기본 127.0.0.1)
+    LIMSTREAT_FEED_URL    브라우저가 쓸 피드 주소 (기본: http://localhost:{port}/bookmarks.geojson)
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FEED_PORT = int(os.environ["LIMSTREAT_FEED_PORT"]) if os.environ.get("LIMSTREAT_FEED_PORT") else None
+FEED_HOST = os.environ.get("LIMSTREAT_FEED_HOST", "127.0.0.1")
+FEED_URL = os.environ.get("LIMSTREAT_FEED_URL")
+FEED_PATH = "/bookmarks.geojson"
+GZIP_LEVEL = 6
+COORD_DIGITS = 6  # 약 10cm
+
+
+class FeedVersion:
+    def __init__(self, version, body, count, seconds):
+        self.version = version
+        self.body = body
+        self.gzipped = gzip.compress(body, GZIP_LEVEL)
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self.count = count
+        self.seconds = seconds
+
+
+class BookmarkFeed:
+    """
+    current(): 지금 데이터 버전의 FeedVersion. 버전이 바뀌었을 때 처음 부른 쪽만 다시 만든다.
+    thumb_url(bid, image_path) 는 Feature 를 새로 만들 때만 불린다.
+    """
+
+    def __init__(self, db, thumb_url):
+        self.db = db
+        self.thumb_url = thumb_url
+        self._features = {}  # bid → (행, Feature JSON)
+        self._current = None
+        self._lock = threading.Lock()
+        self.stats = {"builds": 0, "built": 0, "reused": 0, "full": 0, "not_modified": 0}
+
+    def current(self):
+        # 조회 전에 버전을 읽어 두면 조회 중에 쓰기가 끼어도 다음 번에 다시 만든다
+        version = self.db.data_version("bookmarks")
+        with self._lock:
+            if self._current is None or self._current.version != version:
+                self._current = self._build(version)
+            return self._current
+
+    def _build(self, version):
+        started = time.perf_counter()
+        features = {}
+        for row in self.db.map_rows():
+            entry = self._features.get(row[0])
+            if entry is None or entry[0] != row:
+                entry = (row, self.feature(row))
+                self.stats["built"] += 1
+            else:
+                self.stats["reused"] += 1
+            features[row[0]] = entry
+        self._features = features
+        body = ('{"type":"FeatureCollection","features":[' + ",".join(f for _, f in features.values()) + "]}").encode()
+        self.stats["builds"] += 1
+        return FeedVersion(version, body, len(features), time.perf_counter() - started)
+
+    def feature(self, row):
+        bid, name, address, lat, lon, image_path, rating, is_recommended, category = row
+        props = {"n": name, "a": address, "c": category, "r": 1 if is_recommended else 0, "s": rating}
+        thumb_url = self.thumb_url(bid, image_path) if image_path else None
+        if thumb_url:
+            props["t"] = thumb_url
+        return json.dumps(
+            {
+                "type": "Feature",
+                "id": bid,
+                "geometry": {"type": "Point", "coordinates": [round(lon, COORD_DIGITS), round(lat, COORD_DIGITS)]},
+                "properties": props,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+
+def etag_matches(header, etag):
+    """If-None-Match 에 이 ETag 가 있나. gzip 본은 "-gz" 를 붙여 보내므로 둘 다 같은 버전으로 본다."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"').removesuffix("-gz") == etag:
+            return True
+    return False
+
+
+def feed_url(port=FEED_PORT, url=FEED_URL):
+    """브라우저가 쓸 피드 주소. 피드 서버가 없으면 None."""
+    if url is None and port is not None:
+        url = f"http://localhost:{port}{FEED_PATH}"
+    return url
+
+
+# ---------- HTTP ----------
+def make_handler(feed):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if urlparse(self.path).path != FEED_PATH:
+                self.send_error(404)
+                return
+            try:
+                current = feed.current()
+            except Exception:
+                self.send_error(503)
+                return
+            use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+            etag = f'"{current.etag}-gz"' if use_gzip else f'"{current.etag}"'
+            if etag_matches(self.headers.get("If-None-Match"), current.etag):
+                feed.stats["not_modified"] += 1
+                self.send_response(304)
+                self._common_headers(etag)
+                self.end_headers()
+                return
+            body = current.gzipped if use_gzip else current.body
+            feed.stats["full"] += 1
+            self.send_response(200)
+            self._common_headers(etag)
+            self.send_header("Content-Type", "application/geo+json")
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _common_headers(self, etag):
+            self.send_header("ETag", etag)
+            # 저장은 하되 쓸 때마다 ETag 로 확인 (바뀌지 않았으면 304, 본문 없음)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Expose-Headers", "ETag")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class FeedServer(ThreadingHTTPServer):
+    request_queue_size = 64
+
+
+def serve(feed, host=FEED_HOST, port=0):
+    """백그라운드 스레드로 피드 서버를 띄운다. 실제 포트는 server.server_address[1]."""
+    server = FeedServer((host, port), make_handler(feed))
+    threading.Thread(target=server.serve_forever, name="bookmark-feed", daemon=True).start()
+    return server
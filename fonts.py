@@ -0,0 +1,74 @@
+"""
+차트용 한글 폰트 찾기. 처음 한 번만 찾고 프로세스가 끝날 때까지 기억한다.
+
+1) LIMSTREAT_FONT 환경 변수 (폰트 파일 경로)
+2) static/fonts/ 에 같이 둔 폰트 파일
+3) 운영체제별로 잘 알려진 경로 (맑은 고딕, 애플 SD 고딕, 나눔고딕, Noto Sans CJK)
+4) matplotlib 이 아는 시스템 폰트 중 한글 폰트 이름
+못 찾으면 matplotlib 기본 폰트를 그대로 쓴다 (한글이 네모로 보일 수 있다).
+"""
+import functools
+import os
+from pathlib import Path
+
+FONT_ENV = "LIMSTREAT_FONT"
+BUNDLED_FONTS_DIR = Path(__file__).resolve().parent / "static" / "fonts"
+FONT_SUFFIXES = (".ttf", ".otf", ".ttc")
+KNOWN_FONT_FILES = [
+    "C:/Windows/Fonts/malgun.ttf",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/Library/Fonts/AppleGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+]
+KOREAN_FAMILIES = [
+    "Malgun Gothic",
+    "Apple SD Gothic Neo",
+    "AppleGothic",
+    "NanumGothic",
+    "NanumBarunGothic",
+    "Noto Sans CJK KR",
+    "Noto Sans KR",
+    "UnDotum",
+]
+
+
+def font_candidates():
+    env = os.environ.get(FONT_ENV)
+    if env:
+        yield Path(env)
+    if BUNDLED_FONTS_DIR.is_dir():
+        yield from sorted(p for p in BUNDLED_FONTS_DIR.iterdir() if p.suffix.lower() in FONT_SUFFIXES)
+    for path in KNOWN_FONT_FILES:
+        yield Path(path)
+
+
+@functools.lru_cache(maxsize=None)
+def korean_font():
+    """matplotlib 에 등록된 한글 폰트 이름. 없으면 None."""
+    from matplotlib import font_manager
+
+    for path in font_candidates():
+        if not path.is_file():
+            continue
+        try:
+            font_manager.fontManager.addfont(str(path))
+            return font_manager.FontProperties(fname=str(path)).get_name()
+        except Exception:
+            continue
+    installed = {f.name for f in font_manager.fontManager.ttflist}
+    return next((family for family in KOREAN_FAMILIES if family in installed), None)
+
+
+def use_korean_font():
+    """matplotlib 전역 설정에 한글 폰트를 건다. 쓴 폰트 이름 (없으면 None)."""
+    import matplotlib.pyplot as plt
+
+    family = korean_font()
+    if family:
+        plt.rcParams["font.family"] = family
+    plt.rcParams["axes.unicode_minus"] = False
+    return family
@@ -0,0 +1,36 @@
+import math
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEG_LAT = 111320.0
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """두 좌표 사이의 대원 거리(m)."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bounds(lat, lon, meters):
+    """중심에서 meters 반경 원을 감싸는 (south, west, north, east)."""
+    dlat = meters / METERS_PER_DEG_LAT
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    dlon = min(180.0, meters / (METERS_PER_DEG_LAT * cos_lat))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+def format_distance(meters):
+    if meters < 1000:
+        return f"{meters:.0f}m"
+    return f"{meters / 1000:.1f}km"
+
+
+def tile_xy(lat, lon, zoom):
+    """웹 메르카토르(XYZ) 타일 번호 (x, y). 위도는 지도에 그려지는 범위(±85.05°)로 자른다."""
+    n = 2**zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
@@ -0,0 +1,224 @@
+import logging
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# 로컬 대역 서버로 바꿔 끼울 수 있게 (예: benchmarks/fake_nominatim.py)
+GEOCODER_URL = os.environ.get("LIMSTREAT_GEOCODER_URL", "https://nominatim.openstreetmap.org/search")
+USER_AGENT = "limstreat-app"
+TIMEOUT = 8
+
+HIT_TTL = 30 * 24 * 3600  # 찾은 주소: 30일
+MISS_TTL = 24 * 3600  # 못 찾은 주소: 하루 (오타를 고쳐 다시 입력하는 경우가 많음)
+LRU_SIZE = 1024
+
+# 백그라운드 지오코딩: 네트워크/HTTP 오류면 RETRY_BACKOFF 초부터 두 배씩 늘려 MAX_ATTEMPTS 번까지
+MAX_ATTEMPTS = 6
+RETRY_BACKOFF = 5
+RETRY_BACKOFF_MAX = 600
+WORKER_POLL = 30  # 깨우는 신호가 없어도 이 간격(초)마다 대기열을 본다
+
+log = logging.getLogger(__name__)
+
+_SPACES = re.compile(r"\s+")
+_HANGUL_NUMBER_GAP = re.compile(r"(?<=[가-힣])\s+(?=\d)")
+
+
+def normalize_address(address: str):
+    """
+    캐시 키용 주소 정규화: 유니코드(NFKC)/대소문자/공백을 통일하고
+    '세종대로 110' 과 '세종대로110' 을 같은 키로 본다.
+    """
+    key = unicodedata.normalize("NFKC", address or "").lower()
+    key = key.replace(",", " ")
+    key = _SPACES.sub(" ", key).strip()
+    return _HANGUL_NUMBER_GAP.sub("", key)
+
+
+class Geocoder:
+    """
+    주소 → (lat, lon). 프로세스 안 LRU → SQLite geocode_cache → Nominatim 순서로 찾는다.
+    못 찾은 주소도 MISS_TTL 동안 기억하고, 네트워크 오류는 캐시하지 않는다.
+    limiter 는 이 지오코더를 쓰는 모두(백그라운드 worker, 일괄 가져오기)가 같이 쓰는 속도 제한이다.
+    """
+
+    def __init__(
+        self, db, url=GEOCODER_URL, hit_ttl=HIT_TTL, miss_ttl=MISS_TTL, lru_size=LRU_SIZE, timeout=TIMEOUT, limiter=None
+    ):
+        self.db = db
+        self.limiter = limiter
+        self.url = url
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.lru_size = lru_size
+        self.timeout = timeout
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._session = None  # 캐시에 없는 주소를 처음 찾을 때 만든다 (requests 는 읽는 데만 0.1초 남짓)
+        self.stats = {"lru_hits": 0, "db_hits": 0, "lookups": 0, "errors": 0}
+
+    def geocode(self, address: str, raise_errors=False):
+        """
+        limiter 가 있으면 실제로 지오코더에 요청할 때만 limiter.acquire() 로 속도를 맞춘다.
+        네트워크 오류는 None (못 찾음과 구별하려면 raise_errors=True 로 예외를 받는다).
+        """
+        key = normalize_address(address)
+        if not key:
+            return None
+        now = time.time()
+
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is not None and cached[1] > now:
+                self._lru.move_to_end(key)
+                self.stats["lru_hits"] += 1
+                return cached[0]
+
+        row = self.db.get_geocode(key)
+        if row is not None:
+            lat, lon, fetched_at = row
+            result = None if lat is None else (lat, lon)
+            expires_at = fetched_at + (self.hit_ttl if result else self.miss_ttl)
+            if expires_at > now:
+                self._remember(key, result, expires_at)
+                self.stats["db_hits"] += 1
+                return result
+
+        try:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            result = self.lookup(address)
+        except Exception:
+            self.stats["errors"] += 1
+            if raise_errors:
+                raise
+            return None
+        self.stats["lookups"] += 1
+
+        self.db.put_geocode(key, result, now)
+        self._remember(key, result, now + (self.hit_ttl if result else self.miss_ttl))
+        return result
+
+    def lookup(self, address: str):
+        """캐시 없이 지오코더에 바로 물어본다. 네트워크/HTTP 오류는 예외로 올린다."""
+        params = {"q": address, "format": "json", "limit": 1}
+        resp = self._http().get(self.url, params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        data = resp.json()
+        if not data:
+            return None
+        return float(data[0]["lat"]), float(data[0]["lon"])
+
+    def _http(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+
+                self._session = requests.Session()
+                self._session.headers["User-Agent"] = USER_AGENT
+            return self._session
+
+    def _remember(self, key, result, expires_at):
+        with self._lock:
+            self._lru[key] = (result, expires_at)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+
+# ---------- 백그라운드 지오코딩 ----------
+class GeocodeWorker:
+    """
+    좌표 없이 저장된 북마크(geocode_queue)를 백그라운드 스레드 하나가 차례로 찾는다.
+    찾으면 좌표를 채우고 대기열에서 지운다. 네트워크/HTTP 오류는 지수 backoff 로 다시 시도하고,
+    주소를 못 찾았거나 MAX_ATTEMPTS 번 모두 실패하면 failed 로 남겨 화면에서 다시 시도/삭제하게 한다.
+    대기열이 DB 에 있으므로 프로세스가 다시 떠도 남은 것부터 이어서 처리한다.
+    """
+
+    def __init__(
+        self,
+        db,
+        geocoder,
+        max_attempts=MAX_ATTEMPTS,
+        backoff=RETRY_BACKOFF,
+        backoff_max=RETRY_BACKOFF_MAX,
+        poll=WORKER_POLL,
+    ):
+        self.db = db
+        self.geocoder = geocoder
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.poll = poll
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"resolved": 0, "retried": 0, "failed": 0}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="geocode-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def notify(self):
+        """대기열에 새로 넣었으면 불러서 바로 처리하게 한다."""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def retry_delay(self, attempts):
+        delay = min(self.backoff * 2 ** (attempts - 1), self.backoff_max)
+        # 여러 건이 같은 장애로 밀렸을 때 한꺼번에 다시 몰리지 않게 조금 흩는다
+        return delay * random.uniform(0.8, 1.2)
+
+    def run_once(self, now=None):
+        """지금 차례인 것을 처리하고 실제로 처리한 건수를 돌려준다 (멈추는 중이면 거기까지)."""
+        now = time.time() if now is None else now
+        done = 0
+        for bid, address, attempts in self.db.due_geocodes(now):
+            if self._stop.is_set():
+                break
+            self.process(bid, address, attempts)
+            done += 1
+        return done
+
+    def process(self, bid, address, attempts):
+        attempts += 1
+        try:
+            result = self.geocoder.geocode(address or "", raise_errors=True)
+        except Exception as e:
+            failed = attempts >= self.max_attempts
+            next_at = time.time() + self.retry_delay(attempts)
+            self.db.defer_geocode(bid, attempts, next_at, type(e).__name__, failed=failed)
+            self.stats["failed" if failed else "retried"] += 1
+            return
+        if result is None:
+            self.db.defer_geocode(bid, attempts, time.time(), "주소를 찾지 못했어요", failed=True)
+            self.stats["failed"] += 1
+            return
+        self.db.resolve_geocode(bid, float(result[0]), float(result[1]))
+        self.stats["resolved"] += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            # 처리하는 동안 들어온 notify 는 놓치지 않도록 먼저 지운다
+            self._wake.clear()
+            try:
+                # 멈추라고 하면 차례인 것이 남아 있어도 나온다
+                while not self._stop.is_set() and self.run_once():
+                    pass
+                next_at = self.db.next_geocode_at()
+            except Exception:
+                log.exception("geocode worker failed")
+                next_at = None
+            timeout = self.poll if next_at is None else min(max(next_at - time.time(), 0), self.poll)
+            self._wake.wait(timeout)
@@ -0,0 +1,144 @@
+"""
+내용 주소(content-addressed) 이미지 저장소.
+
+원본 바이트의 sha256 으로 이름을 붙이고, 크기별 사본(thumb/medium/full)을 한 번만 만들어 둔다.
+DB 의 image_path 에는 "<hash>.<ext>" 참조를 넣고, 참조 수는 images 테이블에서 트리거가 센다.
+같은 사진을 다시 올리면 파일을 새로 만들지 않는다.
+"""
+import hashlib
+import io
+import os
+import re
+import time
+from pathlib import Path
+
+from PIL import Image, ImageOps, features
+
+from thumbnails import STATIC_DIR, STATIC_URL
+
+# 지도 팝업이 URL 로 thumb 을 참조하므로 정적 파일 폴더 아래에 둔다
+IMAGES_ROOT = STATIC_DIR / "images"
+# 이름 → 긴 변 최대 픽셀 (큰 것부터: 작은 사본은 바로 앞 사본을 줄여 만든다)
+RENDITIONS = {"full": 1920, "medium": 1024, "thumb": 320}
+IMAGE_QUALITY = 85
+# 방금 만든(아직 북마크/사진에 연결되기 전인) 이미지를 회수하지 않도록 두는 여유 시간
+RECLAIM_GRACE = 60
+
+_IMAGE_REF = re.compile(r"^[0-9a-f]{64}\.(jpg|webp)$")
+
+
+def is_image_ref(value):
+    return isinstance(value, str) and _IMAGE_REF.match(value) is not None
+
+
+def content_hash(data: bytes):
+    return hashlib.sha256(data).hexdigest()
+
+
+# ---------- 사본 만들기 (프로세스 풀에서도 쓴다) ----------
+def render_renditions(data: bytes, renditions=RENDITIONS, quality=IMAGE_QUALITY):
+    """
+    원본 바이트 → (확장자, {사본 이름: 인코딩된 바이트}).
+    EXIF 회전을 픽셀에 적용하고 JPEG 로 저장한다 (투명도가 있으면 WebP).
+    """
+    largest = max(renditions.values())
+    with Image.open(io.BytesIO(data)) as img:
+        # JPEG 는 디코딩 단계에서 1/2, 1/4, 1/8 로 줄여 읽는다 (결과는 가장 큰 사본 이상)
+        scale = min(largest / img.width, largest / img.height)
+        if scale < 1:
+            img.draft("RGB", (int(img.width * scale), int(img.height * scale)))
+        img = ImageOps.exif_transpose(img)
+        img.load()
+
+    transparent = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+    if transparent and features.check("webp"):
+        fmt, ext, mode = "WEBP", "webp", "RGBA"
+    else:
+        fmt, ext, mode = "JPEG", "jpg", "RGB"
+    if img.mode != mode:
+        img = img.convert(mode)
+
+    encoded = {}
+    for name, size in sorted(renditions.items(), key=lambda item: -item[1]):
+        img.thumbnail((size, size))
+        buf = io.BytesIO()
+        # 회전은 이미 픽셀에 적용했으므로 EXIF 는 넣지 않는다
+        img.save(buf, format=fmt, quality=quality)
+        encoded[name] = buf.getvalue()
+    return ext, encoded
+
+
+class ImageStore:
+    def __init__(self, db, root=IMAGES_ROOT, url_prefix=f"{STATIC_URL}/images", grace=RECLAIM_GRACE):
+        self.db = db
+        self.root = Path(root)
+        self.url_prefix = url_prefix
+        self.grace = grace
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ---------- 경로 ----------
+    def _file(self, image_hash, ext, rendition):
+        return self.root / image_hash[:2] / f"{image_hash}_{rendition}.{ext}"
+
+    def path(self, ref, rendition="full"):
+        """참조의 사본 파일 경로. 참조가 아니면 (예전 파일 경로) None."""
+        if not is_image_ref(ref):
+            return None
+        image_hash, ext = ref.split(".")
+        return self._file(image_hash, ext, rendition)
+
+    def url(self, ref, rendition="thumb"):
+        if not is_image_ref(ref):
+            return None
+        image_hash, ext = ref.split(".")
+        return f"{self.url_prefix}/{image_hash[:2]}/{image_hash}_{rendition}.{ext}"
+
+    # ---------- 저장 ----------
+    def existing(self, image_hash):
+        """이미 저장된 이미지면 회수되지 않게 touched_at 을 갱신하고 참조를 돌려준다. 없으면 None."""
+        ext = self.db.find_image(image_hash)
+        if ext is None:
+            return None
+        present = []
+        self.db.put_image(
+            image_hash,
+            ext,
+            lambda: present.append(all(self._file(image_hash, ext, name).exists() for name in RENDITIONS)),
+            time.time(),
+        )
+        return f"{image_hash}.{ext}" if present[0] else None
+
+    def store(self, image_hash, ext, renditions):
+        """render_renditions 결과를 저장하고 참조를 돌려준다."""
+
+        def write_files():
+            for name, data in renditions.items():
+                path = self._file(image_hash, ext, name)
+                if path.exists():
+                    continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(path.name + ".tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+
+        self.db.put_image(image_hash, ext, write_files, time.time())
+        return f"{image_hash}.{ext}"
+
+    def put(self, data: bytes):
+        """원본 바이트를 저장하고 참조를 돌려준다. 같은 내용이 이미 있으면 사본을 다시 만들지 않는다."""
+        image_hash = content_hash(data)
+        ref = self.existing(image_hash)
+        if ref is not None:
+            return ref
+        ext, renditions = render_renditions(data)
+        return self.store(image_hash, ext, renditions)
+
+    # ---------- 회수 ----------
+    def reclaim(self):
+        """참조가 없어진 이미지 파일을 지운다 (방금 올린 것은 grace 동안 남겨 둔다). 지운 이미지 수."""
+
+        def remove_files(image_hash, ext):
+            for name in RENDITIONS:
+                self._file(image_hash, ext, name).unlink(missing_ok=True)
+
+        return self.db.reclaim_images(time.time() - self.grace, remove_files)
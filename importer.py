@@ -0,0 +1,219 @@
+"""
+맛집 목록 일괄 가져오기 (CSV / JSON).
+
+    python importer.py 맛집목록.csv [--db data/bookmarks.db] [--workers 4] [--rate 1]
+
+열 이름은 영어/한국어 모두 받는다: name(가게 이름), address(주소), rating(별점),
+recommended(추천), category(카테고리), memo(메모), lat/lon(있으면 지오코딩 생략).
+"""
+import csv
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from geocode import normalize_address
+
+# Nominatim 공개 서버 이용 정책: 초당 1건
+GEOCODE_RATE = float(os.environ.get("LIMSTREAT_GEOCODER_RATE", "1"))
+GEOCODE_WORKERS = 4
+
+COLUMN_ALIASES = {
+    "name": "name", "이름": "name", "가게 이름": "name", "가게이름": "name", "상호": "name",
+    "address": "address", "주소": "address",
+    "rating": "rating", "별점": "rating",
+    "recommended": "recommended", "is_recommended": "recommended", "추천": "recommended", "추천 여부": "recommended",
+    "category": "category", "카테고리": "category",
+    "memo": "memo", "메모": "memo",
+    "lat": "lat", "위도": "lat",
+    "lon": "lon", "lng": "lon", "경도": "lon",
+}
+NOT_RECOMMENDED = {"0", "false", "no", "n", "비추천", "x"}
+
+
+class TokenBucket:
+    """초당 rate 개씩 토큰이 차는 버킷. acquire() 는 토큰이 생길 때까지 기다린다."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ImportReport:
+    def __init__(self, total):
+        self.total = total
+        self.inserted = 0
+        self.failures = []  # [(행 번호, 가게 이름, 사유), ...]
+        self.seconds = 0.0
+
+
+# ---------- 파싱 ----------
+def parse_records(data: bytes, filename: str):
+    """CSV/JSON 바이트를 열 이름이 정리된 dict 목록으로."""
+    text = data.decode("utf-8-sig")
+    if filename.lower().endswith(".json"):
+        records = json.loads(text)
+        if isinstance(records, dict):
+            records = records.get("bookmarks") or []
+    else:
+        records = list(csv.DictReader(io.StringIO(text)))
+
+    normalized = []
+    for record in records:
+        row = {}
+        for k, v in (record or {}).items():
+            col = COLUMN_ALIASES.get(str(k).strip().lower()) or COLUMN_ALIASES.get(str(k).strip())
+            if col:
+                row[col] = v.strip() if isinstance(v, str) else v
+        normalized.append(row)
+    return normalized
+
+
+def _to_rating(value):
+    if value in (None, ""):
+        return None
+    return max(1, min(5, int(float(value))))
+
+
+def _to_recommended(value):
+    if value in (None, ""):
+        return 1
+    return 0 if str(value).strip().lower() in NOT_RECOMMENDED else 1
+
+
+def _to_coordinates(record):
+    lat, lon = record.get("lat"), record.get("lon")
+    if lat in (None, "") or lon in (None, ""):
+        return None
+    return float(lat), float(lon)
+
+
+# ---------- 가져오기 ----------
+def import_bookmarks(db, geocoder, records, workers=GEOCODE_WORKERS, on_progress=None):
+    """
+    주소는 중복을 없앤 뒤 스레드 풀에서 동시에 지오코딩하고 (캐시에 없는 것만 geocoder.limiter 로 속도 제한,
+    백그라운드 GeocodeWorker 와 같은 버킷이라 둘이 같이 돌아도 합쳐서 rate 를 넘지 않는다),
+    성공한 행은 한 트랜잭션으로 넣는다. on_progress(끝난 개수, 전체) 로 진행 상황을 알린다.
+    못 찾은 주소와 네트워크/HTTP 오류(다시 시도하면 될 수 있음)는 실패 사유를 다르게 남긴다.
+    """
+    started = time.perf_counter()
+    report = ImportReport(len(records))
+
+    valid = []  # (행 번호, record, 좌표 또는 None)
+    for no, record in enumerate(records, start=1):
+        name, address = record.get("name") or "", record.get("address") or ""
+        if not name or not address:
+            report.failures.append((no, name, "가게 이름과 주소는 필수입니다"))
+            continue
+        try:
+            _to_rating(record.get("rating"))
+            coords = _to_coordinates(record)
+        except (TypeError, ValueError) as e:
+            report.failures.append((no, name, f"값 형식 오류: {e}"))
+            continue
+        valid.append((no, record, coords))
+
+    pending = {}
+    for no, record, coords in valid:
+        if coords is None:
+            pending.setdefault(normalize_address(record["address"]), record["address"])
+
+    results, errors = {}, {}
+    if pending:
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(geocoder.geocode, address, raise_errors=True): key for key, address in pending.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    errors[futures[future]] = e
+                done += 1
+                if on_progress:
+                    on_progress(done, len(pending))
+
+    rows = []
+    for no, record, coords in valid:
+        if coords is None:
+            key = normalize_address(record["address"])
+            if key in errors:
+                reason = f"지오코딩 오류({type(errors[key]).__name__}), 다시 시도해 주세요"
+                report.failures.append((no, record["name"], reason))
+                continue
+            coords = results.get(key)
+        if coords is None:
+            report.failures.append((no, record["name"], "주소를 찾지 못했어요"))
+            continue
+        rows.append(
+            (
+                str(uuid.uuid4()),
+                record["name"],
+                record["address"],
+                coords[0],
+                coords[1],
+                None,
+                _to_rating(record.get("rating")),
+                _to_recommended(record.get("recommended")),
+                record.get("category") or None,
+                record.get("memo") or None,
+            )
+        )
+
+    if rows:
+        db.insert_bookmarks_many(rows)
+    report.inserted = len(rows)
+    report.failures.sort()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+
+    from db import Database
+    from geocode import Geocoder
+
+    parser = argparse.ArgumentParser(description="맛집 목록(CSV/JSON)을 북마크로 가져오기")
+    parser.add_argument("path")
+    parser.add_argument("--db", default="data/bookmarks.db")
+    parser.add_argument("--workers", type=int, default=GEOCODE_WORKERS)
+    parser.add_argument("--rate", type=float, default=GEOCODE_RATE, help="초당 지오코딩 요청 수")
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+    db = Database(args.db)
+    records = parse_records(path.read_bytes(), path.name)
+    report = import_bookmarks(
+        db,
+        Geocoder(db, limiter=TokenBucket(args.rate)),
+        records,
+        workers=args.workers,
+        on_progress=lambda done, total: print(f"\r지오코딩 {done}/{total}", end="", flush=True),
+    )
+    print()
+    for no, name, reason in report.failures:
+        print(f"  {no}행 {name}: {reason}")
+    print(f"{report.inserted}/{report.total}곳 가져옴 ({report.seconds:.1f}초)")
+    db.close()
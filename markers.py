@@ -0,0 +1,294 @@
+import html
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import folium
+from folium.elements import JSCSSMixin
+from folium.plugins import BeautifyIcon, MarkerCluster
+from folium.template import Template
+
+from display import render_stars
+
+# 화면 안에 이보다 많으면 격자로 묶어서 보여준다
+CLUSTER_MIN_MARKERS = 150
+CLUSTER_CELL_PX = 64
+# 묶지 않을 때 한 번에 보내는 최대 마커 수
+MAX_MARKERS = 2000
+# MarkerCache 가 기억하는 북마크 수
+MARKER_CACHE_SIZE = 20000
+
+
+# ---------- 공통 함수 ----------
+def marker_icon(is_recommended: int):
+    """
+    ✅ 추천: 핑크 핀 + 흰색 하트
+    ✅ 비추천: 진회색 핀만 (안쪽 아이콘 없음)
+    """
+    if is_recommended:
+        return BeautifyIcon(
+            icon_shape="marker",
+            number="🤍",
+            text_color="white",
+            background_color="#ff4fa3",
+            border_color="#ff4fa3",
+        )
+    return BeautifyIcon(
+        icon_shape="marker",
+        number="",
+        text_color="white",
+        background_color="#4a4a4a",  # 진회색
+        border_color="#4a4a4a",
+    )
+
+
+# 격자 묶음 아이콘 (서버에서 묶을 때와 GeoJSON 레이어가 브라우저에서 묶을 때 같은 모양)
+CLUSTER_STYLE = (
+    "width:{size}px;height:{size}px;line-height:{size}px;border-radius:50%;"
+    "background:{color};opacity:0.85;color:white;text-align:center;font-size:12px;"
+    "font-weight:bold;border:2px solid white"
+)
+
+
+def cluster_icon(count: int, rec_count: int):
+    size = 30 if count < 100 else 38 if count < 1000 else 46
+    color = "#ff4fa3" if rec_count * 2 >= count else "#4a4a4a"
+    return folium.DivIcon(
+        icon_size=(size, size),
+        icon_anchor=(size // 2, size // 2),
+        html=f"<div style='{CLUSTER_STYLE.format(size=size, color=color)}'>{count}</div>",
+    )
+
+
+# BookmarkMarkers 가 모든 마커에 같이 쓰는 아이콘 옵션 (0: 비추천, 1: 추천)
+SHARED_ICON_OPTIONS = (marker_icon(0).options, marker_icon(1).options)
+
+
+class BeautifyIconAssets(JSCSSMixin, folium.MacroElement):
+    """
+    st_folium 은 feature_group_to_add 안의 요소에서 JS/CSS 를 모으지 않으므로
+    BeautifyIcon 스크립트를 기본 지도 쪽에서 불러오게 한다.
+    """
+
+    default_js = BeautifyIcon.default_js
+    default_css = BeautifyIcon.default_css
+
+
+class MarkerClusterAssets(JSCSSMixin, folium.MacroElement):
+    """GeoJSON 레이어가 브라우저에서 마커를 묶을 때 쓰는 Leaflet.markercluster (BeautifyIconAssets 와 같은 이유)."""
+
+    default_js = MarkerCluster.default_js
+    default_css = MarkerCluster.default_css
+
+
+# ---------- 팝업 / 마커 ----------
+def popup_html(name, address, category, rating, thumb_url=None):
+    popup = f"<b>{html.escape(name or '')}</b><br>{html.escape(address or '')}"
+    category_esc = html.escape(category or "")
+    if category_esc:
+        popup += f"<br>카테고리: {category_esc}"
+    if rating is not None:
+        popup += f"<br>별점: {render_stars(rating)}"
+    if thumb_url:
+        popup += f"<br><img src='{thumb_url}' width='200' loading='lazy' />"
+    return popup
+
+
+class BookmarkMarkers(folium.MacroElement):
+    """
+    북마크 마커 묶음을 스크립트 하나로 그린다.
+    아이콘 두 가지(추천/비추천)는 한 번만 만들어 모든 마커가 같이 쓰고,
+    마커마다의 데이터는 MarkerCache 가 미리 만들어 둔 JSON 조각을 이어 붙인다.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            (function() {
+                var icons = [
+                    new L.BeautifyIcon.icon({{ this.icon_options[0]|tojavascript }}),
+                    new L.BeautifyIcon.icon({{ this.icon_options[1]|tojavascript }})
+                ];
+                var rows = [{{ this.rows_js }}];
+                for (var i = 0; i < rows.length; i++) {
+                    var r = rows[i];
+                    L.marker([r[0], r[1]], {icon: icons[r[2]]})
+                        .bindPopup(r[3], {maxWidth: 320})
+                        .addTo({{ this._parent.get_name() }});
+                }
+            })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, fragments):
+        super().__init__()
+        self._name = "BookmarkMarkers"
+        self.icon_options = SHARED_ICON_OPTIONS
+        self.rows_js = ",".join(fragments)
+
+
+class GeoJsonBookmarks(folium.MacroElement):
+    """
+    북마크 GeoJSON 피드(feed.py)를 브라우저가 받아 그리는 레이어.
+    지도에 실리는 것은 피드 주소와 필터뿐이고, 피드는 ETag 로 확인해 바뀌었을 때만 다시 받는다.
+    필터와 팝업은 브라우저에서, cluster 면 Leaflet.markercluster 로 묶는다 (MarkerClusterAssets 필요).
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            (function() {
+                var layer = {{ this._parent.get_name() }};
+                var icons = [
+                    new L.BeautifyIcon.icon({{ this.icon_options[0]|tojavascript }}),
+                    new L.BeautifyIcon.icon({{ this.icon_options[1]|tojavascript }})
+                ];
+                var recommended = {{ this.recommended|tojavascript }};
+                var category = {{ this.category|tojavascript }};
+                var clusterStyle = {{ this.cluster_style|tojavascript }};
+                function esc(s) {
+                    return String(s == null ? "" : s).replace(/[&<>"']/g, function(ch) { return "&#" + ch.charCodeAt(0) + ";"; });
+                }
+                function stars(s) {
+                    if (s == null) return "별점 없음";
+                    s = Math.max(0, Math.min(5, s | 0));
+                    return "⭐".repeat(s) + "☆".repeat(5 - s);
+                }
+                function popup(p) {
+                    var html = "<b>" + esc(p.n) + "</b><br>" + esc(p.a);
+                    if (p.c) html += "<br>카테고리: " + esc(p.c);
+                    if (p.s != null) html += "<br>별점: " + stars(p.s);
+                    if (p.t) html += "<br><img src='" + esc(p.t) + "' width='200' loading='lazy' />";
+                    return html;
+                }
+                function clusterIcon(cluster) {
+                    var markers = cluster.getAllChildMarkers(), count = markers.length, rec = 0;
+                    for (var i = 0; i < count; i++) rec += markers[i].options.rec;
+                    var size = count < 100 ? 30 : count < 1000 ? 38 : 46;
+                    var style = clusterStyle.replace(/{size}/g, size).replace("{color}", rec * 2 >= count ? "#ff4fa3" : "#4a4a4a");
+                    return L.divIcon({html: "<div style='" + style + "'>" + count + "</div>", className: "", iconSize: [size, size]});
+                }
+                fetch({{ this.url|tojavascript }}, {cache: "no-cache"})
+                    .then(function(resp) { return resp.json(); })
+                    .then(function(data) {
+                        var geo = L.geoJSON(data, {
+                            filter: function(f) {
+                                var p = f.properties;
+                                return (recommended === null || p.r === (recommended ? 1 : 0)) && (category === null || p.c === category);
+                            },
+                            pointToLayer: function(f, latlng) {
+                                return L.marker(latlng, {icon: icons[f.properties.r], rec: f.properties.r});
+                            },
+                            onEachFeature: function(f, marker) {
+                                marker.bindPopup(function() { return popup(f.properties); }, {maxWidth: 320});
+                            }
+                        });
+                        {% if this.cluster %}
+                        var group = L.markerClusterGroup({chunkedLoading: true, iconCreateFunction: clusterIcon});
+                        group.addLayers(geo.getLayers());
+                        group.addTo(layer);
+                        {% else %}
+                        geo.addTo(layer);
+                        {% endif %}
+                    });
+            })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, url, recommended=None, category=None, cluster=True):
+        super().__init__()
+        self._name = "GeoJsonBookmarks"
+        self.url = url
+        self.recommended = recommended
+        self.category = category
+        self.cluster = cluster
+        self.icon_options = SHARED_ICON_OPTIONS
+        self.cluster_style = CLUSTER_STYLE
+
+
+class MarkerCache:
+    """
+    북마크 id → 마커 JSON 조각 ([lat, lon, 추천, 팝업 HTML]).
+    행 내용이 그대로면 다시 만들지 않으므로 데이터가 바뀐 북마크만 새로 만든다.
+    thumb_url(bid, image_path) 는 새로 만들 때만 불린다.
+    """
+
+    def __init__(self, thumb_url, size=MARKER_CACHE_SIZE):
+        self.thumb_url = thumb_url
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"built": 0, "reused": 0}
+
+    def fragment(self, row):
+        bid = row[0]
+        with self._lock:
+            entry = self._entries.get(bid)
+            if entry is not None and entry[0] == row:
+                self._entries.move_to_end(bid)
+                self.stats["reused"] += 1
+                return entry[1]
+
+        bid, name, address, lat, lon, image_path, rating, is_recommended, category = row
+        thumb_url = self.thumb_url(bid, image_path) if image_path else None
+        popup = popup_html(name, address, category, rating, thumb_url)
+        # 팝업 HTML 이 <script> 안에 들어가므로 </ 는 끊어 둔다
+        fragment = json.dumps([lat, lon, 1 if is_recommended else 0, popup], ensure_ascii=False).replace("</", "<\\/")
+        with self._lock:
+            self._entries[bid] = (row, fragment)
+            self._entries.move_to_end(bid)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+            self.stats["built"] += 1
+        return fragment
+
+    def layer_element(self, rows):
+        return BookmarkMarkers([self.fragment(row) for row in rows])
+
+
+def add_cluster_marker(layer, count, lat, lon, rec_count):
+    folium.Marker(
+        location=[lat, lon],
+        tooltip=f"{count}곳 (추천 {rec_count})",
+        icon=cluster_icon(count, rec_count),
+    ).add_to(layer)
+
+
+# ---------- 화면 범위 ----------
+def bounds_from_map_data(map_data):
+    """st_folium 반환값의 bounds 를 (south, west, north, east) 로. 없으면 None."""
+    if not isinstance(map_data, dict):
+        return None
+    b = map_data.get("bounds") or {}
+    sw, ne = b.get("_southWest") or {}, b.get("_northEast") or {}
+    try:
+        south, west, north, east = float(sw["lat"]), float(sw["lng"]), float(ne["lat"]), float(ne["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if south == north or west == east:
+        return None
+    return south, west, north, east
+
+
+def estimate_bounds(lat, lon, zoom, width_px=1000, height_px=650):
+    """지도가 아직 bounds 를 돌려주기 전(첫 렌더)에 중심/줌으로 화면 범위를 추정."""
+    deg_per_px = 360.0 / (256 * 2 ** zoom)
+    half_lon = deg_per_px * width_px / 2
+    half_lat = deg_per_px * height_px / 2 * math.cos(math.radians(lat))
+    return lat - half_lat, lon - half_lon, lat + half_lat, lon + half_lon
+
+
+def pad_bounds(bounds, ratio=0.25):
+    # 조금 움직여도 마커가 바로 보이도록 화면보다 넓게 조회
+    south, west, north, east = bounds
+    dlat, dlon = (north - south) * ratio, (east - west) * ratio
+    return south - dlat, west - dlon, north + dlat, east + dlon
+
+
+def cluster_cell(zoom, lat, cell_px=CLUSTER_CELL_PX):
+    """줌 레벨에서 화면상 cell_px 크기의 격자 한 칸을 (위도, 경도) 각도로."""
+    cell_lon = cell_px * 360.0 / (256 * 2 ** zoom)
+    return cell_lon * math.cos(math.radians(lat)), cell_lon
@@ -0,0 +1,397 @@
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+
+# ---------- 마이그레이션 ----------
+# 각 함수는 트랜잭션 안에서 한 번만 실행된다. 적용 여부는 PRAGMA user_version 으로 기록.
+def _m001_base_schema(c):
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bookmarks (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            address TEXT,
+            lat REAL,
+            lon REAL,
+            image_path TEXT,
+            rating INTEGER,
+            is_recommended INTEGER,
+            created_at TEXT,
+            memo TEXT,
+            category TEXT
+        )
+        """
+    )
+
+    # user_version 도입 이전에 만들어진 DB 는 컬럼이 빠져 있을 수 있다
+    c.execute("PRAGMA table_info(bookmarks)")
+    cols = [row[1] for row in c.fetchall()]
+    for col, col_type in (
+        ("rating", "INTEGER"),
+        ("is_recommended", "INTEGER"),
+        ("created_at", "TEXT"),
+        ("memo", "TEXT"),
+        ("category", "TEXT"),
+    ):
+        if col not in cols:
+            c.execute(f"ALTER TABLE bookmarks ADD COLUMN {col} {col_type}")
+
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS photos (
+            id TEXT PRIMARY KEY,
+            store_name TEXT,
+            date TEXT,
+            image_path TEXT
+        )
+        """
+    )
+
+
+def _m002_indexes(c):
+    c.execute("CREATE INDEX IF NOT EXISTS idx_photos_date ON photos(date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_is_recommended ON bookmarks(is_recommended)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_category ON bookmarks(category)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_created_at ON bookmarks(created_at)")
+
+
+def _m003_coordinate_index(c):
+    # 지도 화면 범위(bounding box) 조회용
+    c.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_lat_lon ON bookmarks(lat, lon)")
+
+
+def _m004_spatial_index(c):
+    # 좌표 R*Tree. id 는 bookmarks.rowid (bookmarks 에 INTEGER PRIMARY KEY 가 없으므로
+    # VACUUM 으로 rowid 가 바뀌면 DELETE FROM bookmarks_rtree 후 아래 INSERT 로 다시 채운다)
+    c.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+    )
+    c.execute(
+        """
+        INSERT OR REPLACE INTO bookmarks_rtree
+        SELECT rowid, lat, lat, lon, lon FROM bookmarks WHERE lat IS NOT NULL AND lon IS NOT NULL
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bookmarks_rtree_ai AFTER INSERT ON bookmarks
+        WHEN new.lat IS NOT NULL AND new.lon IS NOT NULL
+        BEGIN
+            INSERT INTO bookmarks_rtree VALUES (new.rowid, new.lat, new.lat, new.lon, new.lon);
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bookmarks_rtree_ad AFTER DELETE ON bookmarks
+        BEGIN
+            DELETE FROM bookmarks_rtree WHERE id = old.rowid;
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bookmarks_rtree_au AFTER UPDATE OF lat, lon ON bookmarks
+        BEGIN
+            DELETE FROM bookmarks_rtree WHERE id = old.rowid;
+            INSERT INTO bookmarks_rtree
+            SELECT new.rowid, new.lat, new.lat, new.lon, new.lon
+            WHERE new.lat IS NOT NULL AND new.lon IS NOT NULL;
+        END
+        """
+    )
+
+
+def _m005_geocode_cache(c):
+    # lat/lon 이 NULL 이면 "찾지 못함" 을 캐시한 것
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS geocode_cache (
+            key TEXT PRIMARY KEY,
+            lat REAL,
+            lon REAL,
+            fetched_at REAL NOT NULL
+        )
+        """
+    )
+
+
+def _m006_fulltext_search(c):
+    # 리뷰 검색용 FTS5 (trigram: 한국어도 띄어쓰기와 상관없이 부분 문자열로 찾는다)
+    c.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_fts USING fts5(
+            name, address, memo, category,
+            content='bookmarks', content_rowid='rowid', tokenize='trigram'
+        )
+        """
+    )
+    # 1~2글자 단어용 단어 앞부분(prefix) 색인. 공백으로 나뉜 단어의 앞에서만 맞아서 '할매국밥집' 의
+    # '국밥' 은 못 찾는다. v10 에서 지우고 짧은 단어는 부분 문자열로 찾는다 (db.search_clause)
+    c.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_fts_prefix USING fts5(
+            name, address, memo, category,
+            content='bookmarks', content_rowid='rowid', tokenize='unicode61', prefix='1 2'
+        )
+        """
+    )
+    c.execute("INSERT INTO bookmarks_fts(bookmarks_fts) VALUES('rebuild')")
+    c.execute("INSERT INTO bookmarks_fts_prefix(bookmarks_fts_prefix) VALUES('rebuild')")
+    # 관련도: 이름 > 주소 > 카테고리 > 메모
+    c.execute("INSERT INTO bookmarks_fts(bookmarks_fts, rank) VALUES('rank', 'bm25(10.0, 4.0, 1.0, 2.0)')")
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bookmarks_fts_ai AFTER INSERT ON bookmarks
+        BEGIN
+            INSERT INTO bookmarks_fts(rowid, name, address, memo, category)
+            VALUES (new.rowid, new.name, new.address, new.memo, new.category);
+            INSERT INTO bookmarks_fts_prefix(rowid, name, address, memo, category)
+            VALUES (new.rowid, new.name, new.address, new.memo, new.category);
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bookmarks_fts_ad AFTER DELETE ON bookmarks
+        BEGIN
+            INSERT INTO bookmarks_fts(bookmarks_fts, rowid, name, address, memo, category)
+            VALUES ('delete', old.rowid, old.name, old.address, old.memo, old.category);
+            INSERT INTO bookmarks_fts_prefix(bookmarks_fts_prefix, rowid, name, address, memo, category)
+            VALUES ('delete', old.rowid, old.name, old.address, old.memo, old.category);
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bookmarks_fts_au AFTER UPDATE OF name, address, memo, category ON bookmarks
+        BEGIN
+            INSERT INTO bookmarks_fts(bookmarks_fts, rowid, name, address, memo, category)
+            VALUES ('delete', old.rowid, old.name, old.address, old.memo, old.category);
+            INSERT INTO bookmarks_fts(rowid, name, address, memo, category)
+            VALUES (new.rowid, new.name, new.address, new.memo, new.category);
+            INSERT INTO bookmarks_fts_prefix(bookmarks_fts_prefix, rowid, name, address, memo, category)
+            VALUES ('delete', old.rowid, old.name, old.address, old.memo, old.category);
+            INSERT INTO bookmarks_fts_prefix(rowid, name, address, memo, category)
+            VALUES (new.rowid, new.name, new.address, new.memo, new.category);
+        END
+        """
+    )
+
+
+def _m007_image_store(c):
+    # 내용 주소(sha256) 이미지 저장소. bookmarks/photos.image_path 에 "<hash>.<ext>" 를 넣으면
+    # 트리거가 참조 수를 센다 (예전처럼 파일 경로가 들어 있으면 어떤 행과도 맞지 않아 그대로 둔다)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS images (
+            hash TEXT PRIMARY KEY,
+            ext TEXT NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            touched_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_images_unreferenced ON images(touched_at) WHERE refcount <= 0")
+    for table in ("bookmarks", "photos"):
+        c.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_images_ai AFTER INSERT ON {table}
+            WHEN new.image_path IS NOT NULL
+            BEGIN
+                UPDATE images SET refcount = refcount + 1 WHERE hash = substr(new.image_path, 1, 64);
+            END
+            """
+        )
+        c.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_images_ad AFTER DELETE ON {table}
+            WHEN old.image_path IS NOT NULL
+            BEGIN
+                UPDATE images SET refcount = refcount - 1 WHERE hash = substr(old.image_path, 1, 64);
+            END
+            """
+        )
+        c.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_images_au AFTER UPDATE OF image_path ON {table}
+            BEGIN
+                UPDATE images SET refcount = refcount - 1 WHERE hash = substr(old.image_path, 1, 64);
+                UPDATE images SET refcount = refcount + 1 WHERE hash = substr(new.image_path, 1, 64);
+            END
+            """
+        )
+
+
+def _m008_photo_days(c):
+    # 날짜별 사진 수. 달력은 이 표만 읽으면 되므로 사진이 많아도 한 달에 최대 31행
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS photo_days (
+            date TEXT PRIMARY KEY,
+            count INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    c.execute(
+        """
+        INSERT OR REPLACE INTO photo_days (date, count)
+        SELECT date, COUNT(*) FROM photos WHERE date IS NOT NULL GROUP BY date
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS photos_days_ai AFTER INSERT ON photos
+        WHEN new.date IS NOT NULL
+        BEGIN
+            INSERT INTO photo_days (date, count) VALUES (new.date, 1)
+            ON CONFLICT(date) DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS photos_days_ad AFTER DELETE ON photos
+        WHEN old.date IS NOT NULL
+        BEGIN
+            UPDATE photo_days SET count = count - 1 WHERE date = old.date;
+            DELETE FROM photo_days WHERE date = old.date AND count <= 0;
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS photos_days_au AFTER UPDATE OF date ON photos
+        BEGIN
+            UPDATE photo_days SET count = count - 1 WHERE date = old.date;
+            DELETE FROM photo_days WHERE date = old.date AND count <= 0;
+            INSERT INTO photo_days (date, count) SELECT new.date, 1 WHERE new.date IS NOT NULL
+            ON CONFLICT(date) DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+
+
+def _m009_geocode_queue(c):
+    # 좌표를 아직 못 정한 북마크. 저장은 바로 하고 백그라운드 작업(geocode.GeocodeWorker)이 채운다
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS geocode_queue (
+            bookmark_id TEXT PRIMARY KEY,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_at REAL NOT NULL,
+            last_error TEXT,
+            failed INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_geocode_queue_due ON geocode_queue(failed, next_at)")
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bookmarks_geocode_queue_ad AFTER DELETE ON bookmarks
+        BEGIN
+            DELETE FROM geocode_queue WHERE bookmark_id = old.id;
+        END
+        """
+    )
+
+
+def _m010_drop_prefix_search(c):
+    # 짧은 단어는 instr 로 찾으므로 prefix 색인은 쓰지 않는다. 트리거를 trigram 색인만 고치게 다시 만든다
+    for trigger in ("bookmarks_fts_ai", "bookmarks_fts_ad", "bookmarks_fts_au"):
+        c.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    c.execute("DROP TABLE IF EXISTS bookmarks_fts_prefix")
+    c.execute(
+        """
+        CREATE TRIGGER bookmarks_fts_ai AFTER INSERT ON bookmarks
+        BEGIN
+            INSERT INTO bookmarks_fts(rowid, name, address, memo, category)
+            VALUES (new.rowid, new.name, new.address, new.memo, new.category);
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER bookmarks_fts_ad AFTER DELETE ON bookmarks
+        BEGIN
+            INSERT INTO bookmarks_fts(bookmarks_fts, rowid, name, address, memo, category)
+            VALUES ('delete', old.rowid, old.name, old.address, old.memo, old.category);
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER bookmarks_fts_au AFTER UPDATE OF name, address, memo, category ON bookmarks
+        BEGIN
+            INSERT INTO bookmarks_fts(bookmarks_fts, rowid, name, address, memo, category)
+            VALUES ('delete', old.rowid, old.name, old.address, old.memo, old.category);
+            INSERT INTO bookmarks_fts(rowid, name, address, memo, category)
+            VALUES (new.rowid, new.name, new.address, new.memo, new.category);
+        END
+        """
+    )
+
+
+MIGRATIONS = [
+    (1, "기본 스키마", _m001_base_schema),
+    (2, "인덱스 추가", _m002_indexes),
+    (3, "좌표 인덱스", _m003_coordinate_index),
+    (4, "좌표 R*Tree", _m004_spatial_index),
+    (5, "지오코딩 캐시", _m005_geocode_cache),
+    (6, "전문 검색 (FTS5)", _m006_fulltext_search),
+    (7, "이미지 저장소 참조 수", _m007_image_store),
+    (8, "날짜별 사진 수", _m008_photo_days),
+    (9, "지오코딩 대기열", _m009_geocode_queue),
+    (10, "짧은 검색어는 부분 문자열로", _m010_drop_prefix_search),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """
+    아직 적용되지 않은 마이그레이션을 순서대로 실행하고
+    [(버전, 이름, 소요 초), ...] 를 돌려준다. 최신이면 PRAGMA 한 번으로 끝난다.
+    """
+    if get_version(conn) >= LATEST_VERSION:
+        return []
+
+    report = []
+    # 여러 프로세스가 동시에 떠도 한 곳에서만 적용되도록 쓰기 락을 잡고 다시 확인
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = get_version(conn)
+        c = conn.cursor()
+        for version, name, fn in MIGRATIONS:
+            if version <= current:
+                continue
+            started = time.perf_counter()
+            fn(c)
+            c.execute(f"PRAGMA user_version = {version}")
+            elapsed = time.perf_counter() - started
+            report.append((version, name, elapsed))
+            log.info("migration %d (%s) applied in %.1f ms", version, name, elapsed * 1000)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return report
+
+
+if __name__ == "__main__":
+    import sqlite3
+    import sys
+
+    # 배포 전에 미리 적용: python migrations.py [data/bookmarks.db]
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/bookmarks.db"
+    conn = sqlite3.connect(path)
+    applied = migrate(conn)
+    conn.close()
+    for version, name, elapsed in applied:
+        print(f"v{version} {name}: {elapsed * 1000:.1f} ms")
+    print(f"user_version = {LATEST_VERSION}" if applied else "already up to date")
@@ -0,0 +1,93 @@
+"""
+rerun 한 번이 어디에 시간을 쓰는지 재는 가벼운 계측.
+
+- span(name): with 블록 하나의 시간 (같은 이름은 합치고 횟수를 센다)
+- phase(name): 앞 phase 가 끝난 뒤부터 지금까지 (설정 → 사이드바 → 화면처럼 이어지는 큰 구간)
+- count(name, n): 카운터 (조회 수, 읽은 이미지 바이트, 지도로 보내는 마커 데이터 크기 ...)
+끝나면 record() 를 디버그 패널에 보여 주거나 append_jsonl 로 한 줄씩 남긴다.
+cProfile 은 켜 달라고 한 rerun 하나에서만 돌린다 (start_profile / stop_profile).
+"""
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_LINES = 30
+
+_log_lock = threading.Lock()
+
+
+class RerunProfile:
+    def __init__(self, label=""):
+        self.label = label
+        self.started = time.perf_counter()
+        self._phase_started = self.started
+        self.spans = {}  # 이름 → [횟수, 합계 ms]
+        self.phases = []  # [(이름, ms), ...] 순서대로
+        self.counters = {}
+        self.total_ms = None
+
+    @contextmanager
+    def span(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.spans.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += (time.perf_counter() - started) * 1000
+
+    def phase(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._phase_started) * 1000))
+        self._phase_started = now
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self):
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self.started) * 1000
+        return self.total_ms
+
+    def record(self):
+        return {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "label": self.label,
+            "total_ms": round(self.finish(), 2),
+            "phases": {name: round(ms, 2) for name, ms in self.phases},
+            "spans": {name: {"calls": calls, "ms": round(ms, 2)} for name, (calls, ms) in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+
+def append_jsonl(path, record):
+    """여러 세션이 같은 파일에 써도 줄이 섞이지 않게 프로세스 안에서는 잠그고 한 번에 쓴다."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _log_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+# ---------- cProfile ----------
+def start_profile():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profile(profiler, dump_path=None, lines=PROFILE_LINES):
+    """멈추고 누적 시간 상위 lines 줄을 문자열로. dump_path 를 주면 pstats 파일도 남긴다 (snakeviz 등으로 보기)."""
+    profiler.disable()
+    if dump_path is not None:
+        Path(dump_path).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(dump_path))
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats("cumulative").print_stats(lines)
+    return out.getvalue()
@@ -0,0 +1,224 @@
+"""
+앨범 사진 저장 파이프라인.
+
+업로드된 사진은 프로세스 풀에서 디코딩/축소/인코딩해 이미지 저장소(imagestore)의 사본으로 만들고,
+DB 에는 한 트랜잭션으로 넣는다. 저장소에 이미 있는 사진(같은 내용)은 다시 처리하지 않는다.
+앨범에서 볼 때는 표시용 사본을 LRU 에 두고 옆 사진을 미리 읽어 둔다 (ImagePrefetcher).
+"""
+import calendar
+import io
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from pathlib import Path
+
+from PIL import Image
+
+from imagestore import RENDITIONS, content_hash, render_renditions
+
+PHOTO_WORKERS = min(4, os.cpu_count() or 1)
+# 앨범 표시용 이미지를 몇 장까지 메모리에 둘지, 앞뒤로 몇 장씩 미리 읽을지
+ALBUM_CACHE_SIZE = 32
+ALBUM_PREFETCH = 2
+
+# PIL 오류 메시지에 들어가는 입력 객체 repr (예: <_io.BytesIO object at 0x7f...>)
+_OBJECT_REPR = re.compile(r"<[\w.]+ object at 0x[0-9a-fA-F]+>")
+
+
+def failure_reason(error, name):
+    """사용자에게 보여 줄 실패 사유. 메시지 속 객체 repr 은 올린 파일 이름으로 바꾼다."""
+    return _OBJECT_REPR.sub(repr(name), str(error)) or type(error).__name__
+
+
+class IngestReport:
+    def __init__(self, total):
+        self.total = total
+        self.saved = 0
+        self.reused = 0  # 저장소에 이미 있어서 다시 만들지 않은 장 수
+        self.failures = []  # [(파일 이름, 사유), ...]
+        self.seconds = 0.0
+
+
+def ingest_photos(db, store, files, date_str, workers=PHOTO_WORKERS, on_progress=None):
+    """
+    files: [(파일 이름, 바이트), ...]. 처리된 사진은 올린 순서대로 한 트랜잭션으로 넣는다.
+    on_progress(끝난 개수, 전체, 파일 이름) 로 한 장씩 진행 상황을 알린다.
+    """
+    started = time.perf_counter()
+    report = IngestReport(len(files))
+    refs = {}  # 작업 순서 → 저장소 참조
+    done = 0
+
+    def finish(name):
+        nonlocal done
+        done += 1
+        if on_progress:
+            on_progress(done, len(files), name)
+
+    # 같은 내용은 한 번만 처리한다 (이번에 같이 올린 것끼리도)
+    pending = {}  # hash → [(작업 순서, 파일 이름), ...]
+    payloads = {}
+    for no, (name, data) in enumerate(files):
+        image_hash = content_hash(data)
+        if image_hash not in pending:
+            ref = store.existing(image_hash)
+            if ref is not None:
+                refs[no] = ref
+                report.reused += 1
+                finish(name)
+                continue
+            payloads[image_hash] = data
+        pending.setdefault(image_hash, []).append((no, name))
+
+    def stored(image_hash, run):
+        ref, error = None, None
+        try:
+            ref = store.store(image_hash, *run())
+        except Exception as e:
+            error = e
+        for no, name in pending[image_hash]:
+            if ref is None:
+                report.failures.append((name, failure_reason(error, name)))
+            else:
+                refs[no] = ref
+            finish(name)
+
+    if workers <= 1 or len(payloads) <= 1:
+        # 한 장이면 프로세스를 띄우는 비용이 더 크다
+        for image_hash, data in payloads.items():
+            stored(image_hash, lambda: render_renditions(data))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(payloads))) as pool:
+            futures = {pool.submit(render_renditions, data): image_hash for image_hash, data in payloads.items()}
+            for future in as_completed(futures):
+                stored(futures[future], future.result)
+
+    # 저장소 파일은 참조가 생기지 않으면 나중에 reclaim 이 회수한다
+    rows = [(str(uuid.uuid4()), "", date_str, refs[no]) for no in sorted(refs)]
+    if rows:
+        db.insert_photos_many(rows)
+    report.saved = len(rows)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+# ---------- 앨범 보기 ----------
+def load_display_image(store, image_path, rendition="medium"):
+    """
+    앨범 표시용 이미지 바이트. 저장소 이미지는 medium 사본을 그대로 읽고,
+    예전 사진(원본 파일 경로)은 같은 크기로 줄여 JPEG 로 만든다. 파일이 없으면 None.
+    """
+    path = store.path(image_path, rendition)
+    if path is not None:
+        return path.read_bytes() if path.exists() else None
+    if not image_path or not Path(image_path).exists():
+        return None
+    with Image.open(image_path) as img:
+        img.thumbnail((RENDITIONS[rendition], RENDITIONS[rendition]))
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+class ImagePrefetcher:
+    """
+    key → load(key) 결과를 최근 size 개까지 기억하는 LRU.
+    prefetch(keys) 는 백그라운드 스레드에서 미리 읽어 두고, 읽는 중인 key 를 get 하면 그 결과를 기다린다.
+    """
+
+    def __init__(self, load, size=ALBUM_CACHE_SIZE, workers=1):
+        self.load = load
+        self.size = size
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="album-prefetch")
+        self.stats = {"hits": 0, "misses": 0, "prefetched": 0}
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._entries[key]
+            future = self._pending.get(key)
+        if future is not None:
+            self.stats["hits"] += 1
+            return future.result()
+        self.stats["misses"] += 1
+        value = self.load(key)
+        self._remember(key, value)
+        return value
+
+    def prefetch(self, keys):
+        with self._lock:
+            for key in keys:
+                if key not in self._entries and key not in self._pending:
+                    self._pending[key] = self._executor.submit(self._fetch, key)
+
+    def _fetch(self, key):
+        try:
+            value = self.load(key)
+            self._remember(key, value)
+            self.stats["prefetched"] += 1
+            return value
+        except Exception:
+            return None
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _remember(self, key, value):
+        # 파일이 없던 경우는 기억하지 않는다 (나중에 생길 수 있다)
+        if value is None:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+# ---------- 날짜 범위 / 달력 ----------
+def date_range(day, scope):
+    """scope: "day" / "week" (월~일) / "month". (시작, 끝) ISO 날짜 문자열, 둘 다 포함."""
+    if scope == "week":
+        start = day - timedelta(days=day.weekday())
+        end = start + timedelta(days=6)
+    elif scope == "month":
+        start = day.replace(day=1)
+        end = day.replace(day=calendar.monthrange(day.year, day.month)[1])
+    else:
+        start = end = day
+    return start.isoformat(), end.isoformat()
+
+
+def month_heatmap_html(day, counts):
+    """day 가 속한 달의 달력. counts: {ISO 날짜: 사진 수} (photo_day_counts 결과)."""
+    busiest = max(counts.values(), default=0)
+    cells = []
+    for week in calendar.Calendar().monthdatescalendar(day.year, day.month):
+        row = []
+        for d in week:
+            if d.month != day.month:
+                row.append("<td></td>")
+                continue
+            count = counts.get(d.isoformat(), 0)
+            alpha = 0.15 + 0.85 * count / busiest if count else 0
+            border = "2px solid #333" if d == day else "1px solid #eee"
+            title = f"{count}장" if count else "사진 없음"
+            row.append(
+                f"<td title='{d.isoformat()} · {title}' style='text-align:center;padding:2px;border:{border};"
+                f"background:rgba(255,79,163,{alpha:.2f})'>{d.day}</td>"
+            )
+        cells.append("<tr>" + "".join(row) + "</tr>")
+    head = "".join(f"<th style='font-weight:normal;font-size:11px'>{w}</th>" for w in "월화수목금토일")
+    return (
+        f"<div style='font-size:12px'>{day.year}년 {day.month}월 · 사진 {sum(counts.values())}장</div>"
+        f"<table style='width:100%;border-collapse:collapse;font-size:12px'><tr>{head}</tr>{''.join(cells)}</table>"
+    )
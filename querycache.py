@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+
+CACHE_SIZE = 256
+
+# 캐시할 읽기 함수 → 의존하는 테이블 (그 테이블의 데이터 버전이 바뀌면 무효)
+CACHED_READS = {
+    "get_all_bookmarks": "bookmarks",
+    "count_by_recommend": "bookmarks",
+    "list_bookmarks_page": "bookmarks",
+    "search_bookmarks": "bookmarks",
+    "count_search_results": "bookmarks",
+    "get_bookmarks_in_bounds": "bookmarks",
+    "cluster_in_bounds": "bookmarks",
+    "nearest": "bookmarks",
+    "category_stats": "bookmarks",
+    "rating_counts": "bookmarks",
+    "monthly_additions": "bookmarks",
+    "pending_geocodes": "bookmarks",
+    "get_photos_by_date": "photos",
+    "get_photos_in_range": "photos",
+    "photo_day_counts": "photos",
+}
+
+
+class QueryCache:
+    """
+    Database 읽기 결과를 (함수 이름, 인자) 로 기억하는 프로세스 공용 캐시.
+    항목마다 조회 당시의 데이터 버전을 같이 두고, 쓰기로 버전이 바뀐 테이블의 항목만 다시 읽는다.
+    쓰기 함수와 CACHED_READS 에 없는 함수는 그대로 db 로 넘긴다.
+    돌려준 값은 세션끼리 공유하므로 호출한 쪽에서 고치면 안 된다.
+    """
+
+    def __init__(self, db, size=CACHE_SIZE):
+        self.db = db
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def __getattr__(self, name):
+        table = CACHED_READS.get(name)
+        if table is None:
+            return getattr(self.db, name)
+
+        def cached(*args, **kwargs):
+            return self._get(table, name, args, kwargs)
+
+        return cached
+
+    def _get(self, table, name, args, kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        # 조회 전에 버전을 읽어 두면 조회 중에 쓰기가 끼어도 다음 번에 다시 읽게 된다
+        version = self.db.data_version(table)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            self.stats["misses"] += 1
+
+        value = getattr(self.db, name)(*args, **kwargs)
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return value
+
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
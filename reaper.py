@@ -0,0 +1,101 @@
+"""
+지운 행의 파일을 백그라운드에서 치우는 청소부.
+
+삭제는 행만 한 트랜잭션으로 지우고 바로 돌아가고, 파일 unlink 와 이미지 저장소 회수(reclaim)는
+스레드 하나가 모아서 한다. reclaim 은 주기적으로도 돌려 grace 때문에 남겨 둔 이미지도 결국 지운다.
+"""
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+
+RECLAIM_INTERVAL = 300  # 초
+
+log = logging.getLogger(__name__)
+
+_RECLAIM = object()
+_STOP = object()
+
+
+class FileReaper:
+    """
+    discard(paths) 로 받은 파일을 지우고, reclaim_soon() 이면 reclaim() 을 한 번 부른다.
+    (reclaim 요청은 처리되기 전에 여러 번 와도 한 번만 돈다.)
+    """
+
+    def __init__(self, reclaim=None, interval=RECLAIM_INTERVAL):
+        self.reclaim = reclaim
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._reclaim_queued = False
+        self._thread = None
+        self.stats = {"files": 0, "reclaimed": 0, "errors": 0}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="file-reaper", daemon=True)
+            self._thread.start()
+        return self
+
+    def discard(self, paths):
+        for path in paths:
+            if path:
+                self._queue.put(Path(path))
+
+    def reclaim_soon(self):
+        if self.reclaim is None:
+            return
+        with self._lock:
+            if self._reclaim_queued:
+                return
+            self._reclaim_queued = True
+        self._queue.put(_RECLAIM)
+
+    def flush(self):
+        """지금까지 받은 일이 끝날 때까지 기다린다 (테스트/벤치마크용)."""
+        self._queue.join()
+
+    def stop(self, timeout=None):
+        self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        next_reclaim = time.monotonic() + self.interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(next_reclaim - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+            try:
+                if item is _STOP:
+                    return
+                if item is None or item is _RECLAIM:
+                    if item is _RECLAIM:
+                        with self._lock:
+                            self._reclaim_queued = False
+                    self._reclaim()
+                    next_reclaim = time.monotonic() + self.interval
+                else:
+                    self._remove(item)
+            finally:
+                if item is not None:
+                    self._queue.task_done()
+
+    def _remove(self, path):
+        try:
+            path.unlink(missing_ok=True)
+            self.stats["files"] += 1
+        except OSError:
+            self.stats["errors"] += 1
+
+    def _reclaim(self):
+        if self.reclaim is None:
+            return
+        try:
+            self.stats["reclaimed"] += self.reclaim()
+        except Exception:
+            self.stats["errors"] += 1
+            log.exception("image reclaim failed")
@@ -0,0 +1,76 @@
+import io
+
+from fonts import use_korean_font
+
+# ---------- 고정 카테고리 ----------
+STAT_CATEGORIES = [
+    "한식", "중식", "일식", "아시안",
+    "양식", "패스트푸드",
+    "카페/디저트", "술집", "미분류"
+]
+
+# ---------- 색상 ----------
+CATEGORY_COLORS = {
+    "한식": "#4E79A7",
+    "중식": "#F28E2B",
+    "일식": "#59A14F",
+    "아시안": "#E15759",
+    "양식": "#9C755F",
+    "패스트푸드": "#B07AA1",
+    "카페/디저트": "#FF4FA3",
+    "술집": "#4A4A4A",
+    "미분류": "#BAB0AC",
+}
+OTHER_COLOR = "#BAB0AC"
+
+
+def category_labels(stats):
+    """고정 카테고리 순서 + 그 밖에 저장된 카테고리 (예: '기타')."""
+    return STAT_CATEGORIES + sorted(c for c in stats if c not in STAT_CATEGORIES)
+
+
+def category_chart_png(labels, values):
+    """카테고리별 개수 막대그래프를 PNG 바이트로. 값이 같으면 다시 그릴 필요가 없어 호출하는 쪽에서 캐시한다."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    use_korean_font()
+
+    colors = [CATEGORY_COLORS.get(label, OTHER_COLOR) for label in labels]
+
+    # ---------- 차트 (조금 크게) ----------
+    fig, ax = plt.subplots(
+        figsize=(4.4, 2.8),   # 🔼 차트는 키움
+        dpi=180
+    )
+
+    x = range(len(labels))
+    ax.bar(x, values, color=colors, width=0.55)
+
+    # ---------- 글씨는 작게 유지 ----------
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, fontsize=4, color="#555555")
+    ax.set_ylabel("횟수", fontsize=5)
+
+    # 숫자 라벨 (0 제외, 작게)
+    for i, v in enumerate(values):
+        if v > 0:
+            ax.text(i, v + 0.05, str(v), ha="center", va="bottom", fontsize=5)
+
+    # y축 여유
+    ymax = max(values) if values else 0
+    ax.set_ylim(0, ymax + 1)
+
+    # 테두리 제거
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+
+    # 🔽 차트 전체를 아래로 내림
+    plt.subplots_adjust(top=0.72, bottom=0.32)
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    return buf.getvalue()
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from PIL import Image, features
+
+# Streamlit 정적 파일 서빙(.streamlit/config.toml 의 enableStaticServing)은
+# app.py 옆의 static/ 폴더를 /app/static/ 경로로 내보낸다.
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+STATIC_URL = "/app/static"
+THUMBS_DIR = STATIC_DIR / "thumbs"
+THUMB_SIZE = (320, 320)  # 팝업 이미지가 width=200 이라 레티나에서도 충분
+
+
+class ThumbnailStore:
+    """
+    북마크 id 로 찾는 팝업용 썸네일 저장소.
+    업로드할 때 한 번 만들어 두고, 지도 팝업은 data uri 대신 URL 로 참조한다.
+    """
+
+    def __init__(self, root=THUMBS_DIR, url_prefix=f"{STATIC_URL}/thumbs", size=THUMB_SIZE):
+        self.root = Path(root)
+        self.url_prefix = url_prefix
+        self.size = size
+        # WebP 를 못 쓰는 Pillow 빌드면 JPEG 로
+        if features.check("webp"):
+            self.format, self.ext = "WEBP", "webp"
+        else:
+            self.format, self.ext = "JPEG", "jpg"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, bid):
+        return self.root / f"{bid}.{self.ext}"
+
+    def url(self, bid):
+        return f"{self.url_prefix}/{bid}.{self.ext}"
+
+    def save(self, bid, img):
+        thumb = img.copy()
+        thumb.thumbnail(self.size)
+        if thumb.mode not in ("RGB", "RGBA"):
+            thumb = thumb.convert("RGBA" if "transparency" in thumb.info else "RGB")
+        if self.format == "JPEG" and thumb.mode == "RGBA":
+            thumb = thumb.convert("RGB")
+        path = self.path(bid)
+        thumb.save(path, format=self.format, quality=80)
+        return path
+
+    def ensure_path(self, bid, source_path):
+        """썸네일 파일 경로. 썸네일이 없던 예전 북마크는 원본에서 한 번 만들어 둔다."""
+        path = self.path(bid)
+        if path.exists():
+            return path
+        if not source_path or not Path(source_path).exists():
+            return None
+        try:
+            with Image.open(source_path) as img:
+                return self.save(bid, img)
+        except Exception:
+            return None
+
+    def ensure(self, bid, source_path):
+        """팝업에 넣을 썸네일 URL (없으면 None)."""
+        if self.ensure_path(bid, source_path) is None:
+            return None
+        return self.url(bid)
@@ -0,0 +1,397 @@
+"""
+지도 바탕 타일(OpenStreetMap) 로컬 캐시 프록시.
+
+브라우저가 OSM 공개 서버 대신 이 프록시(/{z}/{x}/{y}.png)에서 타일을 받는다.
+받은 타일은 MBTiles(SQLite) 파일 하나에 두고, 타일 바이트 합이 max_bytes 를 넘으면 오래 안 쓴 것부터 지운다.
+같은 타일을 여러 브라우저가 동시에 달라고 해도 업스트림에는 한 번만 묻고,
+업스트림 연결은 requests 세션 하나의 커넥션 풀을 같이 쓴다 (동시에 최대 UPSTREAM_CONNECTIONS 개).
+북마크 주변 타일은 prefetch_around() 로 천천히 미리 받아 둔다.
+
+설정 (환경 변수):
+    LIMSTREAT_TILE_PROXY_PORT   주면 앱이 이 포트로 프록시를 띄우고 지도를 여기로 돌린다
+    LIMSTREAT_TILE_PROXY_HOST   프록시가 열 주소 (기본 127.0.0.1, 다른 기기에서 보려면 0.0.0.0)
+    LIMSTREAT_TILE_URL          브라우저가 쓸 타일 주소 (기본: http://localhost:{port}/{z}/{x}/{y}.png)
+    LIMSTREAT_TILE_UPSTREAM     프록시가 받아 오는 곳 (기본 OSM, 테스트는 benchmarks/fake_tiles.py)
+    LIMSTREAT_TILE_CACHE        캐시 파일 (기본 data/tiles.mbtiles)
+    LIMSTREAT_TILE_CACHE_MB     캐시 크기 상한 (기본 512)
+
+앱 없이 따로 띄우기 / 미리 받기:
+    python tiles.py serve --port 8600
+    python tiles.py prefetch --db data/bookmarks.db --zooms 12 16
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+from geo import tile_xy
+from geocode import USER_AGENT
+from importer import TokenBucket
+
+PROXY_PORT = int(os.environ["LIMSTREAT_TILE_PROXY_PORT"]) if os.environ.get("LIMSTREAT_TILE_PROXY_PORT") else None
+PROXY_HOST = os.environ.get("LIMSTREAT_TILE_PROXY_HOST", "127.0.0.1")
+TILE_URL = os.environ.get("LIMSTREAT_TILE_URL")
+UPSTREAM_URL = os.environ.get("LIMSTREAT_TILE_UPSTREAM", "https://tile.openstreetmap.org/{z}/{x}/{y}.png")
+CACHE_PATH = os.environ.get("LIMSTREAT_TILE_CACHE", "data/tiles.mbtiles")
+CACHE_MAX_BYTES = int(float(os.environ.get("LIMSTREAT_TILE_CACHE_MB", "512")) * 1024 * 1024)
+OSM_ATTRIBUTION = '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
+
+# OSM 타일 이용 정책: 동시 연결은 2개까지, 받은 타일은 7일 이상 캐시
+UPSTREAM_CONNECTIONS = 2
+TIMEOUT = 10
+MAX_AGE = 7 * 24 * 3600
+BROWSER_MAX_AGE = 24 * 3600
+MAX_ZOOM = 19
+TOUCH_AFTER = 600  # 캐시 적중 때마다 쓰지 않도록 used_at 은 이 간격(초)이 지났을 때만 고친다
+EVICT_TO = 0.9  # 상한을 넘으면 상한의 90% 까지 비운다
+
+# 미리 받기: 북마크 주변 (가운데 타일 + 둘레 PREFETCH_RADIUS 칸), 낮은 줌부터 PREFETCH_LIMIT 장까지 초당 PREFETCH_RATE 장
+PREFETCH_ZOOMS = (12, 16)
+PREFETCH_RADIUS = 1
+PREFETCH_LIMIT = 2000
+PREFETCH_RATE = 2
+
+log = logging.getLogger(__name__)
+
+TILE_PATH = re.compile(r"^/(\d+)/(\d+)/(\d+)\.png$")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)",
+    """
+    CREATE TABLE IF NOT EXISTS tiles (
+        zoom_level INTEGER NOT NULL,
+        tile_column INTEGER NOT NULL,
+        tile_row INTEGER NOT NULL,
+        tile_data BLOB NOT NULL,
+        fetched_at REAL NOT NULL,
+        used_at REAL NOT NULL
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row)",
+    "CREATE INDEX IF NOT EXISTS tiles_used_at ON tiles (used_at)",
+)
+METADATA = {"name": "limstreat tiles", "format": "png", "type": "baselayer", "version": "1"}
+# MBTiles 는 TMS 행 번호 (아래에서 위로): tile_row = 2^z - 1 - y
+SQL_GET_TILE = "SELECT tile_data, fetched_at, used_at, rowid FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?"
+SQL_TILE_FETCHED_AT = "SELECT fetched_at FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?"
+SQL_TILE_SIZE = "SELECT length(tile_data) FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?"
+SQL_PUT_TILE = """
+    INSERT INTO tiles (zoom_level, tile_column, tile_row, tile_data, fetched_at, used_at) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(zoom_level, tile_column, tile_row) DO UPDATE SET
+        tile_data = excluded.tile_data, fetched_at = excluded.fetched_at, used_at = excluded.used_at
+"""
+SQL_TOUCH_TILE = "UPDATE tiles SET used_at = ? WHERE rowid = ?"
+SQL_LEAST_USED = "SELECT rowid, length(tile_data) FROM tiles ORDER BY used_at LIMIT ?"
+SQL_DELETE_TILES = "DELETE FROM tiles WHERE rowid IN (SELECT value FROM json_each(?))"
+
+
+def tms_row(z, y):
+    return 2**z - 1 - y
+
+
+class TileCache:
+    """
+    MBTiles 파일에 둔 타일 캐시. 크기 상한은 타일 바이트 합 기준이고
+    지운 자리는 SQLite 가 다음 타일에 다시 쓰므로 파일도 상한 근처에서 더 커지지 않는다.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 타일 조회는 짧으니 커넥션 하나를 잠그고 같이 쓴다
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+        with self._conn:
+            for sql in SCHEMA:
+                self._conn.execute(sql)
+            self._conn.executemany("INSERT OR IGNORE INTO metadata (name, value) VALUES (?, ?)", METADATA.items())
+        self.bytes = self._conn.execute("SELECT COALESCE(SUM(length(tile_data)), 0) FROM tiles").fetchone()[0]
+        self.stats = {"evicted": 0}
+
+    def get(self, z, x, y, now=None):
+        """(타일 바이트, 받은 시각) 또는 None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(SQL_GET_TILE, (z, x, tms_row(z, y))).fetchone()
+            if row is None:
+                return None
+            data, fetched_at, used_at, rowid = row
+            if now - used_at > TOUCH_AFTER:
+                with self._conn:
+                    self._conn.execute(SQL_TOUCH_TILE, (now, rowid))
+        return data, fetched_at
+
+    def fetched_at(self, z, x, y):
+        with self._lock:
+            row = self._conn.execute(SQL_TILE_FETCHED_AT, (z, x, tms_row(z, y))).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, z, x, y, data, now=None):
+        now = time.time() if now is None else now
+        key = (z, x, tms_row(z, y))
+        with self._lock, self._conn:
+            old = self._conn.execute(SQL_TILE_SIZE, key).fetchone()
+            self._conn.execute(SQL_PUT_TILE, (*key, data, now, now))
+            self.bytes += len(data) - (old[0] if old else 0)
+            if self.bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * EVICT_TO))
+
+    def _evict(self, target):
+        # 잠금과 트랜잭션 안에서 불린다
+        while self.bytes > target:
+            rowids, freed = [], 0
+            for rowid, size in self._conn.execute(SQL_LEAST_USED, (256,)):
+                rowids.append(rowid)
+                freed += size
+                if self.bytes - freed <= target:
+                    break
+            if not rowids:
+                break
+            self._conn.execute(SQL_DELETE_TILES, (json.dumps(rowids),))
+            self.bytes -= freed
+            self.stats["evicted"] += len(rowids)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TileProxy:
+    """
+    tile(z, x, y): 캐시 → 업스트림 순서로 타일 바이트를 찾는다.
+    캐시가 MAX_AGE 보다 오래됐으면 다시 받고, 업스트림이 실패하면 오래된 캐시라도 준다.
+    """
+
+    def __init__(self, cache, upstream=UPSTREAM_URL, connections=UPSTREAM_CONNECTIONS, max_age=MAX_AGE, timeout=TIMEOUT):
+        self.cache = cache
+        self.upstream = upstream
+        self.connections = connections
+        self.max_age = max_age
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(connections)
+        self._inflight = {}  # (z, x, y) → Future (같은 타일을 받는 중이면 기다렸다가 같이 쓴다)
+        self._lock = threading.Lock()
+        self._session = None
+        self.stats = {"hits": 0, "fetched": 0, "shared": 0, "stale": 0, "errors": 0, "prefetched": 0}
+
+    def tile(self, z, x, y):
+        cached = self.cache.get(z, x, y)
+        if cached is not None and time.time() - cached[1] < self.max_age:
+            self.stats["hits"] += 1
+            return cached[0]
+        try:
+            return self._fetch(z, x, y)
+        except Exception:
+            self.stats["errors"] += 1
+            if cached is None:
+                raise
+            self.stats["stale"] += 1
+            return cached[0]
+
+    def _fetch(self, z, x, y):
+        key = (z, x, y)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            self.stats["shared"] += 1
+            return future.result(self.timeout * 2)
+        try:
+            data = self._download(z, x, y)
+            self.cache.put(z, x, y, data)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _download(self, z, x, y):
+        with self._slots:
+            resp = self._http().get(self.upstream.format(z=z, x=x, y=y), timeout=self.timeout)
+        resp.raise_for_status()
+        self.stats["fetched"] += 1
+        return resp.content
+
+    def _http(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                # 업스트림 연결을 재사용 (TLS 핸드셰이크를 타일마다 하지 않는다)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.connections)
+                self._session = requests.Session()
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+                self._session.headers["User-Agent"] = USER_AGENT
+            return self._session
+
+    # ---------- 미리 받기 ----------
+    def prefetch(self, tiles, rate=PREFETCH_RATE):
+        """캐시에 없거나 오래된 타일을 백그라운드에서 받는다. 업스트림 연결 하나는 화면 요청용으로 남긴다."""
+        return self._background(lambda: list(tiles), rate)
+
+    def prefetch_around(self, points, zooms=PREFETCH_ZOOMS, radius=PREFETCH_RADIUS, limit=PREFETCH_LIMIT, rate=PREFETCH_RATE):
+        """북마크 좌표 주변 타일을 미리 받는다 (타일 목록 계산도 백그라운드에서)."""
+        return self._background(lambda: tiles_around(points, zooms, radius, limit), rate)
+
+    def _background(self, make_tiles, rate):
+        thread = threading.Thread(target=self._prefetch, args=(make_tiles, rate), name="tile-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def _prefetch(self, make_tiles, rate):
+        limiter = TokenBucket(rate) if rate else None
+        now = time.time()
+        try:
+            todo = [t for t in make_tiles() if (at := self.cache.fetched_at(*t)) is None or now - at >= self.max_age]
+        except Exception:
+            log.exception("tile prefetch failed")
+            return
+
+        def fetch(tile):
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                self._fetch(*tile)
+                self.stats["prefetched"] += 1
+            except Exception:
+                self.stats["errors"] += 1
+
+        with ThreadPoolExecutor(max_workers=max(self.connections - 1, 1), thread_name_prefix="tile-prefetch") as pool:
+            list(pool.map(fetch, todo))
+
+
+def tiles_around(points, zooms=PREFETCH_ZOOMS, radius=PREFETCH_RADIUS, limit=PREFETCH_LIMIT):
+    """[(z, x, y), ...]: 낮은 줌부터, 같은 줌에서는 주변 북마크가 많은 타일부터 limit 장까지."""
+    tiles = []
+    for z in range(zooms[0], zooms[1] + 1):
+        n = 2**z
+        centers = Counter(tile_xy(lat, lon, z) for lat, lon in points)
+        counts = Counter()
+        for (x, y), count in centers.items():
+            for dx in range(-radius, radius + 1):
+                for dy in range(-radius, radius + 1):
+                    if 0 <= y + dy < n:
+                        counts[(z, (x + dx) % n, y + dy)] += count
+        tiles.extend(tile for tile, _ in counts.most_common(limit - len(tiles)))
+        if len(tiles) >= limit:
+            break
+    return tiles
+
+
+def map_tiles(proxy_port=PROXY_PORT, tile_url=TILE_URL):
+    """folium.Map 의 tiles/attr 인자. 프록시도 LIMSTREAT_TILE_URL 도 없으면 OSM 에서 바로."""
+    if tile_url is None and proxy_port is not None:
+        tile_url = f"http://localhost:{proxy_port}/{{z}}/{{x}}/{{y}}.png"
+    if tile_url is None:
+        return {"tiles": "OpenStreetMap"}
+    return {"tiles": tile_url, "attr": OSM_ATTRIBUTION}
+
+
+# ---------- HTTP ----------
+def make_handler(proxy):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # 브라우저가 연결 하나로 여러 타일을 받게
+        # 헤더와 본문을 따로 보내므로 Nagle 을 끄지 않으면 keep-alive 요청마다 delayed ACK(~40ms)를 기다린다
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            match = TILE_PATH.match(urlparse(self.path).path)
+            if match is None:
+                self.send_error(404)
+                return
+            z, x, y = map(int, match.groups())
+            if z > MAX_ZOOM or x >= 2**z or y >= 2**z:
+                self.send_error(404)
+                return
+            try:
+                data = proxy.tile(z, x, y)
+            except Exception:
+                self.send_error(502)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", f"public, max-age={BROWSER_MAX_AGE}")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class TileServer(ThreadingHTTPServer):
+    # 기본 listen 대기열(5)로는 브라우저들이 연결을 한꺼번에 열 때 SYN 이 버려져 1초씩 늦는다
+    request_queue_size = 128
+
+
+def serve(proxy, host=PROXY_HOST, port=0):
+    """백그라운드 스레드로 프록시 HTTP 서버를 띄운다. 실제 포트는 server.server_address[1]."""
+    server = TileServer((host, port), make_handler(proxy))
+    threading.Thread(target=server.serve_forever, name="tile-proxy", daemon=True).start()
+    return server
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_cmd = sub.add_parser("serve", help="프록시만 띄우기")
+    serve_cmd.add_argument("--host", default=PROXY_HOST)
+    serve_cmd.add_argument("--port", type=int, default=PROXY_PORT or 8600)
+    prefetch_cmd = sub.add_parser("prefetch", help="북마크 주변 타일을 미리 받고 끝내기")
+    prefetch_cmd.add_argument("--db", default="data/bookmarks.db")
+    prefetch_cmd.add_argument("--zooms", type=int, nargs=2, default=PREFETCH_ZOOMS)
+    prefetch_cmd.add_argument("--limit", type=int, default=PREFETCH_LIMIT)
+    prefetch_cmd.add_argument("--rate", type=float, default=PREFETCH_RATE, help="초당 장 수 (0 = 제한 없음)")
+    for cmd in (serve_cmd, prefetch_cmd):
+        cmd.add_argument("--cache", default=CACHE_PATH)
+        cmd.add_argument("--upstream", default=UPSTREAM_URL)
+    args = parser.parse_args()
+
+    proxy = TileProxy(TileCache(args.cache), upstream=args.upstream)
+    if args.command == "serve":
+        server = TileServer((args.host, args.port), make_handler(proxy))
+        print(f"tile proxy: http://{args.host}:{args.port}/{{z}}/{{x}}/{{y}}.png → {args.upstream}")
+        server.serve_forever()
+    else:
+        from db import Database
+
+        db = Database(args.db)
+        points = db.bookmark_points()
+        db.close()
+        started = time.perf_counter()
+        proxy.prefetch_around(points, tuple(args.zooms), limit=args.limit, rate=args.rate).join()
+        print(
+            f"{len(points):,}곳 주변: 받음 {proxy.stats['prefetched']:,} / 실패 {proxy.stats['errors']:,} "
+            f"({time.perf_counter() - started:.1f}s, 캐시 {len(proxy.cache):,}장 {proxy.cache.bytes / 1024 / 1024:.1f}MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
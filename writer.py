@@ -0,0 +1,173 @@
+"""
+SQLite 쓰기를 한 스레드로 모으는 단일 writer.
+
+세션/백그라운드 스레드마다 BEGIN IMMEDIATE 로 쓰기 락을 다투면 busy_timeout 만큼 기다리거나
+"database is locked" 가 난다. 대신 쓰기는 대기열에 넣고 전용 커넥션 하나가 차례로 처리한다.
+처리하는 동안 쌓인 쓰기는 다음 트랜잭션 하나(커밋 한 번)로 묶고, 쓰기마다 SAVEPOINT 로 감싸
+하나가 실패해도 나머지는 커밋된다. 결과와 예외는 submit() 이 돌려준 Future 로 받는다.
+읽기는 지금처럼 풀 커넥션으로 한다 (WAL 이라 쓰기와 서로 막지 않는다).
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+MAX_BATCH = 64  # 한 트랜잭션에 묶는 최대 쓰기 수
+LATENCY_WINDOW = 1000  # 지연 백분위를 낼 최근 표본 수
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class SingleWriter:
+    """
+    submit(fn, *args): writer 스레드가 트랜잭션 안에서 fn(conn, *args) 를 부른다. Future 를 돌려준다.
+    connect() 는 writer 전용 커넥션을 만든다 (풀 커넥션과 따로).
+    fn 은 커서를 돌려주면 안 된다: 호출한 스레드에서 정리되면서 writer 가 쓰고 있는 캐시된 statement 를 건드린다.
+    """
+
+    def __init__(self, connect, max_batch=MAX_BATCH):
+        self.connect = connect
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._conn = None
+        self._stopped = False
+        self._commit_seconds = deque(maxlen=LATENCY_WINDOW)
+        self._wait_seconds = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {"writes": 0, "batches": 0, "errors": 0, "max_batch": 0, "max_depth": 0}
+
+    def start(self):
+        if self._thread is None:
+            self._conn = self.connect()
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, fn, *args):
+        if threading.current_thread() is self._thread:
+            # writer 안의 콜백이 다시 쓰면 지금 트랜잭션에서 바로 (대기열에 넣으면 자기 자신을 기다린다)
+            future = Future()
+            future.set_result(fn(self._conn, *args))
+            return future
+        if self._thread is None or self._stopped:
+            raise RuntimeError("writer is not running")
+        future = Future()
+        self._queue.put((fn, args, future, time.perf_counter()))
+        depth = self._queue.qsize()
+        if depth > self.stats["max_depth"]:
+            self.stats["max_depth"] = depth
+        return future
+
+    def write(self, fn, *args):
+        """submit 하고 결과를 기다린다 (fn 의 예외는 그대로 올라온다)."""
+        return self.submit(fn, *args).result()
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def metrics(self):
+        """대기열 길이, 누적 수, 최근 커밋 지연(트랜잭션 시작~커밋)과 대기 지연(submit~결과) ms."""
+        commit, wait = list(self._commit_seconds), list(self._wait_seconds)
+        return {
+            "depth": self.depth(),
+            **self.stats,
+            "commit_ms_p50": _ms(percentile(commit, 0.5)),
+            "commit_ms_p95": _ms(percentile(commit, 0.95)),
+            "wait_ms_p50": _ms(percentile(wait, 0.5)),
+            "wait_ms_p95": _ms(percentile(wait, 0.95)),
+        }
+
+    def flush(self):
+        """지금까지 받은 쓰기가 끝날 때까지 기다린다 (테스트/벤치마크용)."""
+        self._queue.join()
+
+    def stop(self, timeout=None):
+        """남은 쓰기를 마저 처리하고 커넥션을 닫는다."""
+        if self._thread is None or self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while True:
+            try:
+                item = self._queue.get(timeout=0.1) if stopping else self._queue.get()
+            except queue.Empty:
+                break  # 멈춘 뒤 남은 쓰기까지 다 처리함
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            writes = [item for item in batch if item is not _STOP]
+            stopping = stopping or len(writes) < len(batch)
+            try:
+                if writes:
+                    self._commit(writes)
+            except Exception:
+                log.exception("writer batch failed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        self._conn.close()
+
+    def _commit(self, writes):
+        conn = self._conn
+        outcomes = []
+        started = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fn, args, future, enqueued in writes:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT write")
+                try:
+                    result = fn(conn, *args)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write")
+                    conn.execute("RELEASE write")
+                    outcomes.append((future, enqueued, None, e))
+                else:
+                    conn.execute("RELEASE write")
+                    outcomes.append((future, enqueued, result, None))
+            conn.commit()
+        except Exception as e:
+            # BEGIN/COMMIT 자체가 실패하면 묶음 전체가 실패
+            if conn.in_transaction:
+                conn.rollback()
+            self.stats["errors"] += len(writes)
+            for _, _, future, _ in writes:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        finished = time.perf_counter()
+        self._commit_seconds.append(finished - started)
+        self.stats["batches"] += 1
+        self.stats["writes"] += len(outcomes)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(writes))
+        # 커밋이 끝난 뒤에 결과를 알린다 (돌아간 호출자가 읽으면 바로 보인다)
+        for future, enqueued, result, error in outcomes:
+            self._wait_seconds.append(finished - enqueued)
+            if error is None:
+                future.set_result(result)
+            else:
+                self.stats["errors"] += 1
+                future.set_exception(error)